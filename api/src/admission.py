@@ -0,0 +1,132 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException, status
+
+
+class TokenBucket:
+    """Per-client token buckets: `rate` tokens/second refill, up to `burst` saved."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000) -> None:
+        self.rate: float = rate
+        self.burst: int = burst
+        self.max_clients: int = max_clients
+        # client -> (tokens, last refill time); oldest clients evicted first
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    def take(self, client: str) -> float:
+        """Take one token; return 0 on success or the seconds until one is available."""
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(client, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+
+        wait = 0.0
+        if tokens >= 1.0:
+            tokens -= 1.0
+        else:
+            wait = (1.0 - tokens) / self.rate
+
+        self._buckets[client] = (tokens, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class EndpointClassLimiter:
+    """
+    Admission for one endpoint class: at most `max_concurrency` requests run,
+    at most `max_queue` wait, and nobody waits longer than `max_wait` seconds.
+    Anything beyond that is shed with a 503 instead of piling up on the pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait: float,
+        rate: Optional[float] = None,
+        burst: int = 0,
+    ) -> None:
+        self.name: str = name
+        self.max_concurrency: int = max_concurrency
+        self.max_queue: int = max_queue
+        self.max_wait: float = max_wait
+        self.buckets: Optional[TokenBucket] = TokenBucket(rate, burst) if rate else None
+
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+        self.active: int = 0
+        self.waiting: int = 0
+        self.admitted: int = 0
+        self.shed: int = 0
+        self.rate_limited: int = 0
+
+    def _reject(self, status_code: int, detail: str, retry_after: float) -> HTTPException:
+        return HTTPException(status_code=status_code, detail=detail, headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+    @asynccontextmanager
+    async def admit(self, client: str) -> AsyncIterator[None]:
+        """Hold one slot of this class for the duration of the block, or raise 429/503."""
+        if self.buckets is not None:
+            wait = self.buckets.take(client)
+            if wait > 0:
+                self.rate_limited += 1
+                raise self._reject(status.HTTP_429_TOO_MANY_REQUESTS, f"Rate limit exceeded for '{self.name}' requests", wait)
+
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            self.shed += 1
+            raise self._reject(status.HTTP_503_SERVICE_UNAVAILABLE, f"Too many '{self.name}' requests queued", self.max_wait)
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            raise self._reject(status.HTTP_503_SERVICE_UNAVAILABLE, f"Timed out waiting for a '{self.name}' slot", self.max_wait)
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "rate_limited": self.rate_limited,
+        }
+
+
+# Endpoint classes; "expensive" requests can hold a pooled connection (or a
+# graph worker) for seconds, so they get a small share and per-client buckets
+ENDPOINT_CLASSES: Dict[str, Dict[str, Any]] = {
+    "cheap": {"max_concurrency": 32, "max_queue": 256, "max_wait": 2.0},
+    "search": {"max_concurrency": 8, "max_queue": 64, "max_wait": 2.0},
+    "expensive": {"max_concurrency": 4, "max_queue": 16, "max_wait": 1.0, "rate": 1.0, "burst": 10},
+    "export": {"max_concurrency": 2, "max_queue": 4, "max_wait": 1.0, "rate": 0.1, "burst": 4},
+}
+
+
+class AdmissionController:
+    """One EndpointClassLimiter per endpoint class."""
+
+    def __init__(self, classes: Dict[str, Dict[str, Any]] = ENDPOINT_CLASSES) -> None:
+        self.limiters: Dict[str, EndpointClassLimiter] = {name: EndpointClassLimiter(name, **config) for name, config in classes.items()}
+
+    def admit(self, endpoint_class: str, client: str):
+        return self.limiters[endpoint_class].admit(client)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
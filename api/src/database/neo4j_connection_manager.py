@@ -1,6 +1,52 @@
+import asyncio
+import json
 import logging
-from typing import Any, Dict, List, Optional
-from neo4j import AsyncGraphDatabase, AsyncDriver, NotificationDisabledCategory
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+from neo4j import AsyncGraphDatabase, AsyncDriver, NotificationDisabledCategory, Query
+from neo4j.exceptions import ClientError
+
+from api.src.tracing import current_span, span
+
+
+class QueryDeadlineExceeded(TimeoutError):
+    """The request's deadline passed before (or while) a query ran."""
+
+
+# Absolute time.monotonic() deadline of the current request, if any
+_query_deadline: ContextVar[Optional[float]] = ContextVar("query_deadline", default=None)
+
+# A shared read may run this much past its first caller's deadline, so identical
+# requests arriving within that window (with the same deadline budget) can join it
+COALESCE_DEADLINE_SLACK: float = 0.5
+
+
+@contextmanager
+def query_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Give every query started inside the block (and tasks created from it) at most `seconds` from now."""
+    token = _query_deadline.set(time.monotonic() + seconds if seconds else None)
+    try:
+        yield
+    finally:
+        _query_deadline.reset(token)
+
+
+class _Flight:
+    """One in-flight read shared by every caller that asked for the same query."""
+
+    __slots__ = ("task", "deadline", "waiters")
+
+    def __init__(self, task: asyncio.Task, deadline: Optional[float]) -> None:
+        self.task: asyncio.Task = task
+        # Deadline the query was sent with (its transaction timeout); None runs unbounded
+        self.deadline: Optional[float] = deadline
+        self.waiters: int = 0
+
+    def covers(self, deadline: Optional[float]) -> bool:
+        """True if a caller with `deadline` can join: the query is allowed to run at least that long."""
+        return self.deadline is None or (deadline is not None and deadline <= self.deadline)
 
 
 class Neo4jConnectionManager:
@@ -10,18 +56,32 @@ class Neo4jConnectionManager:
     Helper methods:
       • query_all   – return multiple records
       • query_one   – return a single record
+      • query_values – return multiple records as value lists (no per-row dicts)
       • query_none  – write-only (CREATE/MERGE/DELETE)
       • close_all   – close driver
+
+    Queries started under query_deadline() are sent with a transaction
+    timeout equal to the time left, and raise QueryDeadlineExceeded when
+    Neo4j aborts them (or when no time is left to begin with). This holds
+    for coalesced reads too (see _single_flight).
+
+    Reads are single-flight: concurrent query_all / query_one / query_values calls with the
+    same Cypher and parameters share one session and one execution. Shared
+    results must be treated as read-only by callers.
     """
 
-    def __init__(self, uri: str, user: str, password: str) -> None:
+    def __init__(self, uri: str, user: str, password: str, coalesce_reads: bool = True, max_pool_size: int = 10) -> None:
         self.logger: logging.Logger = logging.getLogger(__name__)
+        self.max_pool_size: int = max_pool_size
+        self.coalesce_reads: bool = coalesce_reads
+        self._inflight: Dict[str, _Flight] = {}
+        self._flight_stats: Dict[str, int] = {"requests": 0, "executions": 0}
         try:
             self.driver: AsyncDriver = AsyncGraphDatabase.driver(
                 uri,
                 auth=(user, password),
                 max_connection_lifetime=3600,
-                max_connection_pool_size=10,
+                max_connection_pool_size=max_pool_size,
                 notifications_min_severity="OFF",
             )
         except Exception as e:
@@ -39,6 +99,48 @@ class Neo4jConnectionManager:
         except Exception as e:
             raise ConnectionError(f"Neo4j not reachable: {e}")
 
+    async def warm_pool(self, connections: Optional[int] = None) -> int:
+        """
+        Open pooled connections up front so early requests skip connection setup.
+
+        Each session holds an open transaction until all of them are open,
+        which forces the driver to create distinct connections. Returns how
+        many were opened.
+        """
+        connections = min(connections or self.max_pool_size, self.max_pool_size)
+        opened = 0
+        pending = connections
+        all_settled = asyncio.Event()
+
+        def settle() -> None:
+            nonlocal pending
+            pending -= 1
+            if pending == 0:
+                all_settled.set()
+
+        async def hold() -> None:
+            nonlocal opened
+            settled = False
+            try:
+                async with self.get_session() as session:
+                    tx = await session.begin_transaction()
+                    try:
+                        result = await tx.run("RETURN 1")
+                        await result.consume()
+                        opened += 1
+                    finally:
+                        settled = True
+                        settle()
+                        await all_settled.wait()
+                        await tx.close()
+            except Exception as e:
+                self.logger.warning(f"Failed to pre-open Neo4j connection: {e}")
+                if not settled:
+                    settle()
+
+        await asyncio.gather(*(hold() for _ in range(connections)))
+        return opened
+
     # ----------------------------------------------------------------------
     def get_session(self):
         """Return an async session."""
@@ -51,42 +153,180 @@ class Neo4jConnectionManager:
     # ----------------------------------------------------------------------
     async def query_all(self, cypher: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
         """Execute a query and return all rows."""
+        with span("neo4j.query", kind="all") as s:
+            rows = await self._single_flight("all", cypher, params, self._run_all)
+            s.set("rows", len(rows))
+            return rows
+
+    async def query_one(self, cypher: str, params: Dict[str, Any] | None = None) -> Optional[Dict[str, Any]]:
+        """Execute a query and return the first row (or None)."""
+        with span("neo4j.query", kind="one") as s:
+            row = await self._single_flight("one", cypher, params, self._run_one)
+            s.set("rows", 0 if row is None else 1)
+            return row
+
+    async def query_values(self, cypher: str, params: Dict[str, Any] | None = None) -> List[List[Any]]:
+        """Execute a query and return all rows as value lists, in RETURN order."""
+        with span("neo4j.query", kind="values") as s:
+            rows = await self._single_flight("values", cypher, params, self._run_values)
+            s.set("rows", len(rows))
+            return rows
+
+    async def _run_all(self, cypher: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
         try:
             async with self.get_session() as session:
-                result = await session.run(cypher, params or {})
-                return [record.data() async for record in result]
+                # neo4j.run covers pool acquisition, planning and the first response
+                with span("neo4j.run"):
+                    result = await session.run(self._query(cypher), params or {})
+                with span("neo4j.fetch"):
+                    return [record.data() async for record in result]
         except Exception as e:
-            self._log_db_error(e, cypher)
+            self._handle_db_error(e, cypher)
             raise
 
-    async def query_one(self, cypher: str, params: Dict[str, Any] | None = None) -> Optional[Dict[str, Any]]:
-        """Execute a query and return the first row (or None)."""
+    async def _run_values(self, cypher: str, params: Dict[str, Any] | None = None) -> List[List[Any]]:
+        try:
+            async with self.get_session() as session:
+                with span("neo4j.run"):
+                    result = await session.run(self._query(cypher), params or {})
+                with span("neo4j.fetch"):
+                    return await result.values()
+        except Exception as e:
+            self._handle_db_error(e, cypher)
+            raise
+
+    async def _run_one(self, cypher: str, params: Dict[str, Any] | None = None) -> Optional[Dict[str, Any]]:
         try:
             async with self.get_session() as session:
-                result = await session.run(cypher, params or {})
-                record = await result.single()
+                with span("neo4j.run"):
+                    result = await session.run(self._query(cypher), params or {})
+                with span("neo4j.fetch"):
+                    record = await result.single()
                 return record.data() if record else None
         except Exception as e:
-            self._log_db_error(e, cypher)
+            self._handle_db_error(e, cypher)
             raise
 
     async def query_none(self, cypher: str, params: Dict[str, Any] | None = None) -> None:
         """Execute a write-only Cypher query."""
         try:
             async with self.get_session() as session:
-                result = await session.run(cypher, params or {})
+                result = await session.run(self._query(cypher), params or {})
                 await result.consume()
         except Exception as e:
-            self._log_db_error(e, cypher)
+            self._handle_db_error(e, cypher)
             raise
 
+    def _query(self, cypher: str) -> Query:
+        """Wrap Cypher with a transaction timeout for whatever is left of the request deadline."""
+        deadline = _query_deadline.get()
+        if deadline is None:
+            return Query(cypher)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise QueryDeadlineExceeded("Request deadline passed before the query started")
+        return Query(cypher, timeout=remaining)
+
+    # ----------------------------------------------------------------------
+    # Request coalescing
+    # ----------------------------------------------------------------------
+    async def _single_flight(
+        self,
+        kind: str,
+        cypher: str,
+        params: Dict[str, Any] | None,
+        run: Callable[[str, Dict[str, Any] | None], Awaitable[Any]],
+    ) -> Any:
+        """
+        Join the in-flight execution of an identical read, or start one.
+
+        The execution runs in its own task and each caller awaits it through
+        asyncio.shield, so a cancelled caller never cancels the query for the
+        others. When the last waiter goes away the execution is cancelled too.
+
+        The task starts in a fresh context whose only value is the flight's
+        deadline (the starting caller's plus COALESCE_DEADLINE_SLACK), so Neo4j
+        gets it as the transaction timeout and no caller's span is inherited.
+        Callers only join a flight whose deadline is at least their own, so the
+        timeout always covers the latest deadline among the waiters; a caller
+        with a later deadline starts a new flight that later callers join
+        instead. Each caller still stops waiting at its own deadline.
+        """
+        self._flight_stats["requests"] += 1
+        if not self.coalesce_reads:
+            self._flight_stats["executions"] += 1
+            return await run(cypher, params)
+
+        deadline = _query_deadline.get()
+        if deadline is not None and deadline <= time.monotonic():
+            raise QueryDeadlineExceeded("Request deadline passed before the query started")
+
+        key = f"{kind}\x00{cypher}\x00{json.dumps(params or {}, sort_keys=True, default=str)}"
+        flight = self._inflight.get(key)
+        joined = flight is not None and flight.covers(deadline)
+        current_span().set("coalesced", joined)
+        if not joined:
+            self._flight_stats["executions"] += 1
+            flight_deadline = deadline + COALESCE_DEADLINE_SLACK if deadline is not None else None
+            context = Context()
+            context.run(_query_deadline.set, flight_deadline)
+            flight = _Flight(context.run(asyncio.ensure_future, run(cypher, params)), flight_deadline)
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda task, flight=flight: self._land(key, flight))
+
+        flight.waiters += 1
+        try:
+            if deadline is None:
+                return await asyncio.shield(flight.task)
+            try:
+                return await asyncio.wait_for(asyncio.shield(flight.task), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                if flight.task.done():
+                    raise
+                raise QueryDeadlineExceeded("Request deadline passed while waiting for the query") from None
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._land(key, flight)
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        """Forget a finished (or abandoned) flight so the next caller starts a fresh execution."""
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if flight.task.done() and not flight.task.cancelled():
+            # Mark the exception as retrieved even if every waiter was cancelled
+            flight.task.exception()
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """Return single-flight counters; coalescing_ratio is the share of reads served by another caller's execution."""
+        requests = self._flight_stats["requests"]
+        executions = self._flight_stats["executions"]
+        return {
+            "requests": requests,
+            "executions": executions,
+            "coalesced": requests - executions,
+            "coalescing_ratio": (requests - executions) / requests if requests else 0.0,
+            "in_flight": len(self._inflight),
+        }
+
     # ----------------------------------------------------------------------
     async def close_all(self) -> None:
         """Shut down the Neo4j driver."""
         if self.driver is not None:
             await self.driver.close()
 
-    def _log_db_error(self, error: Exception, cypher: str) -> None:
-        """Log database error with details."""
+    def _handle_db_error(self, error: Exception, cypher: str) -> None:
+        """Log a database error; server-side transaction timeouts are re-raised as QueryDeadlineExceeded."""
+        if isinstance(error, QueryDeadlineExceeded):
+            self.logger.warning("[Neo4j] Query skipped, request deadline already passed")
+            self.logger.debug(f"Cypher: {cypher}")
+            return
+        if isinstance(error, ClientError) and "TransactionTimedOut" in (error.code or ""):
+            self.logger.warning(f"[Neo4j] Query aborted at request deadline: {error.code}")
+            self.logger.debug(f"Cypher: {cypher}")
+            raise QueryDeadlineExceeded(str(error)) from error
+
         self.logger.error(f"[Neo4j Async Error] {error}")
         self.logger.debug(f"Cypher: {cypher}")
@@ -0,0 +1,359 @@
+import argparse
+import asyncio
+import logging
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
+from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
+
+
+# ============================================================
+# 📐 SCHEMA MIGRATIONS
+# ============================================================
+
+# Recompute the materialized aggregates read by the repository; the only copy of this logic,
+# run by migration 3 and by `refresh-aggregates` after every data load (see _main)
+REFRESH_PLAYER_AGGREGATES = """
+MATCH (p:Player)
+CALL {
+    WITH p
+    OPTIONAL MATCH (p)-[r:PLAYED_FOR]->(c:Club)
+    WITH p, sum(r.appearances) AS apps, min(r.start_year) AS first, max(r.end_year) AS last, count(DISTINCT c) AS clubs
+    SET
+        p.total_apps = apps,
+        p.first_season = first,
+        p.last_season = last,
+        p.clubs_count = clubs
+} IN TRANSACTIONS OF 5000 ROWS
+"""
+
+REFRESH_CLUB_AGGREGATES = """
+MATCH (c:Club)
+CALL {
+    WITH c
+    OPTIONAL MATCH (p:Player)-[r:PLAYED_FOR]->(c)
+    WITH c, count(DISTINCT p) AS roster, min(r.start_year) AS first, max(r.end_year) AS last
+    SET
+        c.roster_size = roster,
+        c.first_season = first,
+        c.last_season = last
+} IN TRANSACTIONS OF 1000 ROWS
+"""
+
+# New graph version after every data load; the API's HTTP cache and snapshot refresh key on it
+STAMP_GRAPH_VERSION = "MERGE (m:GraphMeta {key: 'graph'}) SET m.version = randomUUID(), m.updated_at = datetime()"
+
+# (version, description, statements) – applied in order, each statement idempotent
+SCHEMA_MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (
+        1,
+        "uniqueness constraints",
+        [
+            "CREATE CONSTRAINT player_id_unique IF NOT EXISTS FOR (p:Player) REQUIRE p.id IS UNIQUE",
+            "CREATE CONSTRAINT club_name_unique IF NOT EXISTS FOR (c:Club) REQUIRE c.name IS UNIQUE",
+        ],
+    ),
+    (
+        2,
+        "player name search and stint season indexes",
+        [
+            """
+            MATCH (p:Player)
+            WHERE p.search_name IS NULL
+            CALL { WITH p SET p.search_name = toLower(p.name) } IN TRANSACTIONS OF 10000 ROWS
+            """,
+            "CREATE TEXT INDEX player_search_name_text IF NOT EXISTS FOR (p:Player) ON (p.search_name)",
+            "CREATE RANGE INDEX played_for_start_year IF NOT EXISTS FOR ()-[r:PLAYED_FOR]-() ON (r.start_year)",
+            "CREATE RANGE INDEX played_for_end_year IF NOT EXISTS FOR ()-[r:PLAYED_FOR]-() ON (r.end_year)",
+        ],
+    ),
+    (
+        3,
+        "materialized player and club aggregates",
+        [
+            REFRESH_PLAYER_AGGREGATES,
+            REFRESH_CLUB_AGGREGATES,
+        ],
+    ),
+    (
+        4,
+        "graph version stamp",
+        [
+            "CREATE CONSTRAINT graph_meta_key_unique IF NOT EXISTS FOR (m:GraphMeta) REQUIRE m.key IS UNIQUE",
+            "MERGE (m:GraphMeta {key: 'graph'}) ON CREATE SET m.version = randomUUID(), m.updated_at = datetime()",
+        ],
+    ),
+    (
+        5,
+        "drop unused stint season indexes",
+        [
+            # Rosters and era filters are served from the snapshot; the export season filters
+            # only check stints expanded from an already-seeked player, so nothing seeks these
+            "DROP INDEX played_for_start_year IF EXISTS",
+            "DROP INDEX played_for_end_year IF EXISTS",
+        ],
+    ),
+]
+
+SCHEMA_VERSION: int = SCHEMA_MIGRATIONS[-1][0]
+
+# Indexes (including constraint-backed ones) the repository queries rely on
+REQUIRED_INDEXES: Set[str] = {
+    "player_id_unique",
+    "club_name_unique",
+    "player_search_name_text",
+    "graph_meta_key_unique",
+}
+
+
+# ============================================================
+# 🔎 REPOSITORY QUERY SAMPLES
+# ============================================================
+
+# Operators that read a whole label / relationship type instead of seeking an index
+SCAN_OPERATORS: Set[str] = {
+    "AllNodesScan",
+    "NodeByLabelScan",
+    "DirectedRelationshipTypeScan",
+    "UndirectedRelationshipTypeScan",
+    "DirectedAllRelationshipsScan",
+    "UndirectedAllRelationshipsScan",
+}
+
+SAMPLE_PLAYER_ID = "d70ce98e"
+SAMPLE_OTHER_PLAYER_ID = "e46012d4"
+
+# (name, call, operators allowed for that query) – one entry per query text in Neo4jGraphRepository
+REPOSITORY_QUERY_SAMPLES: List[Tuple[str, Callable[[Neo4jGraphRepository], Awaitable[Any]], Set[str]]] = [
+    ("get_graph_version", lambda repo: repo.get_graph_version(), set()),
+    ("get_player_by_id", lambda repo: repo.get_player_by_id(SAMPLE_PLAYER_ID), set()),
+    ("get_players_by_ids", lambda repo: repo.get_players_by_ids([SAMPLE_PLAYER_ID, SAMPLE_OTHER_PLAYER_ID]), set()),
+    (
+        "get_players_by_ids[history]",
+        lambda repo: repo.get_players_by_ids([SAMPLE_PLAYER_ID, SAMPLE_OTHER_PLAYER_ID], include_history=True),
+        set(),
+    ),
+    ("search_players", lambda repo: repo.search_players("messi"), set()),
+    ("get_player_club_history", lambda repo: repo.get_player_club_history(SAMPLE_PLAYER_ID), set()),
+    ("get_shortest_teammate_path", lambda repo: repo.get_shortest_teammate_path(SAMPLE_PLAYER_ID, SAMPLE_OTHER_PLAYER_ID), set()),
+    # Export pages must seek the unique-constraint index, never scan
+    ("export_players_page", lambda repo: repo.export_players_page("", 5000, 2010, 2015), set()),
+    ("export_clubs_page", lambda repo: repo.export_clubs_page("", 5000, 2010, 2015), set()),
+    ("export_played_for_page", lambda repo: repo.export_played_for_page("", 1000, None, None), set()),
+    ("export_played_with_page", lambda repo: repo.export_played_with_page("", 1000, None, None), set()),
+    # Bulk loaders for the in-memory engine read everything by design
+    ("get_all_players", lambda repo: repo.get_all_players(), {"NodeByLabelScan"}),
+    (
+        "get_all_teammate_edges",
+        lambda repo: repo.get_all_teammate_edges(),
+        {"NodeByLabelScan", "DirectedRelationshipTypeScan", "UndirectedRelationshipTypeScan"},
+    ),
+    (
+        "get_all_stints",
+        lambda repo: repo.get_all_stints(),
+        {"NodeByLabelScan", "DirectedRelationshipTypeScan", "UndirectedRelationshipTypeScan"},
+    ),
+]
+
+
+class _ExplainConnectionManager:
+    """
+    Stands in for Neo4jConnectionManager: EXPLAINs each query and records
+    its plan instead of running it, so repository methods can be inspected
+    without touching data.
+    """
+
+    def __init__(self, ncm: Neo4jConnectionManager) -> None:
+        self.ncm: Neo4jConnectionManager = ncm
+        self.plans: List[Dict[str, Any]] = []
+
+    async def _explain(self, cypher: str, params: Dict[str, Any] | None) -> None:
+        async with self.ncm.get_session() as session:
+            result = await session.run("EXPLAIN " + cypher, params or {})
+            summary = await result.consume()
+            self.plans.append(summary.plan or {})
+
+    async def query_all(self, cypher: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+        await self._explain(cypher, params)
+        return []
+
+    async def query_one(self, cypher: str, params: Dict[str, Any] | None = None) -> Optional[Dict[str, Any]]:
+        await self._explain(cypher, params)
+        return None
+
+    async def query_values(self, cypher: str, params: Dict[str, Any] | None = None) -> List[List[Any]]:
+        await self._explain(cypher, params)
+        return []
+
+
+def _operator(plan: Dict[str, Any]) -> str:
+    # Neo4j 5 reports e.g. "NodeByLabelScan@neo4j"
+    return plan.get("operatorType", "").split("@")[0]
+
+
+def _leaves(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    children = plan.get("children") or []
+    if not children:
+        return [plan]
+    return [leaf for child in children for leaf in _leaves(child)]
+
+
+def find_plan_regressions(plan: Dict[str, Any], allowed: Set[str] = frozenset()) -> List[str]:
+    """
+    Return the problems in a query plan:
+      • any label / relationship-type scan not in `allowed`
+      • any CartesianProduct whose inputs are not all index seeks
+    """
+    problems: List[str] = []
+    op = _operator(plan)
+
+    if op in SCAN_OPERATORS and op not in allowed:
+        problems.append(f"{op} ({plan.get('args', {}).get('Details', '')})")
+
+    if op == "CartesianProduct" and op not in allowed:
+        if not all("Seek" in _operator(leaf) for leaf in _leaves(plan)):
+            problems.append("CartesianProduct over non-seek inputs")
+
+    for child in plan.get("children") or []:
+        problems.extend(find_plan_regressions(child, allowed))
+    return problems
+
+
+# ============================================================
+# 🗂️ SCHEMA MANAGER
+# ============================================================
+
+
+class Neo4jSchemaManager:
+    """
+    Applies versioned schema migrations, verifies that every index the
+    repository depends on exists and is ONLINE, and refreshes the
+    materialized aggregates after a data load.
+
+    The applied version is stored on a single (:SchemaMeta {key: 'schema'}) node.
+    """
+
+    def __init__(self, ncm: Neo4jConnectionManager) -> None:
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.ncm: Neo4jConnectionManager = ncm
+
+    # ----------------------------------------------------------------------
+    async def current_version(self) -> int:
+        row = await self.ncm.query_one("MATCH (m:SchemaMeta {key: 'schema'}) RETURN m.version AS version")
+        return row["version"] if row and row["version"] is not None else 0
+
+    async def migrate(self) -> int:
+        """Apply every migration newer than the stored version; return the resulting version."""
+        version = await self.current_version()
+        for target, description, statements in SCHEMA_MIGRATIONS:
+            if target <= version:
+                continue
+
+            self.logger.info(f"Applying schema migration {target}: {description}")
+            for statement in statements:
+                await self.ncm.query_none(statement)
+
+            await self.ncm.query_none(
+                "MERGE (m:SchemaMeta {key: 'schema'}) SET m.version = $version, m.updated_at = datetime()",
+                {"version": target},
+            )
+            version = target
+
+        return version
+
+    async def refresh_aggregates(self) -> None:
+        """Recompute per-player and per-club aggregates from PLAYED_FOR, then stamp a new graph version."""
+        await self.ncm.query_none(REFRESH_PLAYER_AGGREGATES)
+        await self.ncm.query_none(REFRESH_CLUB_AGGREGATES)
+        await self.ncm.query_none(STAMP_GRAPH_VERSION)
+
+    async def verify(self) -> None:
+        """Raise if a required index is missing or not yet ONLINE."""
+        rows = await self.ncm.query_all("SHOW INDEXES YIELD name, state RETURN name, state")
+        states = {row["name"]: row["state"] for row in rows}
+
+        missing = sorted(REQUIRED_INDEXES - states.keys())
+        offline = sorted(name for name in REQUIRED_INDEXES & states.keys() if states[name] != "ONLINE")
+        if missing or offline:
+            raise RuntimeError(f"Neo4j schema check failed (missing: {missing or '-'}, not online: {offline or '-'})")
+
+    async def ensure_schema(self) -> None:
+        """Migrate to SCHEMA_VERSION, wait for new indexes to populate, then verify."""
+        version = await self.migrate()
+        await self.ncm.query_none("CALL db.awaitIndexes(300)")
+        await self.verify()
+        self.logger.info(f"Neo4j schema at version {version}, {len(REQUIRED_INDEXES)} required indexes online")
+
+    # ----------------------------------------------------------------------
+    async def check_query_plans(self) -> Dict[str, List[str]]:
+        """EXPLAIN every repository query and return {query name: problems} for those that regressed."""
+        regressions: Dict[str, List[str]] = {}
+        for name, call, allowed in REPOSITORY_QUERY_SAMPLES:
+            explainer = _ExplainConnectionManager(self.ncm)
+            await call(Neo4jGraphRepository(explainer))
+
+            problems = [problem for plan in explainer.plans for problem in find_plan_regressions(plan, allowed)]
+            if problems:
+                regressions[name] = problems
+        return regressions
+
+
+# ============================================================
+# 🧪 CLI: PLAN CHECK / MIGRATIONS / AGGREGATE REFRESH
+# ============================================================
+
+
+async def _check_plans(manager: Neo4jSchemaManager) -> int:
+    # Read-only: verify (never migrate) the schema, then EXPLAIN
+    await manager.verify()
+    regressions = await manager.check_query_plans()
+
+    for name, problems in regressions.items():
+        for problem in problems:
+            print(f"❌ {name}: {problem}")
+    if regressions:
+        return 1
+
+    print(f"✅ {len(REPOSITORY_QUERY_SAMPLES)} repository query plans checked")
+    return 0
+
+
+async def _migrate(manager: Neo4jSchemaManager) -> int:
+    # Run once per deploy, before workers restart; workers only verify the schema at boot
+    await manager.ensure_schema()
+    print(f"✅ Neo4j schema at version {SCHEMA_VERSION}")
+    return 0
+
+
+async def _refresh_aggregates(manager: Neo4jSchemaManager) -> int:
+    # Last step of every data load (after script/soccer_neo4j_script.cypher)
+    await manager.refresh_aggregates()
+    print("✅ Player and club aggregates refreshed, new graph version stamped")
+    return 0
+
+
+COMMANDS: Dict[str, Callable[[Neo4jSchemaManager], Awaitable[int]]] = {
+    "check-plans": _check_plans,
+    "migrate": _migrate,
+    "refresh-aggregates": _refresh_aggregates,
+}
+
+
+async def _main(command: str) -> int:
+    from api.src.dependencies import get_neo4j_connection_manager
+
+    ncm = get_neo4j_connection_manager()
+    try:
+        return await COMMANDS[command](Neo4jSchemaManager(ncm))
+    finally:
+        await ncm.close_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Neo4j schema maintenance.")
+    parser.add_argument("command", nargs="?", choices=sorted(COMMANDS), default="check-plans")
+    sys.exit(asyncio.run(_main(parser.parse_args().command)))
+
+
+# python -m api.src.database.neo4j_schema_manager [check-plans | migrate | refresh-aggregates]
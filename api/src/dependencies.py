@@ -1,16 +1,26 @@
+from __future__ import annotations
+
 import os
 import logging
+from contextlib import AsyncExitStack
 from functools import lru_cache
+from typing import TYPE_CHECKING, FrozenSet
 
 from dotenv import load_dotenv
-from fastapi import Depends
-
-from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
-from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
-from api.src.service.soccer_service import SoccerService
+from fastapi import Depends, Request
 
+from api.src.tracing import span
 
-load_dotenv()
+# Everything else is imported by the provider that needs it, so scripts that only want
+# a connection manager (compute_centrality, the schema CLI) skip the service/engine stack
+if TYPE_CHECKING:
+    from api.src.admission import AdmissionController
+    from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
+    from api.src.engine.graph_snapshot import GraphSnapshotStore
+    from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
+    from api.src.service.soccer_service import SoccerService
+    from api.src.tracing import Tracer
+    from api.src.warmup import WarmupState
 
 
 logger = logging.getLogger(__name__)
@@ -24,6 +34,10 @@ logger = logging.getLogger(__name__)
 @lru_cache(maxsize=1)
 def get_neo4j_connection_manager() -> Neo4jConnectionManager:
     """Create and return a Neo4j connection manager."""
+    from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
+
+    # Read .env on first use rather than at import time
+    load_dotenv()
     uri = os.environ["NEO4J_URI"]
     user = os.environ["NEO4J_USER"]
     password = os.environ["NEO4J_PASSWORD"]
@@ -39,7 +53,83 @@ def get_neo4j_connection_manager() -> Neo4jConnectionManager:
 
 def get_neo4j_graph_repository(ncm: Neo4jConnectionManager = Depends(get_neo4j_connection_manager)) -> Neo4jGraphRepository:
     """Provide an Graph repository using the connection manager."""
-    return Neo4jGraphRepository(ncm)
+    from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
+
+    with span("dependencies.get_neo4j_graph_repository"):
+        return Neo4jGraphRepository(ncm)
+
+
+# ============================================================
+# 🧠 GRAPH ENGINE SETUP
+# ============================================================
+
+
+@lru_cache(maxsize=1)
+def get_graph_snapshot_store() -> GraphSnapshotStore:
+    """Create and return the shared in-process graph snapshot store."""
+    from api.src.engine.graph_snapshot import GraphSnapshotStore
+
+    max_workers = int(os.environ.get("GRAPH_ENGINE_WORKERS", "4"))
+    return GraphSnapshotStore(max_workers=max_workers)
+
+
+@lru_cache(maxsize=1)
+def get_warmup_state() -> WarmupState:
+    """Return the process-wide warm-up state used by the readiness probe."""
+    from api.src.warmup import WarmupState
+
+    return WarmupState()
+
+
+# ============================================================
+# 🚦 ADMISSION CONTROL
+# ============================================================
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide admission controller."""
+    from api.src.admission import AdmissionController
+
+    return AdmissionController()
+
+
+@lru_cache(maxsize=1)
+def get_trusted_proxies() -> FrozenSet[str]:
+    """Addresses allowed to set X-Forwarded-For (TRUSTED_PROXIES, comma-separated)."""
+    load_dotenv()
+    return frozenset(host.strip() for host in os.environ.get("TRUSTED_PROXIES", "127.0.0.1,::1").split(",") if host.strip())
+
+
+def client_key(request: Request) -> str:
+    """
+    Identify the caller for rate limiting. X-Forwarded-For is only honoured
+    when the direct peer is a trusted proxy; the caller is then the nearest
+    hop, walking right to left, that is not itself a trusted proxy.
+    """
+    peer = request.client.host if request.client else "unknown"
+    trusted = get_trusted_proxies()
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or peer not in trusted:
+        return peer
+
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in trusted:
+            return hop
+    return hops[0] if hops else peer
+
+
+def admit(endpoint_class: str):
+    """Dependency holding a slot of `endpoint_class` while the endpoint runs (429/503 when shed)."""
+
+    async def dependency(request: Request):
+        async with AsyncExitStack() as stack:
+            with span("admission.wait", endpoint_class=endpoint_class):
+                await stack.enter_async_context(get_admission_controller().admit(endpoint_class, client_key(request)))
+            yield
+
+    return dependency
 
 
 # ============================================================
@@ -47,6 +137,26 @@ def get_neo4j_graph_repository(ncm: Neo4jConnectionManager = Depends(get_neo4j_c
 # ============================================================
 
 
-def get_soccer_service(ngr: Neo4jGraphRepository = Depends(get_neo4j_graph_repository)) -> SoccerService:
-    """Provide an SoccerService using the Graph Repository."""
-    return SoccerService(ngr)
+def get_soccer_service(
+    ngr: Neo4jGraphRepository = Depends(get_neo4j_graph_repository),
+    gss: GraphSnapshotStore = Depends(get_graph_snapshot_store),
+) -> SoccerService:
+    """Provide an SoccerService using the Graph Repository and graph snapshot store."""
+    from api.src.service.soccer_service import SoccerService
+
+    with span("dependencies.get_soccer_service"):
+        return SoccerService(ngr, gss)
+
+
+# ============================================================
+# 🛰️ TRACING SETUP
+# ============================================================
+
+
+@lru_cache(maxsize=1)
+def get_tracer() -> Tracer:
+    """Return the process-wide request tracer (configured from the environment)."""
+    from api.src.tracing import Tracer
+
+    load_dotenv()
+    return Tracer.from_env()
@@ -0,0 +1,159 @@
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+# Hard ceiling on random walks per sample() call; executor work cannot be cancelled, so it must end on its own
+MAX_SAMPLE_ATTEMPTS = 100_000
+
+class AliasTable:
+    """Walker's alias method: O(n) build, O(1) weighted draw."""
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        n = len(weights)
+        total = float(sum(weights))
+        if total <= 0:
+            # Nothing to weight by: fall back to a uniform draw
+            weights = [1.0] * n
+            total = float(n)
+
+        scaled = [w * n / total for w in weights]
+        self.prob: List[float] = [1.0] * n
+        self.alias: List[int] = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+
+    def draw(self, rng: random.Random) -> int:
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class TeammateChainSampler:
+    """
+    Samples N-step PLAYED_WITH chains by weighted random walks.
+
+    Start nodes are drawn by total incident edge weight and each hop by edge
+    weight, both via alias tables over the CSR adjacency. A walk is rejected
+    (and a new one drawn) if it:
+      • revisits a player
+      • uses the same club on two consecutive edges
+      • has a shortcut edge between two non-adjacent players
+      • falls outside the requested difficulty band (see `difficulty`)
+    """
+
+    def __init__(self, graph: TeammateGraph) -> None:
+        self.graph: TeammateGraph = graph
+        strength = [sum(graph.edge_weight[graph.edges[k]] for k in range(graph.offsets[i], graph.offsets[i + 1])) for i in range(graph.node_count)]
+        self.start_table: Optional[AliasTable] = AliasTable(strength) if strength else None
+        # Hop tables are built on first use; concurrent builders produce identical tables
+        self._hop_tables: Dict[int, AliasTable] = {}
+
+    # ----------------------------------------------------------------------
+    def _hop_table(self, node: int) -> AliasTable:
+        table = self._hop_tables.get(node)
+        if table is None:
+            g = self.graph
+            table = AliasTable([g.edge_weight[g.edges[k]] for k in range(g.offsets[node], g.offsets[node + 1])])
+            self._hop_tables[node] = table
+        return table
+
+    def _walk(self, steps: int, rng: random.Random) -> Optional[Tuple[List[int], List[int]]]:
+        g = self.graph
+        nodes = [self.start_table.draw(rng)]
+        path_edges: List[int] = []
+
+        for _ in range(steps):
+            u = nodes[-1]
+            if g.degree(u) == 0:
+                return None
+
+            k = g.offsets[u] + self._hop_table(u).draw(rng)
+            v, e = g.neighbors[k], g.edges[k]
+
+            if v in nodes:
+                return None
+            if path_edges and g.edge_club[e] == g.edge_club[path_edges[-1]]:
+                return None
+            # v is adjacent to u by construction; it must not touch any earlier node
+            if any(g.are_teammates(v, earlier) for earlier in nodes[:-1]):
+                return None
+
+            nodes.append(v)
+            path_edges.append(e)
+
+        return nodes, path_edges
+
+    def difficulty(self, nodes: List[int]) -> float:
+        """
+        0 (easy) .. 1 (hard): one minus the mean precomputed centrality of the
+        players to be guessed (the whole chain for single-hop questions).
+        """
+        hidden = nodes[1:-1] or nodes
+        return 1.0 - sum(self.graph.centrality[n] or 0.0 for n in hidden) / len(hidden)
+
+    # ----------------------------------------------------------------------
+    def sample(
+        self,
+        steps: int,
+        limit: int,
+        max_attempts: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+        difficulty: Optional[Tuple[float, float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return up to `limit` distinct chains shaped like the old Cypher rows:
+        { players: [{id, name}], clubs: [...], totalWeight: X }.
+
+        With `difficulty=(low, high)` only chains whose difficulty lies in
+        [low, high] are kept.
+        """
+        if steps < 1 or limit < 1 or self.start_table is None:
+            return []
+
+        g = self.graph
+        rng = rng or random.Random()
+        max_attempts = min(max_attempts or max(1000, 200 * limit * steps), MAX_SAMPLE_ATTEMPTS)
+
+        paths: List[Dict[str, Any]] = []
+        seen = set()
+        for _ in range(max_attempts):
+            walk = self._walk(steps, rng)
+            if walk is None:
+                continue
+
+            nodes, path_edges = walk
+            # Orient chains so the first player's ID sorts before the last's
+            if g.ids[nodes[0]] > g.ids[nodes[-1]]:
+                nodes.reverse()
+                path_edges.reverse()
+
+            key = tuple(nodes)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            if difficulty is not None and not difficulty[0] <= self.difficulty(nodes) <= difficulty[1]:
+                continue
+
+            paths.append(
+                {
+                    "players": [g.player(n) for n in nodes],
+                    "clubs": [g.edge_club[e] for e in path_edges],
+                    "totalWeight": sum(g.edge_weight[e] for e in path_edges),
+                }
+            )
+            if len(paths) >= limit:
+                break
+
+        return paths
@@ -0,0 +1,110 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed [start, end] intervals.
+
+    Each node keeps the intervals containing its center twice – sorted by
+    start and by end (descending) – so an overlap query touches O(log n)
+    nodes plus the k matches.
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: List[Tuple[int, int, int]]) -> None:
+        points = sorted(p for start, end, _ in intervals for p in (start, end))
+        self.center: int = points[len(points) // 2]
+
+        here = [iv for iv in intervals if iv[0] <= self.center <= iv[1]]
+        left = [iv for iv in intervals if iv[1] < self.center]
+        right = [iv for iv in intervals if iv[0] > self.center]
+
+        self.by_start: List[Tuple[int, int, int]] = sorted(here, key=lambda iv: iv[0])
+        self.by_end: List[Tuple[int, int, int]] = sorted(here, key=lambda iv: -iv[1])
+        self.left: Optional[IntervalTree] = IntervalTree(left) if left else None
+        self.right: Optional[IntervalTree] = IntervalTree(right) if right else None
+
+    def overlapping(self, lo: int, hi: int, out: Optional[List[int]] = None) -> List[int]:
+        """Return payloads of every interval that overlaps [lo, hi]."""
+        out = [] if out is None else out
+
+        if hi < self.center:
+            # Everything here ends at/after center > hi, so only the start matters
+            for start, _, payload in self.by_start:
+                if start > hi:
+                    break
+                out.append(payload)
+            if self.left:
+                self.left.overlapping(lo, hi, out)
+        elif lo > self.center:
+            for _, end, payload in self.by_end:
+                if end < lo:
+                    break
+                out.append(payload)
+            if self.right:
+                self.right.overlapping(lo, hi, out)
+        else:
+            out.extend(payload for _, _, payload in self.by_start)
+            if self.left:
+                self.left.overlapping(lo, hi, out)
+            if self.right:
+                self.right.overlapping(lo, hi, out)
+
+        return out
+
+
+class ClubRosterIndex:
+    """
+    Per-club interval trees over PLAYED_FOR stints, answering "who was at
+    club X during seasons Y–Z" with true overlap semantics: a stint counts
+    if any of its seasons falls inside the range.
+    """
+
+    def __init__(self, stints: List[Dict[str, Any]]) -> None:
+        self.stints: List[Dict[str, Any]] = []
+        intervals: Dict[str, List[Tuple[int, int, int]]] = {}
+
+        for s in stints:
+            start = s["start"] if s["start"] is not None else s["end"]
+            end = s["end"] if s["end"] is not None else start
+            if start is None:
+                continue
+
+            intervals.setdefault(s["club"], []).append((start, end, len(self.stints)))
+            self.stints.append({"id": s["player_id"], "name": s["name"], "start": start, "end": end, "apps": s["apps"] or 0})
+
+        self.trees: Dict[str, IntervalTree] = {club: IntervalTree(ivs) for club, ivs in intervals.items()}
+
+    def has_club(self, club: str) -> bool:
+        return club in self.trees
+
+    def players(self, club: str, season_from: Optional[int] = None, season_to: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return one row per player with a stint overlapping the season range, aggregated over those stints."""
+        tree = self.trees.get(club)
+        if tree is None:
+            return []
+
+        lo = season_from if season_from is not None else -(10**9)
+        hi = season_to if season_to is not None else 10**9
+        if lo > hi:
+            return []
+
+        players: Dict[str, Dict[str, Any]] = {}
+        for i in tree.overlapping(lo, hi):
+            stint = self.stints[i]
+            row = players.get(stint["id"])
+            if row is None:
+                players[stint["id"]] = {
+                    "id": stint["id"],
+                    "name": stint["name"],
+                    "appearances": stint["apps"],
+                    "first_season": stint["start"],
+                    "last_season": stint["end"],
+                }
+            else:
+                row["appearances"] += stint["apps"]
+                row["first_season"] = min(row["first_season"], stint["start"])
+                row["last_season"] = max(row["last_season"], stint["end"])
+
+        return list(players.values())
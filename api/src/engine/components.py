@@ -0,0 +1,108 @@
+from array import array
+from statistics import median
+from typing import Any, Dict, List
+
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+class ComponentIndex:
+    """
+    Connected components of the teammate graph and an approximate
+    eccentricity per player, computed once per snapshot.
+
+      • component[i]    – component id of node i (ids ordered by size, 0 = largest)
+      • eccentricity[i] – lower bound on the farthest hop distance from node i,
+                          from `sweeps` farthest-first BFS sweeps per component;
+                          exact for the periphery the sweeps start from
+
+    Two players in different components have no path, so that check is O(1)
+    instead of a search that explores a whole component.
+    """
+
+    def __init__(self, graph: TeammateGraph, sweeps: int = 4) -> None:
+        self.graph: TeammateGraph = graph
+        n = graph.node_count
+
+        self.component: array = array("l", [-1] * n)
+        members: List[List[int]] = []
+        for root in range(n):
+            if self.component[root] == -1:
+                members.append(self._label(root, len(members)))
+
+        # Renumber so component 0 is the largest
+        order = sorted(range(len(members)), key=lambda c: -len(members[c]))
+        rank = {old: new for new, old in enumerate(order)}
+        for i in range(n):
+            self.component[i] = rank[self.component[i]]
+        self.sizes: List[int] = [len(members[old]) for old in order]
+
+        self.eccentricity: array = array("l", [0] * n)
+        for nodes in members:
+            if len(nodes) > 1:
+                self._sweep(nodes, sweeps)
+
+    # ----------------------------------------------------------------------
+    def _label(self, root: int, cid: int) -> List[int]:
+        g = self.graph
+        self.component[root] = cid
+        nodes = [root]
+        for u in nodes:
+            for k in range(g.offsets[u], g.offsets[u + 1]):
+                v = g.neighbors[k]
+                if self.component[v] == -1:
+                    self.component[v] = cid
+                    nodes.append(v)
+        return nodes
+
+    def _distances(self, source: int) -> Dict[int, int]:
+        g = self.graph
+        dist = {source: 0}
+        frontier = [source]
+        while frontier:
+            next_frontier: List[int] = []
+            for u in frontier:
+                d = dist[u] + 1
+                for k in range(g.offsets[u], g.offsets[u + 1]):
+                    v = g.neighbors[k]
+                    if v not in dist:
+                        dist[v] = d
+                        next_frontier.append(v)
+            frontier = next_frontier
+        return dist
+
+    def _sweep(self, nodes: List[int], sweeps: int) -> None:
+        """Each sweep starts from the node farthest from all previous sources (ties: highest degree)."""
+        ecc = self.eccentricity
+        gap = {v: 0 for v in nodes}  # distance to the nearest source so far
+        source = max(nodes, key=self.graph.degree)
+        for sweep in range(sweeps):
+            dist = self._distances(source)
+            ecc[source] = max(dist.values())
+            for v, d in dist.items():
+                if d > ecc[v]:
+                    ecc[v] = d
+                gap[v] = d if sweep == 0 else min(gap[v], d)
+            source = max(nodes, key=lambda v: (gap[v], self.graph.degree(v)))
+            if gap[source] == 0:
+                break
+
+    # ----------------------------------------------------------------------
+    def connected(self, a: int, b: int) -> bool:
+        return self.component[a] == self.component[b]
+
+    def stats(self) -> Dict[str, Any]:
+        """Component size distribution and eccentricity spread of the largest component."""
+        largest = [i for i in range(self.graph.node_count) if self.component[i] == 0]
+        eccentricities = [self.eccentricity[i] for i in largest]
+        return {
+            "players": self.graph.node_count,
+            "components": len(self.sizes),
+            "isolated_players": sum(1 for size in self.sizes if size == 1),
+            "largest_sizes": self.sizes[:10],
+            "largest_share": self.sizes[0] / self.graph.node_count if self.sizes else 0.0,
+            "largest_component": {
+                "diameter_estimate": max(eccentricities, default=0),
+                "radius_estimate": min(eccentricities, default=0),
+                "median_eccentricity": median(eccentricities) if eccentricities else 0,
+            },
+        }
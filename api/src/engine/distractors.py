@@ -0,0 +1,68 @@
+import heapq
+import random
+from typing import Any, Dict, List, Optional
+
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+class DistractorEngine:
+    """
+    Picks wrong answers for a hidden chain node B between A and C.
+
+    A distractor is a player who played with exactly one of A or C
+    (N(A) △ N(C) minus {A, B, C}), so it looks plausible from one side only.
+    """
+
+    def __init__(self, graph: TeammateGraph) -> None:
+        self.graph: TeammateGraph = graph
+
+    def _closeness(self, candidates: frozenset, *anchors: int) -> Dict[int, int]:
+        """Score each candidate by the weight of its edge to whichever anchor it played with."""
+        g = self.graph
+        scores: Dict[int, int] = {}
+        for anchor in anchors:
+            for k in range(g.offsets[anchor], g.offsets[anchor + 1]):
+                v = g.neighbors[k]
+                if v in candidates:
+                    scores[v] = g.edge_weight[g.edges[k]]
+        return scores
+
+    def options(
+        self,
+        a: str,
+        b: str,
+        c: str,
+        limit: int,
+        rank_by_closeness: bool = False,
+        rng: Optional[random.Random] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return B plus up to `limit` distractors, shuffled, or None if B is unknown.
+
+        With `rank_by_closeness`, distractors are drawn from the candidates with the
+        strongest tie to A or C (harder questions) instead of uniformly.
+        """
+        g = self.graph
+        b_idx = g.index.get(b)
+        if b_idx is None:
+            return None
+
+        rng = rng or random.Random()
+        a_idx = g.index.get(a)
+        c_idx = g.index.get(c)
+        a_nbrs = g.neighbor_sets[a_idx] if a_idx is not None else frozenset()
+        c_nbrs = g.neighbor_sets[c_idx] if c_idx is not None else frozenset()
+
+        candidates = (a_nbrs ^ c_nbrs) - {a_idx, b_idx, c_idx}
+
+        if rank_by_closeness:
+            anchors = [i for i in (a_idx, c_idx) if i is not None]
+            scores = self._closeness(candidates, *anchors)
+            pool = heapq.nlargest(3 * limit, candidates, key=scores.__getitem__)
+        else:
+            pool = list(candidates)
+
+        distractors = rng.sample(pool, min(limit, len(pool)))
+        options = [g.player(b_idx)] + [g.player(i) for i in distractors]
+        rng.shuffle(options)
+        return options
@@ -0,0 +1,99 @@
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+class EgoNetworkBuilder:
+    """
+    Builds capped k-hop teammate neighborhoods for graph drawing.
+
+    Each player reached at hop h - 1 links to at most `caps[h - 1]` of its
+    teammates that are not already closer to the center, strongest first by
+    edge weight (or seasons overlap). Work is bounded by the caps and by
+    `max_scanned` adjacency entries per request, so a hub player costs the
+    same as anyone else. Results are cached per (player, caps, club, rank)
+    for the lifetime of the snapshot and must be treated as read-only.
+    """
+
+    def __init__(self, graph: TeammateGraph, max_scanned: int = 200_000, cache_size: int = 1024) -> None:
+        self.graph: TeammateGraph = graph
+        self.max_scanned: int = max_scanned
+        self.cache_size: int = cache_size
+        self._cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    def network(self, center: int, caps: Tuple[int, ...], club: Optional[str] = None, rank_by: str = "weight") -> Dict[str, Any]:
+        """Return {center, nodes, edges, truncated}; nodes carry their hop distance from the center."""
+        key = (center, caps, club, rank_by)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        result = self._build(center, caps, club, rank_by)
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _build(self, center: int, caps: Tuple[int, ...], club: Optional[str], rank_by: str) -> Dict[str, Any]:
+        g = self.graph
+        rank = g.edge_overlap if rank_by == "seasons_overlap" else g.edge_weight
+        offsets, neighbors, edges = g.offsets, g.neighbors, g.edges
+
+        hop: Dict[int, int] = {center: 0}
+        picked: Dict[int, Tuple[int, int]] = {}  # edge id -> (from, to)
+        frontier = [center]
+        scanned = 0
+        truncated = False
+
+        for depth, cap in enumerate(caps, start=1):
+            next_frontier: List[int] = []
+            for u in frontier:
+                start, end = offsets[u], offsets[u + 1]
+                if scanned + (end - start) > self.max_scanned:
+                    truncated = True
+                    break
+                scanned += end - start
+
+                candidates = [
+                    k
+                    for k in range(start, end)
+                    if hop.get(neighbors[k], depth) >= depth and (club is None or g.edge_club[edges[k]] == club) and edges[k] not in picked
+                ]
+                if len(candidates) > cap:
+                    truncated = True
+                    # Strongest ties first; ties broken by player index so results are stable
+                    candidates = heapq.nlargest(cap, candidates, key=lambda k: (rank[edges[k]], -neighbors[k]))
+
+                for k in candidates:
+                    v = neighbors[k]
+                    picked[edges[k]] = (u, v)
+                    if v not in hop:
+                        hop[v] = depth
+                        next_frontier.append(v)
+            frontier = next_frontier
+
+        return {
+            "center": g.player(center),
+            "nodes": [{**g.player(node), "hop": d} for node, d in hop.items()],
+            "edges": [
+                {
+                    "source": g.ids[u],
+                    "target": g.ids[v],
+                    "club": g.edge_club[eid],
+                    "start": g.edge_start[eid],
+                    "end": g.edge_end[eid],
+                    "seasons_overlap": g.edge_overlap[eid],
+                    "weight": g.edge_weight[eid],
+                }
+                for eid, (u, v) in picked.items()
+            ],
+            "truncated": truncated,
+        }
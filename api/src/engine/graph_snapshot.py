@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from api.src.engine.chain_sampler import TeammateChainSampler
+from api.src.engine.club_rosters import ClubRosterIndex
+from api.src.engine.components import ComponentIndex
+from api.src.engine.distractors import DistractorEngine
+from api.src.engine.ego_network import EgoNetworkBuilder
+from api.src.engine.name_index import NameIndex
+from api.src.engine.path_enumeration import PathEnumerator
+from api.src.engine.teammate_graph import TeammateGraph
+from api.src.engine.temporal_paths import TemporalEdgeIndex
+from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
+from api.src.tracing import span
+
+
+class GraphSnapshot:
+    """All in-process graph indexes, built from one read of the database."""
+
+    def __init__(self, teammates: TeammateGraph, names: NameIndex, rosters: ClubRosterIndex, version: Optional[str] = None) -> None:
+        # Graph version stamp (GraphMeta) read just before the rows; None if the graph was never stamped
+        self.version: Optional[str] = version
+        self.teammates: TeammateGraph = teammates
+        self.names: NameIndex = names
+        self.rosters: ClubRosterIndex = rosters
+        self.chains: TeammateChainSampler = TeammateChainSampler(teammates)
+        self.distractors: DistractorEngine = DistractorEngine(teammates)
+        self.temporal: TemporalEdgeIndex = TemporalEdgeIndex(teammates)
+        self.networks: EgoNetworkBuilder = EgoNetworkBuilder(teammates)
+        self.paths: PathEnumerator = PathEnumerator(teammates)
+        self.components: ComponentIndex = ComponentIndex(teammates)
+
+    @classmethod
+    def build(
+        cls, players: List[Dict[str, Any]], edges: List[Dict[str, Any]], stints: List[Dict[str, Any]], version: Optional[str] = None
+    ) -> "GraphSnapshot":
+        return cls(TeammateGraph(players, edges), NameIndex(players), ClubRosterIndex(stints), version)
+
+
+class GraphSnapshotStore:
+    """
+    Holds the current GraphSnapshot and a bounded worker pool for CPU-bound
+    graph work, so traversals never run on the event loop.
+
+    The snapshot is loaded lazily on first use (or eagerly via `refresh`)
+    and replaced atomically on reload.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.snapshot: Optional[GraphSnapshot] = None
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="graph-engine")
+        self._lock: asyncio.Lock = asyncio.Lock()
+        # Last graph version seen in Neo4j; the snapshot is stale while it differs
+        self._db_version: Optional[str] = None
+
+    # ----------------------------------------------------------------------
+    async def get(self, repo: Neo4jGraphRepository) -> GraphSnapshot:
+        """Return the current snapshot, loading it first if needed."""
+        if self.snapshot is None:
+            async with self._lock:
+                if self.snapshot is None:
+                    await self._load(repo)
+        return self.snapshot
+
+    async def refresh(self, repo: Neo4jGraphRepository) -> GraphSnapshot:
+        """Rebuild the snapshot from Neo4j and swap it in."""
+        async with self._lock:
+            return await self._load(repo)
+
+    async def _load(self, repo: Neo4jGraphRepository) -> GraphSnapshot:
+        started = time.perf_counter()
+        # Read the stamp first: a write landing mid-fetch then shows up as a newer version on the next poll
+        version = await repo.get_graph_version()
+        players = await repo.get_all_players()
+        edges = await repo.get_all_teammate_edges()
+        stints = await repo.get_all_stints()
+        fetched = time.perf_counter()
+
+        snapshot = await self.run(GraphSnapshot.build, players, edges, stints, version)
+        self.snapshot = snapshot
+        self._db_version = version
+
+        self.logger.info(
+            f"Graph snapshot loaded: {snapshot.teammates.node_count} players, {snapshot.teammates.edge_count} edges, "
+            f"{len(snapshot.rosters.stints)} stints, {len(snapshot.components.sizes)} components, version {snapshot.version} "
+            f"(fetch {fetched - started:.2f}s, build {time.perf_counter() - fetched:.2f}s)"
+        )
+        return snapshot
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        Graph version the current snapshot was built from, or None before the
+        first load, when the graph is unstamped, or while a newer version seen
+        in Neo4j is still being loaded.
+        """
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.version != self._db_version:
+            return None
+        return snapshot.version
+
+    async def watch(self, repo: Neo4jGraphRepository, interval: float) -> None:
+        """Poll the graph version stamp every `interval` seconds and rebuild the snapshot when it changes."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                version = await repo.get_graph_version()
+            except Exception as e:
+                self.logger.warning(f"Graph version check failed: {e}")
+                continue
+            if self.snapshot is None or version == self._db_version:
+                continue
+
+            self.logger.info(f"Graph version changed ({self._db_version} -> {version}), reloading snapshot")
+            self._db_version = version
+            try:
+                await self.refresh(repo)
+            except Exception as e:
+                self.logger.warning(f"Graph snapshot reload failed: {e}")
+
+    # ----------------------------------------------------------------------
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a CPU-bound function on the bounded graph worker pool."""
+        loop = asyncio.get_running_loop()
+        with span(f"engine.{getattr(fn, '__qualname__', 'run')}"):
+            return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        """Stop the worker pool, dropping queued work."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
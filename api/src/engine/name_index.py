@@ -0,0 +1,106 @@
+import re
+import unicodedata
+from typing import Any, Dict, List, Tuple
+
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents and collapse separators ('Kylian-Mbappé' -> 'kylian mbappe')."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    ascii_text = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    return " ".join(_NON_ALNUM.sub(" ", ascii_text).split())
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self) -> None:
+        # first character of the edge label -> (edge label, child node)
+        self.children: Dict[str, Tuple[str, "_Node"]] = {}
+        # player indices under this node, best first, at most `k`
+        self.top: List[int] = []
+
+
+class NameIndex:
+    """
+    Path-compressed prefix trie over normalized player names.
+
+    Every suffix of a name's token list is inserted ('lionel andres messi',
+    'andres messi', 'messi') so a query can start at any token. Players are
+    inserted in descending appearances order, which lets each node keep its
+    top-k list by simple appending; a lookup is a single walk of the prefix.
+    """
+
+    def __init__(self, players: List[Dict[str, Any]], k: int = 10) -> None:
+        self.k: int = k
+        self.root: _Node = _Node()
+        self.players: List[Dict[str, Any]] = [
+            {"id": p["id"], "name": p["name"], "appearances": p.get("appearances") or 0} for p in players
+        ]
+
+        order = sorted(range(len(self.players)), key=lambda i: (-self.players[i]["appearances"], self.players[i]["name"]))
+        for i in order:
+            tokens = normalize_name(self.players[i]["name"]).split()
+            for key in dict.fromkeys(" ".join(tokens[start:]) for start in range(len(tokens))):
+                self._insert(key, i)
+
+    # ----------------------------------------------------------------------
+    def _offer(self, node: _Node, player: int) -> None:
+        if len(node.top) < self.k and (not node.top or node.top[-1] != player):
+            node.top.append(player)
+
+    def _insert(self, key: str, player: int) -> None:
+        node = self.root
+        self._offer(node, player)
+
+        while key:
+            entry = node.children.get(key[0])
+            if entry is None:
+                leaf = _Node()
+                leaf.top.append(player)
+                node.children[key[0]] = (key, leaf)
+                return
+
+            label, child = entry
+            common = 0
+            limit = min(len(label), len(key))
+            while common < limit and label[common] == key[common]:
+                common += 1
+
+            if common < len(label):
+                # Split the edge; the new middle node covers everything the old child did
+                middle = _Node()
+                middle.top = list(child.top)
+                middle.children[label[common]] = (label[common:], child)
+                node.children[key[0]] = (label[:common], middle)
+                child = middle
+
+            self._offer(child, player)
+            node = child
+            key = key[common:]
+
+    # ----------------------------------------------------------------------
+    def lookup(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return up to `limit` (<= k) players whose name has a token sequence starting with `text`."""
+        prefix = normalize_name(text)
+        if not prefix:
+            return []
+
+        node = self.root
+        while prefix:
+            entry = node.children.get(prefix[0])
+            if entry is None:
+                return []
+
+            label, child = entry
+            if prefix.startswith(label):
+                prefix = prefix[len(label) :]
+            elif label.startswith(prefix):
+                prefix = ""
+            else:
+                return []
+            node = child
+
+        return [self.players[i] for i in node.top[:limit]]
@@ -0,0 +1,211 @@
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+Path = Tuple[List[int], List[int]]
+
+
+class _BudgetExhausted(Exception):
+    """The request scanned more adjacency entries than its work budget allows."""
+
+
+class PathEnumerator:
+    """
+    Enumerates several teammate paths between two players, for puzzles that
+    want more than one arbitrary shortest path.
+
+      • all_shortest – every fewest-hop path, read off a BFS parent DAG
+      • k_shortest   – Yen's K loopless paths ranked by hops, then by highest
+                       total weight
+
+    Every call is bounded by `budget` scanned adjacency entries; when it runs
+    out, the paths found so far are returned with truncated=True. An optional
+    per-edge `mask` (see TemporalEdgeIndex.active_edges) limits the edges used.
+    """
+
+    def __init__(self, graph: TeammateGraph) -> None:
+        self.graph: TeammateGraph = graph
+
+    # ----------------------------------------------------------------------
+    def all_shortest(
+        self,
+        source: int,
+        target: int,
+        max_paths: int,
+        max_depth: int = 10,
+        budget: int = 500_000,
+        mask: Optional[bytearray] = None,
+    ) -> Tuple[List[Path], bool]:
+        """Return (up to `max_paths` distinct fewest-hop paths, truncated)."""
+        if source == target:
+            return [([source], [])], False
+
+        g = self.graph
+        # Grow the DAG from the lower-degree end; paths are flipped back below
+        flipped = g.degree(source) > g.degree(target)
+        if flipped:
+            source, target = target, source
+
+        # parents[v] – every (u, edge) with dist[u] + 1 == dist[v]
+        dist: Dict[int, int] = {source: 0}
+        parents: Dict[int, List[Tuple[int, int]]] = {}
+        frontier = [source]
+        scanned = 0
+        truncated = False
+
+        for depth in range(1, max_depth + 1):
+            next_frontier: List[int] = []
+            for u in frontier:
+                start, end = g.offsets[u], g.offsets[u + 1]
+                scanned += end - start
+                if scanned > budget:
+                    return [], True
+
+                for k in range(start, end):
+                    eid = g.edges[k]
+                    if mask is not None and not mask[eid]:
+                        continue
+                    v = g.neighbors[k]
+                    seen = dist.get(v)
+                    if seen is None:
+                        dist[v] = depth
+                        parents[v] = [(u, eid)]
+                        next_frontier.append(v)
+                    elif seen == depth:
+                        parents[v].append((u, eid))
+
+            if target in dist or not next_frontier:
+                break
+            frontier = next_frontier
+
+        if target not in dist:
+            return [], False
+
+        # Walk the DAG back from the target, depth first, until max_paths are collected
+        paths: List[Path] = []
+        stack: List[Tuple[int, List[int], List[int]]] = [(target, [target], [])]
+        while stack:
+            node, nodes, path_edges = stack.pop()
+            if node == source:
+                if len(paths) == max_paths:
+                    truncated = True
+                    break
+                # Collected target-first, which is already the caller's order when the ends were flipped
+                paths.append((nodes, path_edges) if flipped else (nodes[::-1], path_edges[::-1]))
+                continue
+            for parent, eid in reversed(parents[node]):
+                stack.append((parent, nodes + [parent], path_edges + [eid]))
+
+        return paths, truncated
+
+    # ----------------------------------------------------------------------
+    def k_shortest(
+        self,
+        source: int,
+        target: int,
+        k: int,
+        max_depth: int = 10,
+        budget: int = 500_000,
+        mask: Optional[bytearray] = None,
+    ) -> Tuple[List[Path], bool]:
+        """Return (up to `k` loopless paths, fewest hops first and heaviest first among equals, truncated)."""
+        if source == target:
+            return [([source], [])], False
+
+        work = [budget]
+        try:
+            best = self._best_path(source, target, set(), set(), max_depth, mask, work)
+        except _BudgetExhausted:
+            return [], True
+        if best is None:
+            return [], False
+
+        accepted: List[Path] = [best]
+        candidates: List[Tuple[int, int, List[int], List[int]]] = []
+        queued: Set[Tuple[int, ...]] = {tuple(best[1])}
+
+        try:
+            while len(accepted) < k:
+                prev_nodes, prev_edges = accepted[-1]
+                for i in range(len(prev_nodes) - 1):
+                    spur = prev_nodes[i]
+                    root_nodes, root_edges = prev_nodes[: i + 1], prev_edges[:i]
+
+                    # Block the next edge of every accepted path sharing this root, and the root itself
+                    removed_edges = {edges[i] for nodes, edges in accepted if len(edges) > i and edges[:i] == root_edges}
+                    removed_nodes = set(root_nodes[:-1])
+
+                    spur_path = self._best_path(spur, target, removed_nodes, removed_edges, max_depth - i, mask, work)
+                    if spur_path is None:
+                        continue
+
+                    path_edges = root_edges + spur_path[1]
+                    if tuple(path_edges) in queued:
+                        continue
+                    queued.add(tuple(path_edges))
+                    heapq.heappush(candidates, (len(path_edges), -self._weight(path_edges), root_nodes[:-1] + spur_path[0], path_edges))
+
+                if not candidates:
+                    break
+                _, _, nodes, path_edges = heapq.heappop(candidates)
+                accepted.append((nodes, path_edges))
+        except _BudgetExhausted:
+            return accepted, True
+
+        return accepted, False
+
+    def _weight(self, path_edges: List[int]) -> int:
+        return sum(self.graph.edge_weight[e] for e in path_edges)
+
+    def _best_path(
+        self,
+        source: int,
+        target: int,
+        removed_nodes: Set[int],
+        removed_edges: Set[int],
+        max_hops: int,
+        mask: Optional[bytearray],
+        work: List[int],
+    ) -> Optional[Path]:
+        """
+        Dijkstra on (hops, -weight): the fewest-hop path, heaviest among those.
+        Every hop adds one to the first key, so the lexicographic cost only grows.
+        """
+        g = self.graph
+        best: Dict[int, Tuple[int, int]] = {source: (0, 0)}
+        parent: Dict[int, Tuple[int, int]] = {source: (-1, -1)}
+        heap: List[Tuple[int, int, int]] = [(0, 0, source)]
+
+        while heap:
+            hops, cost, u = heapq.heappop(heap)
+            if best.get(u) != (hops, cost):
+                continue
+            if u == target:
+                nodes, path_edges = [u], []
+                while parent[u][0] != -1:
+                    u, eid = parent[u]
+                    nodes.append(u)
+                    path_edges.append(eid)
+                return nodes[::-1], path_edges[::-1]
+            if hops == max_hops:
+                continue
+
+            start, end = g.offsets[u], g.offsets[u + 1]
+            work[0] -= end - start
+            if work[0] < 0:
+                raise _BudgetExhausted()
+
+            for k in range(start, end):
+                eid = g.edges[k]
+                v = g.neighbors[k]
+                if v in removed_nodes or eid in removed_edges or (mask is not None and not mask[eid]):
+                    continue
+                state = (hops + 1, cost - g.edge_weight[eid])
+                if v not in best or state < best[v]:
+                    best[v] = state
+                    parent[v] = (u, eid)
+                    heapq.heappush(heap, (state[0], state[1], v))
+
+        return None
@@ -0,0 +1,184 @@
+import heapq
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class TeammateGraph:
+    """
+    Immutable in-memory copy of the PLAYED_WITH graph.
+
+    Players are mapped to dense integer indices and the (undirected) adjacency
+    is stored in CSR form:
+      • offsets[i] .. offsets[i + 1]  – slice of `neighbors`/`edges` for node i
+      • neighbors                     – neighbor node index
+      • edges                         – index into the edge_* property lists
+    """
+
+    def __init__(self, players: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> None:
+        self.ids: List[str] = [p["id"] for p in players]
+        self.names: List[str] = [p["name"] for p in players]
+        self.index: Dict[str, int] = {pid: i for i, pid in enumerate(self.ids)}
+        # Precomputed offline (script/compute_centrality.py); None until that job has run
+        self.centrality: List[Optional[float]] = [p.get("centrality") for p in players]
+        self.has_centrality: bool = any(c is not None for c in self.centrality)
+
+        self.edge_club: List[str] = []
+        self.edge_start: List[Optional[int]] = []
+        self.edge_end: List[Optional[int]] = []
+        self.edge_weight: List[int] = []
+        self.edge_overlap: List[int] = []
+
+        endpoints: List[Tuple[int, int]] = []
+        for e in edges:
+            a = self.index.get(e["a"])
+            b = self.index.get(e["b"])
+            if a is None or b is None or a == b:
+                continue
+
+            endpoints.append((a, b))
+            self.edge_club.append(e["club"])
+            self.edge_start.append(e["start"])
+            self.edge_end.append(e["end"])
+            self.edge_weight.append(e["weight"] or 0)
+            self.edge_overlap.append(e["seasons_overlap"] or 0)
+
+        n = len(self.ids)
+        degree = [0] * n
+        for a, b in endpoints:
+            degree[a] += 1
+            degree[b] += 1
+
+        self.offsets: array = array("l", [0] * (n + 1))
+        for i in range(n):
+            self.offsets[i + 1] = self.offsets[i] + degree[i]
+
+        self.neighbors: array = array("l", [0] * self.offsets[n])
+        self.edges: array = array("l", [0] * self.offsets[n])
+
+        cursor = list(self.offsets[:n])
+        for eid, (a, b) in enumerate(endpoints):
+            self.neighbors[cursor[a]] = b
+            self.edges[cursor[a]] = eid
+            cursor[a] += 1
+            self.neighbors[cursor[b]] = a
+            self.edges[cursor[b]] = eid
+            cursor[b] += 1
+
+        # Per-node neighbor sets for O(1) adjacency checks
+        self.neighbor_sets: List[frozenset] = [frozenset(self.neighbors[self.offsets[i] : self.offsets[i + 1]]) for i in range(n)]
+
+    # ----------------------------------------------------------------------
+    @property
+    def node_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_club)
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def are_teammates(self, a: int, b: int) -> bool:
+        return b in self.neighbor_sets[a]
+
+    def common_teammates(self, nodes: List[int], limit: int) -> Tuple[int, List[Tuple[int, int, List[int]]]]:
+        """
+        Players who played with every node in `nodes`.
+
+        The neighbor sets are intersected smallest first, then each node's
+        adjacency is scanned once to pick up its edge to every common
+        teammate. Returns (total, top `limit` as (teammate, combined weight,
+        edge per node)), ranked by combined weight.
+        """
+        common = frozenset.intersection(*sorted((self.neighbor_sets[n] for n in nodes), key=len)) - frozenset(nodes)
+        if not common:
+            return 0, []
+
+        # links[t][i] – the edge between teammate t and nodes[i] (the heaviest, if there are several)
+        links: Dict[int, List[int]] = {t: [-1] * len(nodes) for t in common}
+        for i, n in enumerate(nodes):
+            for k in range(self.offsets[n], self.offsets[n + 1]):
+                v = self.neighbors[k]
+                if v in common:
+                    eid, best = self.edges[k], links[v][i]
+                    if best == -1 or self.edge_weight[eid] > self.edge_weight[best]:
+                        links[v][i] = eid
+
+        ranked = heapq.nlargest(
+            limit,
+            ((t, sum(self.edge_weight[e] for e in eids), eids) for t, eids in links.items()),
+            key=lambda row: (row[1], -row[0]),
+        )
+        return len(common), ranked
+
+    # ----------------------------------------------------------------------
+    # Traversal
+    # ----------------------------------------------------------------------
+    def shortest_paths_from(self, source: int, targets: Iterable[int], max_depth: int = 10) -> Dict[int, Tuple[List[int], List[int]]]:
+        """
+        Run one BFS from `source` and return (nodes, edges) paths for every
+        reachable target. Stops as soon as all targets are found or
+        `max_depth` hops have been explored.
+        """
+        remaining = set(targets)
+        found: Dict[int, Tuple[List[int], List[int]]] = {}
+
+        if source in remaining:
+            found[source] = ([source], [])
+            remaining.discard(source)
+
+        offsets, neighbors, edges = self.offsets, self.neighbors, self.edges
+        parent: Dict[int, Tuple[int, int]] = {source: (-1, -1)}
+        frontier = [source]
+        depth = 0
+
+        while frontier and remaining and depth < max_depth:
+            depth += 1
+            next_frontier: List[int] = []
+            for u in frontier:
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = neighbors[k]
+                    if v in parent:
+                        continue
+                    parent[v] = (u, edges[k])
+                    next_frontier.append(v)
+
+                    if v in remaining:
+                        found[v] = self._unwind(parent, v)
+                        remaining.discard(v)
+
+            frontier = next_frontier
+
+        return found
+
+    def _unwind(self, parent: Dict[int, Tuple[int, int]], node: int) -> Tuple[List[int], List[int]]:
+        """Rebuild the (nodes, edges) path ending at `node` from BFS parent pointers."""
+        nodes = [node]
+        path_edges: List[int] = []
+        prev, eid = parent[node]
+        while prev != -1:
+            nodes.append(prev)
+            path_edges.append(eid)
+            prev, eid = parent[prev]
+        nodes.reverse()
+        path_edges.reverse()
+        return nodes, path_edges
+
+    # ----------------------------------------------------------------------
+    # Formatting
+    # ----------------------------------------------------------------------
+    def player(self, node: int) -> Dict[str, Any]:
+        return {"id": self.ids[node], "name": self.names[node]}
+
+    def describe_path(self, nodes: List[int], path_edges: List[int], include_seasons: bool = False) -> Dict[str, Any]:
+        """Return a path in the same shape as the Cypher shortest-path query."""
+        path = {
+            "players": [self.player(n) for n in nodes],
+            "clubs": [self.edge_club[e] for e in path_edges],
+            "length": len(path_edges),
+        }
+        if include_seasons:
+            # [start, end] overlap years for each hop
+            path["seasons"] = [[self.edge_start[e], self.edge_end[e]] for e in path_edges]
+        return path
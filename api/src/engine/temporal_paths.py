@@ -0,0 +1,121 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+UNBOUNDED = 10**9
+
+
+class TemporalEdgeIndex:
+    """
+    PLAYED_WITH edges bucketed by every season they were active in, used to
+    restrict traversals to teammates from a season window.
+
+    Two search modes:
+      • windowed      – BFS over edges whose overlap years intersect the window
+      • chronological – additionally, the season used on each hop never goes
+                        back in time along the chain
+    """
+
+    def __init__(self, graph: TeammateGraph) -> None:
+        self.graph: TeammateGraph = graph
+        self.by_season: Dict[int, array] = {}
+
+        for eid in range(graph.edge_count):
+            start, end = graph.edge_start[eid], graph.edge_end[eid]
+            if start is None or end is None:
+                continue
+            for season in range(start, end + 1):
+                bucket = self.by_season.get(season)
+                if bucket is None:
+                    bucket = self.by_season[season] = array("l")
+                bucket.append(eid)
+
+        self.first_season: Optional[int] = min(self.by_season) if self.by_season else None
+        self.last_season: Optional[int] = max(self.by_season) if self.by_season else None
+
+    # ----------------------------------------------------------------------
+    def active_edges(self, season_from: Optional[int], season_to: Optional[int]) -> bytearray:
+        """Return a per-edge mask of edges active at some point in [season_from, season_to]."""
+        mask = bytearray(self.graph.edge_count)
+        if self.first_season is None:
+            return mask
+
+        lo = max(season_from if season_from is not None else self.first_season, self.first_season)
+        hi = min(season_to if season_to is not None else self.last_season, self.last_season)
+        for season in range(lo, hi + 1):
+            for eid in self.by_season.get(season, ()):
+                mask[eid] = 1
+        return mask
+
+    def shortest_path(
+        self,
+        source: int,
+        target: int,
+        season_from: Optional[int] = None,
+        season_to: Optional[int] = None,
+        chronological: bool = False,
+        max_depth: int = 10,
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """Return the fewest-hop (nodes, edges) path using only edges in the window, or None."""
+        if source == target:
+            return [source], []
+
+        g = self.graph
+        mask = self.active_edges(season_from, season_to)
+        lo = season_from if season_from is not None else -UNBOUNDED
+        hi = season_to if season_to is not None else UNBOUNDED
+
+        # Search states: (node, earliest season we can be "at" this node, parent state, edge)
+        states: List[Tuple[int, int, int, int]] = [(source, lo, -1, -1)]
+        best: Dict[int, int] = {source: lo}
+        frontier = [0]
+
+        for _ in range(max_depth):
+            next_frontier: List[int] = []
+            for si in frontier:
+                u, t = states[si][0], states[si][1]
+                for k in range(g.offsets[u], g.offsets[u + 1]):
+                    eid = g.edges[k]
+                    if not mask[eid]:
+                        continue
+
+                    if chronological:
+                        # Clip the edge to the window; it must still be active at or after t
+                        edge_end = min(g.edge_end[eid], hi)
+                        if edge_end < t:
+                            continue
+                        arrival = max(t, g.edge_start[eid], lo)
+                    else:
+                        arrival = lo
+
+                    v = g.neighbors[k]
+                    # A state is dominated if v was already reached no later (and in no more hops)
+                    if v in best and best[v] <= arrival:
+                        continue
+                    best[v] = arrival
+                    states.append((v, arrival, si, eid))
+                    next_frontier.append(len(states) - 1)
+
+                    if v == target:
+                        return self._unwind(states, len(states) - 1)
+
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return None
+
+    def _unwind(self, states: List[Tuple[int, int, int, int]], si: int) -> Tuple[List[int], List[int]]:
+        nodes: List[int] = []
+        path_edges: List[int] = []
+        while si != -1:
+            node, _, parent, eid = states[si]
+            nodes.append(node)
+            if eid != -1:
+                path_edges.append(eid)
+            si = parent
+        nodes.reverse()
+        path_edges.reverse()
+        return nodes, path_edges
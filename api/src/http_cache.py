@@ -0,0 +1,100 @@
+import hashlib
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode
+
+
+# Bump when response shapes change, so clients holding old ETags refetch after a deploy
+ETAG_SCHEME = "1"
+
+# max-age (seconds) per full route path; responses only change when the graph is reloaded
+CACHE_MAX_AGE: Dict[str, int] = {
+    "/soccer/player/id": 3600,
+    "/soccer/player/name": 600,
+    "/soccer/player/autocomplete": 600,
+    "/soccer/player/history/id": 3600,
+    "/soccer/player/history/name": 600,
+    "/soccer/player/network": 3600,
+    "/soccer/club/players": 3600,
+    "/soccer/club/roster": 3600,
+    "/soccer/teammates/common": 3600,
+    "/soccer/teammates/shortest/id": 3600,
+    "/soccer/teammates/shortest/name": 600,
+}
+
+# Randomized on every call: never cached or revalidated
+NO_STORE_PATHS = {"/soccer/teammates/question"}
+
+# Single-mode shortestPath returns an arbitrary one of several equal-length paths, so
+# the body is not byte-stable under one graph version: only a weak ETag is honest
+WEAK_ETAG_PATHS = {"/soccer/teammates/shortest/id", "/soccer/teammates/shortest/name"}
+
+
+def etag_for(version: str, path: str, query_string: bytes) -> str:
+    """ETag for a route + query parameters (in any order) under one graph version; weak for WEAK_ETAG_PATHS."""
+    params = urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+    digest = hashlib.blake2b(f"{ETAG_SCHEME}\x00{version}\x00{path}\x00{params}".encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"' if path in WEAK_ETAG_PATHS else f'"{digest}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/"x" and "x" match each other."""
+    opaque = etag.removeprefix("W/")
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+
+class ConditionalCacheMiddleware:
+    """
+    ASGI middleware adding ETag / Cache-Control to GET responses of the
+    routes in CACHE_MAX_AGE, keyed on the graph version stamped in Neo4j
+    by every ingest (GraphMeta.version), so DB-direct routes move with it too.
+
+    A request whose If-None-Match still matches is answered with 304 right
+    here, before admission, dependencies or any Neo4j query. There is no
+    version until the first snapshot has loaded, when the graph was never
+    stamped, or while a newly stamped version is being loaded; requests then
+    pass through untouched.
+    """
+
+    def __init__(self, app: Any, version_provider: Callable[[], Optional[str]]) -> None:
+        self.app: Any = app
+        self.version_provider: Callable[[], Optional[str]] = version_provider
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path in NO_STORE_PATHS:
+            await self.app(scope, receive, self._with_headers(send, [(b"cache-control", b"no-store")]))
+            return
+
+        max_age = CACHE_MAX_AGE.get(path)
+        version = self.version_provider() if max_age is not None else None
+        if version is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag = etag_for(version, path, scope.get("query_string", b""))
+        headers = [(b"etag", etag.encode("ascii")), (b"cache-control", f"public, max-age={max_age}".encode("ascii"))]
+
+        if_none_match = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"if-none-match"), None)
+        if if_none_match is not None and _matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await self.app(scope, receive, self._with_headers(send, headers))
+
+    @staticmethod
+    def _with_headers(send: Callable, headers: List[tuple]) -> Callable:
+        """Wrap `send` so successful responses carry `headers`; errors are never cached."""
+
+        async def send_with_headers(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                names = {name for name, _ in headers}
+                message["headers"] = [(n, v) for n, v in message.get("headers", []) if n.lower() not in names] + headers
+            await send(message)
+
+        return send_with_headers
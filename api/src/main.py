@@ -1,10 +1,17 @@
+import asyncio
+import contextlib
 import logging
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.src.dependencies import get_neo4j_connection_manager
-from .router import soccer_router
+from api.src.dependencies import get_neo4j_connection_manager, get_graph_snapshot_store, get_tracer, get_warmup_state
+from api.src.http_cache import ConditionalCacheMiddleware
+from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
+from api.src.tracing import TracingMiddleware
+from api.src.warmup import warm_up_until_ready
+from .router import soccer_router, system_router
 
 
 logging.basicConfig(
@@ -18,17 +25,40 @@ async def lifespan(app: FastAPI):
     """FastAPI lifespan context: initialize and clean up shared resources."""
     # ---- STARTUP ----
     connection_manager = get_neo4j_connection_manager()
-    await connection_manager.verify_connection()
+    graph_store = get_graph_snapshot_store()
+
+    # Warm up in the background (schema check, pool, query plans, graph snapshot), retrying
+    # until it succeeds; /ready reports 503 until then so deploys never route to a cold worker
+    warmup_task = asyncio.create_task(
+        warm_up_until_ready(connection_manager, graph_store, get_warmup_state(), float(os.environ.get("WARMUP_RETRY_SECONDS", "5")))
+    )
+
+    # Rebuild the snapshot (and move every ETag) whenever an ingest stamps a new graph version
+    watch_task = asyncio.create_task(
+        graph_store.watch(Neo4jGraphRepository(connection_manager), float(os.environ.get("GRAPH_VERSION_POLL_SECONDS", "30")))
+    )
 
     yield
 
     # ---- SHUTDOWN ----
-    connection_manager.close_all()
+    for task in (warmup_task, watch_task):
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await task
+    graph_store.close()
+    await connection_manager.close_all()
 
 
 app = FastAPI(lifespan=lifespan)
 
 app.include_router(soccer_router.router)
+app.include_router(system_router.router)
+
+# ETag / Cache-Control keyed on the DB-stamped graph version; matching If-None-Match gets a 304 without touching Neo4j
+app.add_middleware(ConditionalCacheMiddleware, version_provider=lambda: get_graph_snapshot_store().version)
+
+# One trace per request (router → service → repository → Neo4j); slow ones go to the slow log
+app.add_middleware(TracingMiddleware, tracer_provider=get_tracer)
 
 
 # --- THIS MIDDLEWARE CONFIGURATION ---
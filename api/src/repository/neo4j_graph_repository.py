@@ -1,6 +1,18 @@
 from typing import Optional, List, Dict, Any
 
 from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
+from api.src.tracing import traced
+
+
+PLAYER_CLUB_HISTORY_COLUMNS = ["club", "start", "end", "apps"]
+
+# Column order of the export_*_page value lists
+EXPORT_COLUMNS: Dict[str, List[str]] = {
+    "players": ["id", "name", "appearances", "first_season", "last_season", "clubs_count", "centrality"],
+    "clubs": ["name", "roster_size", "first_season", "last_season"],
+    "played_for": ["player_id", "club", "start", "end", "appearances"],
+    "played_with": ["player_a", "player_b", "club", "start", "end", "seasons_overlap", "weight"],
+}
 
 
 class Neo4jGraphRepository:
@@ -8,6 +20,13 @@ class Neo4jGraphRepository:
     def __init__(self, ncm: Neo4jConnectionManager):
         self.ncm: Neo4jConnectionManager = ncm
 
+    @traced("repository.get_graph_version")
+    async def get_graph_version(self) -> Optional[str]:
+        """Version stamped on the graph by the last data load (None if it was never stamped)."""
+        row = await self.ncm.query_one("MATCH (m:GraphMeta {key: 'graph'}) RETURN m.version AS version")
+        return row["version"] if row else None
+
+    @traced("repository.get_player_by_id")
     async def get_player_by_id(self, player_id: str) -> Optional[Dict[str, Any]]:
         row = await self.ncm.query_one(
             """
@@ -18,30 +37,86 @@ class Neo4jGraphRepository:
         )
         return row.get("player") if row else None
 
+    @traced("repository.get_players_by_ids")
+    async def get_players_by_ids(self, player_ids: List[str], include_history: bool = False) -> List[Dict[str, Any]]:
+        if include_history:
+            # The aggregation regroups rows, so carry each id's position and restore the input order at the end
+            query = """
+            UNWIND range(0, size($ids) - 1) AS i
+            WITH i, $ids[i] AS pid
+            OPTIONAL MATCH (p:Player {id: pid})
+            OPTIONAL MATCH (p)-[r:PLAYED_FOR]->(c:Club)
+            WITH i, pid, p, r, c
+            ORDER BY r.start_year
+            WITH
+                i,
+                pid,
+                p,
+                collect(
+                    CASE WHEN r IS NULL THEN NULL
+                    ELSE { club: c.name, start: r.start_year, end: r.end_year, apps: r.appearances } END
+                ) AS history
+            RETURN
+                pid AS id,
+                p IS NOT NULL AS found,
+                p.name AS name,
+                coalesce(p.total_apps, 0) AS appearances,
+                history
+            ORDER BY i
+            """
+        else:
+            query = """
+            UNWIND $ids AS pid
+            OPTIONAL MATCH (p:Player {id: pid})
+            RETURN
+                pid AS id,
+                p IS NOT NULL AS found,
+                p.name AS name
+            """
+
+        rows = await self.ncm.query_all(query, {"ids": player_ids})
+        if include_history:
+            return [
+                {
+                    "id": row["id"],
+                    "found": row["found"],
+                    "name": row["name"],
+                    "appearances": row["appearances"],
+                    "history": row["history"],
+                }
+                for row in rows
+            ]
+        return [{"id": row["id"], "found": row["found"], "name": row["name"]} for row in rows]
+
+    @traced("repository.search_players")
     async def search_players(self, name: str) -> List[Dict[str, Any]]:
         rows = await self.ncm.query_all(
             """
             MATCH (p:Player)
-            WITH 
-                p,
-                toLower(p.name) AS lo,
-                toLower(replace(trim($name), ' ', '-')) AS normalized
-            WHERE lo CONTAINS normalized
-            OPTIONAL MATCH (p)-[r:PLAYED_FOR]->(:Club)
-            WITH p, sum(r.appearances) AS apps
+            WHERE p.search_name CONTAINS $normalized
+            WITH p, coalesce(p.total_apps, 0) AS apps
             RETURN
                 p.id as id,
                 p.name as name,
                 apps AS appearances
-            ORDER BY apps DESC, p.name
+            ORDER BY coalesce(p.centrality, 0.0) DESC, apps DESC, p.name
             LIMIT 25
             """,
-            {"name": name},
+            # search_name is the lower-cased name, matched by the player_search_name_text index;
+            # centrality is precomputed offline by script/compute_centrality.py
+            {"normalized": name.strip().replace(" ", "-").lower()},
         )
         return [{"id": row["id"], "name": row["name"], "appearances": row["appearances"]} for row in rows]
 
+    @traced("repository.get_player_club_history")
     async def get_player_club_history(self, player_id: str) -> List[Dict[str, Any]]:
-        rows = await self.ncm.query_all(
+        rows = await self.get_player_club_history_rows(player_id)
+        return [dict(zip(PLAYER_CLUB_HISTORY_COLUMNS, row)) for row in rows]
+
+    @traced("repository.get_player_club_history_rows")
+    async def get_player_club_history_rows(self, player_id: str) -> List[List[Any]]:
+        """Club history as value lists in PLAYER_CLUB_HISTORY_COLUMNS order."""
+        return await self.ncm.query_values(
             """
             MATCH (p:Player {id: $id})-[r:PLAYED_FOR]->(c:Club)
             RETURN 
@@ -53,166 +128,168 @@ class Neo4jGraphRepository:
             """,
             {"id": player_id},
         )
-        return [{"club": row["club"], "start": row["start"], "end": row["end"], "apps": row["apps"]} for row in rows]
-
-    async def get_club_players(
-        self,
-        club_name: str,
-        min_apps: Optional[int] = None,
-        max_apps: Optional[int] = None,
-        season_from: Optional[int] = None,
-        season_to: Optional[int] = None,
-        order_by: str = "appearances",
-        order_dir: str = "desc",
-    ) -> List[Dict[str, Any]]:
-
-        allowed_order_by = {"name", "appearances", "first_season", "last_season"}
-        allowed_order_dir = {"asc", "desc"}
-
-        if order_by not in allowed_order_by:
-            order_by = "appearances"
-
-        if order_dir not in allowed_order_dir:
-            order_dir = "desc"
-
-        filters = ["c.name = $club_name"]
-        params: Dict[str, Any] = {"club_name": club_name}
 
-        if min_apps is not None:
-            filters.append("apps >= $min_apps")
-            params["min_apps"] = min_apps
-
-        if max_apps is not None:
-            filters.append("apps <= $max_apps")
-            params["max_apps"] = max_apps
-
-        if season_from is not None:
-            filters.append("r.start_year >= $season_from")
-            params["season_from"] = season_from
+    @traced("repository.get_shortest_teammate_path")
+    async def get_shortest_teammate_path(self, player_a: str, player_b: str) -> Optional[Dict[str, Any]]:
+        row = await self.ncm.query_one(
+            """
+            MATCH (a:Player {id: $a}), (b:Player {id: $b})
+            MATCH path = shortestPath((a)-[:PLAYED_WITH*..10]-(b))
+            WITH path,
+                 [n IN nodes(path) | {id: n.id, name: n.name}] AS players,
+                 [r IN relationships(path) | r.club] AS clubs
+            RETURN {
+                players: players,
+                clubs: clubs,
+                length: size(relationships(path))
+            } AS result
+            """,
+            {"a": player_a, "b": player_b},
+        )
+        return row.get("result") if row else None
 
-        if season_to is not None:
-            filters.append("r.end_year <= $season_to")
-            params["season_to"] = season_to
+    @traced("repository.get_all_players")
+    async def get_all_players(self) -> List[Dict[str, Any]]:
+        rows = await self.ncm.query_all(
+            """
+            MATCH (p:Player)
+            RETURN p.id AS id, p.name AS name, coalesce(p.total_apps, 0) AS appearances, p.centrality AS centrality
+            ORDER BY p.id
+            """
+        )
+        return [{"id": row["id"], "name": row["name"], "appearances": row["appearances"], "centrality": row["centrality"]} for row in rows]
 
-        where_clause = " AND ".join(filters)
+    @traced("repository.get_all_teammate_edges")
+    async def get_all_teammate_edges(self) -> List[Dict[str, Any]]:
+        rows = await self.ncm.query_all(
+            """
+            MATCH (a:Player)-[r:PLAYED_WITH]->(b:Player)
+            RETURN
+                a.id AS a,
+                b.id AS b,
+                r.club AS club,
+                r.start AS start,
+                r.end AS end,
+                r.seasons_overlap AS seasons_overlap,
+                r.weight AS weight
+            """
+        )
+        return [
+            {
+                "a": row["a"],
+                "b": row["b"],
+                "club": row["club"],
+                "start": row["start"],
+                "end": row["end"],
+                "seasons_overlap": row["seasons_overlap"],
+                "weight": row["weight"],
+            }
+            for row in rows
+        ]
 
-        query = f"""
+    @traced("repository.get_all_stints")
+    async def get_all_stints(self) -> List[Dict[str, Any]]:
+        rows = await self.ncm.query_all(
+            """
             MATCH (p:Player)-[r:PLAYED_FOR]->(c:Club)
-            WHERE {where_clause}
-            WITH p,
-                 sum(r.appearances) AS appearances,
-                 min(r.start_year) AS first_season,
-                 max(r.end_year) AS last_season
-            RETURN 
-                p.id as id, 
-                p.name as name,
-                appearances,
-                first_season,
-                last_season
-            ORDER BY {order_by} {order_dir}
-        """
-
-        rows = await self.ncm.query_all(query, params)
+            RETURN
+                p.id AS player_id,
+                p.name AS name,
+                c.name AS club,
+                r.start_year AS start,
+                r.end_year AS end,
+                r.appearances AS apps
+            """
+        )
         return [
             {
-                "id": row["id"],
+                "player_id": row["player_id"],
                 "name": row["name"],
-                "appearances": row["appearances"],
-                "first_season": row["first_season"],
-                "last_season": row["last_season"],
+                "club": row["club"],
+                "start": row["start"],
+                "end": row["end"],
+                "apps": row["apps"],
             }
             for row in rows
         ]
 
-    async def get_n_step_teammate_paths(self, steps: int = 2, limit: int = 10) -> List[Dict[str, Any]]:
-        rows = await self.ncm.query_all(
+    # ----------------------------------------------------------------------
+    # Bulk export – keyset pages over the unique-constraint indexes
+    # ----------------------------------------------------------------------
+    @traced("repository.export_players_page")
+    async def export_players_page(self, after: str, limit: int, season_from: Optional[int], season_to: Optional[int]) -> List[List[Any]]:
+        """Up to `limit` players with id > `after`, in id order, as EXPORT_COLUMNS['players'] value lists."""
+        return await self.ncm.query_values(
             """
-            MATCH (start:Player)
-            CALL apoc.path.expandConfig(start, {
-                relationshipFilter: "PLAYED_WITH>",
-                minLevel: $steps,
-                maxLevel: $steps,
-                uniqueness: "NODE_GLOBAL",
-                bfs: true,
-                filterStartNode: true
-            }) YIELD path
-
-            WITH nodes(path) AS nds, relationships(path) AS rels
-            WHERE size(rels) = $steps
- 
-            // 1) Consecutive clubs must differ for all edges
-            AND all(i IN range(0, size(rels) - 2) 
-            WHERE rels[i].club <> rels[i + 1].club)
-
-            // 2) No shortcuts between non-adjacent nodes
-            AND all(i IN range(0, size(nds) - 3) WHERE
-                all(j IN range(i + 2, size(nds) - 1) WHERE
-                    NOT EXISTS {
-                        WITH nds[i] AS ni, nds[j] AS nj
-                        MATCH (ni)-[:PLAYED_WITH]-(nj)
-                    }
-                )
-            )
-
-            AND nds[0].id < nds[size(nds) - 1].id
-
-            WITH nds, rels, reduce(w = 0, r IN rels | w + r.weight) AS total_weight
-
-            RETURN {
-                players: [x IN nds | { id: x.id, name: x.name }],
-                clubs:   [r IN rels | r.club],
-                totalWeight: total_weight
-            } AS path
-            ORDER BY total_weight * rand() DESC
+            MATCH (p:Player)
+            WHERE p.id > $after
+              AND ($season_from IS NULL AND $season_to IS NULL OR EXISTS {
+                  MATCH (p)-[r:PLAYED_FOR]->(:Club)
+                  WHERE ($season_from IS NULL OR r.end_year >= $season_from) AND ($season_to IS NULL OR r.start_year <= $season_to)
+              })
+            RETURN p.id, p.name, coalesce(p.total_apps, 0), p.first_season, p.last_season, p.clubs_count, p.centrality
+            ORDER BY p.id
             LIMIT $limit
             """,
-            {"steps": steps, "limit": limit},
+            {"after": after, "limit": limit, "season_from": season_from, "season_to": season_to},
         )
-        return [row["path"] for row in rows if row.get("path") is not None]
 
-    async def get_options(self, a: str, b: str, c: str, limit: int) -> Optional[Dict[str, Any]]:
-        row = await self.ncm.query_one(
+    @traced("repository.export_clubs_page")
+    async def export_clubs_page(self, after: str, limit: int, season_from: Optional[int], season_to: Optional[int]) -> List[List[Any]]:
+        """Up to `limit` clubs with name > `after`, in name order, as EXPORT_COLUMNS['clubs'] value lists."""
+        return await self.ncm.query_values(
             """
-            MATCH (x:Player)
-            WHERE x.id <> $a AND x.id <> $b AND x.id <> $c
-
-            // XOR logic: x connects to exactly ONE of A or C
-            WITH x,
-                exists( (x)-[:PLAYED_WITH]-(:Player {id: $a}) ) AS toA,
-                exists( (x)-[:PLAYED_WITH]-(:Player {id: $c}) ) AS toC
-            WHERE toA <> toC
-
-            ORDER BY rand()
+            MATCH (c:Club)
+            WHERE c.name > $after
+              AND ($season_from IS NULL AND $season_to IS NULL OR EXISTS {
+                  MATCH (:Player)-[r:PLAYED_FOR]->(c)
+                  WHERE ($season_from IS NULL OR r.end_year >= $season_from) AND ($season_to IS NULL OR r.start_year <= $season_to)
+              })
+            RETURN c.name, c.roster_size, c.first_season, c.last_season
+            ORDER BY c.name
             LIMIT $limit
+            """,
+            {"after": after, "limit": limit, "season_from": season_from, "season_to": season_to},
+        )
 
-            // Convert to list after limit
-            WITH collect({ id: x.id, name: x.name }) AS distractors
-
-            // B is the correct answer
-            MATCH (bNode:Player {id: $b})
-            WITH [{ id: bNode.id, name: bNode.name }] + distractors AS options
-
-            // Shuffle final list
-            RETURN apoc.coll.shuffle(options) AS options
+    @traced("repository.export_played_for_page")
+    async def export_played_for_page(self, after: str, limit: int, season_from: Optional[int], season_to: Optional[int]) -> List[List[Any]]:
+        """
+        PLAYED_FOR edges of the next `limit` players after `after`, one
+        [player id, [edge value lists]] row per player so the cursor
+        advances even past players with no matching edges.
+        """
+        return await self.ncm.query_values(
+            """
+            MATCH (p:Player)
+            WHERE p.id > $after
+            WITH p
+            ORDER BY p.id
+            LIMIT $limit
+            OPTIONAL MATCH (p)-[r:PLAYED_FOR]->(c:Club)
+            WHERE ($season_from IS NULL OR r.end_year >= $season_from) AND ($season_to IS NULL OR r.start_year <= $season_to)
+            WITH p, collect(CASE WHEN r IS NULL THEN NULL ELSE [p.id, c.name, r.start_year, r.end_year, r.appearances] END) AS edges
+            RETURN p.id, edges
+            ORDER BY p.id
             """,
-            {"a": a, "b": b, "c": c, "limit": limit},
+            {"after": after, "limit": limit, "season_from": season_from, "season_to": season_to},
         )
-        return row.get("options") if row else None
 
-    async def get_shortest_teammate_path(self, player_a: str, player_b: str) -> Optional[Dict[str, Any]]:
-        row = await self.ncm.query_one(
+    @traced("repository.export_played_with_page")
+    async def export_played_with_page(self, after: str, limit: int, season_from: Optional[int], season_to: Optional[int]) -> List[List[Any]]:
+        """Outgoing PLAYED_WITH edges of the next `limit` players after `after` (same row shape as export_played_for_page)."""
+        return await self.ncm.query_values(
             """
-            MATCH (a:Player {id: $a}), (b:Player {id: $b})
-            MATCH path = shortestPath((a)-[:PLAYED_WITH*..10]-(b))
-            WITH path,
-                 [n IN nodes(path) | {id: n.id, name: n.name}] AS players,
-                 [r IN relationships(path) | r.club] AS clubs
-            RETURN {
-                players: players,
-                clubs: clubs,
-                length: size(relationships(path))
-            } AS result
+            MATCH (a:Player)
+            WHERE a.id > $after
+            WITH a
+            ORDER BY a.id
+            LIMIT $limit
+            OPTIONAL MATCH (a)-[r:PLAYED_WITH]->(b:Player)
+            WHERE ($season_from IS NULL OR r.end >= $season_from) AND ($season_to IS NULL OR r.start <= $season_to)
+            WITH a, collect(CASE WHEN r IS NULL THEN NULL ELSE [a.id, b.id, r.club, r.start, r.end, r.seasons_overlap, r.weight] END) AS edges
+            RETURN a.id, edges
+            ORDER BY a.id
             """,
-            {"a": player_a, "b": player_b},
+            {"after": after, "limit": limit, "season_from": season_from, "season_to": season_to},
         )
-        return row.get("result") if row else None
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Coroutine, Dict
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+from api.src.database.neo4j_connection_manager import QueryDeadlineExceeded, query_deadline
+from api.src.tracing import span
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds a request may run before it is abandoned with a 504
+DEFAULT_DEADLINE: float = float(os.environ.get("API_REQUEST_DEADLINE", "10"))
+
+# Built-in per-endpoint overrides, by full route path
+DEFAULT_ENDPOINT_DEADLINES: Dict[str, float] = {
+    "/soccer/player/id": 3.0,
+    "/soccer/player/autocomplete": 2.0,
+    "/soccer/player/history/id": 3.0,
+    "/soccer/club/roster": 3.0,
+    "/soccer/teammates/question": 15.0,
+    "/soccer/teammates/shortest/id": 15.0,
+    "/soccer/teammates/shortest/name": 15.0,
+}
+
+
+def parse_endpoint_deadlines(spec: str) -> Dict[str, float]:
+    """Parse 'path=seconds,path=seconds' (API_ENDPOINT_DEADLINES) into {path: seconds}."""
+    deadlines: Dict[str, float] = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        path, sep, seconds = entry.partition("=")
+        if not sep or not path.strip().startswith("/"):
+            raise ValueError(f"API_ENDPOINT_DEADLINES entry must look like '/route/path=seconds', got '{entry.strip()}'")
+        deadlines[path.strip()] = float(seconds)
+    return deadlines
+
+
+# Per-endpoint deadlines: the built-in ones, overridden or extended by API_ENDPOINT_DEADLINES
+ENDPOINT_DEADLINES: Dict[str, float] = {**DEFAULT_ENDPOINT_DEADLINES, **parse_endpoint_deadlines(os.environ.get("API_ENDPOINT_DEADLINES", ""))}
+
+# Status logged (never actually delivered) when the client went away first
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    """Return once the client has disconnected (the body must already be read)."""
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+class DeadlineRoute(APIRoute):
+    """
+    Route that runs its handler under a deadline and stops it as soon as the
+    client disconnects.
+
+    The deadline is also handed to Neo4j as the transaction timeout of every
+    query the handler starts, so an abandoned request never keeps a query
+    running or a pooled session checked out. Requests that run out of time
+    get a 504. Streamed bodies are only covered until the handler returns;
+    the streaming response itself stops when the client goes away.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        seconds = ENDPOINT_DEADLINES.get(self.path, DEFAULT_DEADLINE)
+
+        async def deadline_handler(request: Request) -> Response:
+            # Read the body up front so the disconnect watcher only ever sees http.disconnect
+            await request.body()
+
+            async def run() -> Response:
+                # Dependency resolution, the endpoint and response serialization
+                with span("route.handler", route=self.path, deadline_s=seconds):
+                    return await handler(request)
+
+            with query_deadline(seconds):
+                work = asyncio.ensure_future(run())
+            disconnect = asyncio.ensure_future(_wait_for_disconnect(request))
+            try:
+                done, _ = await asyncio.wait({work, disconnect}, timeout=seconds, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                disconnect.cancel()
+                if not work.done():
+                    work.cancel()
+
+            if work in done:
+                try:
+                    return work.result()
+                except QueryDeadlineExceeded:
+                    pass
+            elif disconnect in done:
+                logger.info(f"Client disconnected, cancelled {request.method} {request.url.path}")
+                return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Request did not complete within its {seconds:g}s deadline",
+            )
+
+        return deadline_handler
@@ -0,0 +1,106 @@
+import csv
+import io
+import zlib
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from api.src.router.responses import ndjson_line
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow exports are unavailable without pyarrow
+    pa = None
+
+
+# Arrow column types; every other export column is an int64
+ARROW_STRING_COLUMNS = {"id", "name", "club", "player_id", "player_a", "player_b"}
+ARROW_FLOAT_COLUMNS = {"centrality"}
+
+Pages = AsyncIterator[List[List[Any]]]
+
+
+async def _ndjson(columns: List[str], pages: Pages) -> AsyncIterator[bytes]:
+    async for page in pages:
+        yield b"".join(ndjson_line(dict(zip(columns, row))) for row in page)
+
+
+async def _csv(columns: List[str], pages: Pages) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for page in pages:
+        writer.writerows(page)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header of an empty export
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _arrow_schema(columns: List[str]) -> "pa.Schema":
+    def arrow_type(column: str) -> "pa.DataType":
+        if column in ARROW_STRING_COLUMNS:
+            return pa.string()
+        if column in ARROW_FLOAT_COLUMNS:
+            return pa.float64()
+        return pa.int64()
+
+    return pa.schema([(column, arrow_type(column)) for column in columns])
+
+
+async def _arrow(columns: List[str], pages: Pages) -> AsyncIterator[bytes]:
+    """Arrow IPC stream: the schema, then one record batch per page."""
+    schema = _arrow_schema(columns)
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+
+    def drain() -> bytes:
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    async for page in pages:
+        arrays = [pa.array([row[i] for row in page], type=field.type) for i, field in enumerate(schema)]
+        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        yield drain()
+    writer.close()
+    yield drain()
+
+
+# format -> (encoder, media type, file extension)
+EXPORT_FORMATS: Dict[str, Tuple[Callable[[List[str], Pages], AsyncIterator[bytes]], str, str]] = {
+    "ndjson": (_ndjson, "application/x-ndjson", "ndjson"),
+    "csv": (_csv, "text/csv; charset=utf-8", "csv"),
+    "arrow": (_arrow, "application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream chunk by chunk (gzip container, constant memory)."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(columns: List[str], pages: Pages, export_format: str, name: str, accept_encoding: str) -> StreamingResponse:
+    """Stream export pages in `export_format`, gzip-compressed when the client accepts it."""
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"format must be one of {sorted(EXPORT_FORMATS)}")
+    if export_format == "arrow" and pa is None:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Arrow exports need pyarrow installed on the server")
+
+    encode, media_type, extension = EXPORT_FORMATS[export_format]
+    body = encode(columns, pages)
+    headers = {"Content-Disposition": f'attachment; filename="{name}.{extension}"', "Vary": "Accept-Encoding"}
+    if "gzip" in accept_encoding.lower():
+        body = _gzip(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=media_type, headers=headers)
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, Query
+from typing import List, Tuple
+
+from fastapi import APIRouter, Body, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
 from api.src.service.soccer_service import SoccerService
-from api.src.dependencies import get_soccer_service
+from api.src.dependencies import admit, get_soccer_service
+from api.src.router.deadlines import DeadlineRoute
+from api.src.router.exports import export_response
+from api.src.router.responses import FastJSONResponse, ndjson_line
 
 
-router = APIRouter(prefix="/soccer", tags=["Soccer"])
+router = APIRouter(prefix="/soccer", tags=["Soccer"], route_class=DeadlineRoute)
 
 
-@router.get("/player/id", description="Fetch a player's basic information using their unique ID.")
+@router.get("/player/id", description="Fetch a player's basic information using their unique ID.", dependencies=[Depends(admit("cheap"))])
 async def get_player_by_id(
     player_id: str = Query(..., description="Player ID"),
     service: SoccerService = Depends(get_soccer_service),
@@ -16,7 +22,21 @@ async def get_player_by_id(
     return await service.get_player_by_id(player_id)
 
 
-@router.get("/player/name", description="Search for players using partial or full name text.")
+@router.post(
+    "/players/batch",
+    description="Fetch many players by ID in a single request, optionally with club history.",
+    dependencies=[Depends(admit("cheap"))],
+)
+async def get_players_by_ids(
+    player_ids: List[str] = Body(..., embed=True, description="Player IDs"),
+    include_history: bool = Query(False, description="Include club history and total appearances"),
+    service: SoccerService = Depends(get_soccer_service),
+):
+    """Fetch a batch of players by ID; unknown IDs are listed under 'missing'."""
+    return await service.get_players_by_ids(player_ids, include_history=include_history)
+
+
+@router.get("/player/name", description="Search for players using partial or full name text.", dependencies=[Depends(admit("search"))])
 async def search_players(
     name: str = Query(..., description="Player Name"),
     service: SoccerService = Depends(get_soccer_service),
@@ -25,40 +45,85 @@ async def search_players(
     return await service.search_players(name)
 
 
-@router.get("/player/history/id", description="Get a player's entire club history using their ID.")
+@router.get(
+    "/player/autocomplete", description="Type-ahead player suggestions by name prefix, ranked by appearances.", dependencies=[Depends(admit("cheap"))]
+)
+async def autocomplete_players(
+    q: str = Query(..., description="Name prefix"),
+    limit: int = Query(10, description="Maximum suggestions (up to 10)"),
+    service: SoccerService = Depends(get_soccer_service),
+):
+    """Suggest players whose name (or any later name token) starts with the prefix."""
+    return await service.autocomplete_players(q, limit=limit)
+
+
+@router.get(
+    "/player/network",
+    description="Get a player's teammate neighborhood up to k hops as node and edge lists, capped per hop for drawing.",
+    response_class=FastJSONResponse,
+    dependencies=[Depends(admit("search"))],
+)
+async def get_player_network(
+    player_id: str = Query(..., description="Player ID"),
+    k: int = Query(2, description="Number of PLAYED_WITH hops (1-3)"),
+    caps: List[int] = Query(None, description="Teammates kept per player at each hop, one value per hop (default 25, 10, 5)"),
+    club: str = Query(None, description="Only teammate edges formed at this club"),
+    rank_by: str = Query("weight", description="Keep the strongest ties by 'weight' (default) or 'seasons_overlap'"),
+    service: SoccerService = Depends(get_soccer_service),
+):
+    """Fetch a player's capped k-hop teammate network."""
+    return FastJSONResponse(await service.get_player_network(player_id, k=k, caps=caps, club=club, rank_by=rank_by))
+
+
+@router.get(
+    "/player/history/id",
+    description="Get a player's entire club history using their ID.",
+    response_class=FastJSONResponse,
+    dependencies=[Depends(admit("cheap"))],
+)
 async def get_player_history_by_id(
     player_id: str = Query(..., description="Player ID"),
+    response_format: str = Query("objects", alias="format", description="'objects' (default) or 'rows' for a columnar {columns, rows} payload"),
     service: SoccerService = Depends(get_soccer_service),
 ):
     """Fetch a player's club history using ID."""
-    return await service.get_player_id_club_history(player_id)
+    return FastJSONResponse(await service.get_player_id_club_history(player_id, as_rows=response_format == "rows"))
 
 
-@router.get("/player/history/name", description="Get a player's club history by searching their name.")
+@router.get(
+    "/player/history/name",
+    description="Get a player's club history by searching their name.",
+    response_class=FastJSONResponse,
+    dependencies=[Depends(admit("search"))],
+)
 async def get_player_history_by_name(
     name: str = Query(..., description="Player Name"),
+    response_format: str = Query("objects", alias="format", description="'objects' (default) or 'rows' for a columnar {columns, rows} payload"),
     service: SoccerService = Depends(get_soccer_service),
 ):
     """Fetch a player's club history using name lookup."""
-    return await service.get_player_name_club_history(name)
+    return FastJSONResponse(await service.get_player_name_club_history(name, as_rows=response_format == "rows"))
 
 
 @router.get(
     "/club/players",
     description=("List all players who have played for a given club. " "Supports filtering by appearances, seasons, and sorting."),
+    response_class=FastJSONResponse,
+    dependencies=[Depends(admit("search"))],
 )
 async def get_club_players(
     club_name: str = Query(..., description="Club Name"),
     min_apps: int = Query(None, description="Minimum appearances"),
     max_apps: int = Query(None, description="Maximum appearances"),
-    season_from: int = Query(None, description="Minimum start season"),
-    season_to: int = Query(None, description="Maximum end season"),
+    season_from: int = Query(None, description="First season of the range (stints overlapping the range are included)"),
+    season_to: int = Query(None, description="Last season of the range (stints overlapping the range are included)"),
     order_by: str = Query("appearances", description="Sort field"),
     order_dir: str = Query("desc", description="Sort direction"),
+    response_format: str = Query("objects", alias="format", description="'objects' (default) or 'rows' for a columnar {columns, rows} payload"),
     service: SoccerService = Depends(get_soccer_service),
 ):
     """Fetch players who played for a club with optional filters."""
-    return await service.get_club_players(
+    players = await service.get_club_players(
         club_name=club_name,
         min_apps=min_apps,
         max_apps=max_apps,
@@ -66,17 +131,37 @@ async def get_club_players(
         season_to=season_to,
         order_by=order_by,
         order_dir=order_dir,
+        as_rows=response_format == "rows",
     )
+    return FastJSONResponse(players)
+
+
+@router.get(
+    "/club/roster",
+    description="List the players at a club during a single season.",
+    response_class=FastJSONResponse,
+    dependencies=[Depends(admit("cheap"))],
+)
+async def get_club_season_roster(
+    club_name: str = Query(..., description="Club Name"),
+    season: int = Query(..., description="Season (start year)"),
+    service: SoccerService = Depends(get_soccer_service),
+):
+    """Fetch a club's roster for one season."""
+    return FastJSONResponse(await service.get_club_season_roster(club_name, season))
 
 
 @router.get(
     "/teammates/question",
     description=("Generate N-step teammate multiple-choice questions. " "Each question hides internal players and provides distractor choices."),
+    dependencies=[Depends(admit("expensive"))],
 )
 async def get_n_step_question(
-    steps: int = Query(2, description="Number of PLAYED_WITH hops"),
-    num_questions: int = Query(10, description="How many chains to fetch"),
+    steps: int = Query(2, description="Number of PLAYED_WITH hops (1-6)"),
+    num_questions: int = Query(10, description="How many chains to fetch (up to 50)"),
     num_options: int = Query(4, description="Choices per missing node"),
+    close_distractors: bool = Query(False, description="Prefer distractors with strong ties to the visible players (harder)"),
+    difficulty: str = Query(None, description="'easy', 'medium' or 'hard' – chains are picked by the centrality of the hidden players"),
     service: SoccerService = Depends(get_soccer_service),
 ):
     """Generate MCQ questions based on N-step teammate chains."""
@@ -84,30 +169,99 @@ async def get_n_step_question(
         steps=steps,
         num_questions=num_questions,
         num_options=num_options,
+        close_distractors=close_distractors,
+        difficulty=difficulty,
     )
 
 
+@router.get(
+    "/teammates/common",
+    description="List the players who played with every one of the given players, with the club and years of each shared spell.",
+    response_class=FastJSONResponse,
+    dependencies=[Depends(admit("search"))],
+)
+async def get_common_teammates(
+    player_ids: List[str] = Query(..., description="Player IDs (2-10, repeat the parameter)"),
+    limit: int = Query(50, description="Maximum common teammates returned (up to 200)"),
+    service: SoccerService = Depends(get_soccer_service),
+):
+    """Intersect the teammate sets of several players."""
+    return FastJSONResponse(await service.get_common_teammates(player_ids, limit=limit))
+
+
 @router.get(
     "/teammates/shortest/id",
     description="Compute the shortest teammate connection path between two players using IDs.",
+    dependencies=[Depends(admit("expensive"))],
 )
 async def get_shortest_path_by_id(
     player_a: str = Query(..., description="Player A ID"),
     player_b: str = Query(..., description="Player B ID"),
+    season_from: int = Query(None, description="Only use teammates who overlapped in or after this season"),
+    season_to: int = Query(None, description="Only use teammates who overlapped in or before this season"),
+    chronological: bool = Query(False, description="Overlap seasons must never go back in time along the chain"),
+    mode: str = Query("single", description="'single' (default), 'all' for every distinct shortest path, or 'k' for the best alternatives"),
+    limit: int = Query(5, description="mode=all: maximum paths (up to 100); mode=k: number of paths K (up to 20)"),
     service: SoccerService = Depends(get_soccer_service),
 ):
     """Find shortest PLAYED_WITH path between two players using IDs."""
-    return await service.get_shortest_teammate_path_by_id(player_a, player_b)
+    return await service.get_shortest_teammate_path_by_id(player_a, player_b, season_from, season_to, chronological, mode, limit)
 
 
 @router.get(
     "/teammates/shortest/name",
     description="Find the shortest teammate path between two players by searching their names.",
+    dependencies=[Depends(admit("expensive"))],
 )
 async def get_shortest_path_by_name(
     player_a: str = Query(..., description="Player A name"),
     player_b: str = Query(..., description="Player B name"),
+    season_from: int = Query(None, description="Only use teammates who overlapped in or after this season"),
+    season_to: int = Query(None, description="Only use teammates who overlapped in or before this season"),
+    chronological: bool = Query(False, description="Overlap seasons must never go back in time along the chain"),
+    mode: str = Query("single", description="'single' (default), 'all' for every distinct shortest path, or 'k' for the best alternatives"),
+    limit: int = Query(5, description="mode=all: maximum paths (up to 100); mode=k: number of paths K (up to 20)"),
     service: SoccerService = Depends(get_soccer_service),
 ):
     """Find shortest PLAYED_WITH path between two players using names."""
-    return await service.get_shortest_teammate_path_by_name(player_a, player_b)
+    return await service.get_shortest_teammate_path_by_name(player_a, player_b, season_from, season_to, chronological, mode, limit)
+
+
+@router.post(
+    "/teammates/shortest/batch",
+    description=(
+        "Compute shortest teammate paths for many (player A ID, player B ID) pairs. "
+        "Results are streamed as NDJSON, one line per pair, in completion order."
+    ),
+    # The admission slot is released once the stream has finished, not when the handler returns
+    dependencies=[Depends(admit("expensive"))],
+)
+async def get_shortest_paths_batch(
+    pairs: List[Tuple[str, str]] = Body(..., embed=True, description="List of [player A ID, player B ID] pairs"),
+    service: SoccerService = Depends(get_soccer_service),
+):
+    """Stream shortest PLAYED_WITH paths for a batch of ID pairs."""
+    results = await service.get_shortest_teammate_paths_batch(pairs)
+    return StreamingResponse((ndjson_line(result) async for result in results), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/export/{entity}",
+    description=(
+        "Bulk-export players, clubs, played_for or played_with edges as NDJSON, CSV or Arrow IPC. "
+        "The body is streamed page by page (gzip when the client accepts it), optionally limited to a season range."
+    ),
+    # Held for the whole stream, like the batch endpoint
+    dependencies=[Depends(admit("export"))],
+)
+async def export_graph(
+    request: Request,
+    entity: str,
+    export_format: str = Query("ndjson", alias="format", description="'ndjson' (default), 'csv' or 'arrow'"),
+    season_from: int = Query(None, description="Only stints / teammate overlaps in or after this season"),
+    season_to: int = Query(None, description="Only stints / teammate overlaps in or before this season"),
+    service: SoccerService = Depends(get_soccer_service),
+):
+    """Stream one entity of the graph in the requested format."""
+    columns, pages = await service.export_graph(entity, season_from, season_to)
+    return export_response(columns, pages, export_format, entity, request.headers.get("accept-encoding", ""))
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+
+from api.src.admission import AdmissionController
+from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
+from api.src.dependencies import get_admission_controller, get_graph_snapshot_store, get_neo4j_connection_manager, get_warmup_state
+from api.src.engine.graph_snapshot import GraphSnapshotStore
+from api.src.warmup import WarmupState
+
+
+router = APIRouter(tags=["System"])
+
+
+@router.get("/metrics", description="Runtime counters for the API process.")
+async def get_metrics(
+    ncm: Neo4jConnectionManager = Depends(get_neo4j_connection_manager),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """Expose in-process metrics as JSON."""
+    return {"neo4j": {"coalescing": ncm.coalescing_stats()}, "admission": admission.stats()}
+
+
+@router.get("/ready", description="Readiness probe: 200 once warm-up has finished, 503 before that.")
+async def get_ready(state: WarmupState = Depends(get_warmup_state)):
+    """Report whether this worker has finished warming up."""
+    return JSONResponse(state.as_dict(), status_code=status.HTTP_200_OK if state.ready else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@router.get("/diagnostics/graph", description="Size, connected components and eccentricity estimates of the in-memory graph snapshot.")
+async def get_graph_diagnostics(graph_store: GraphSnapshotStore = Depends(get_graph_snapshot_store)):
+    """Report component stats of the current snapshot (503 until it has loaded)."""
+    snapshot = graph_store.snapshot
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Graph snapshot not loaded yet")
+    return {"edges": snapshot.teammates.edge_count, **snapshot.components.stats()}
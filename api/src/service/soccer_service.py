@@ -1,15 +1,48 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 
 from fastapi import HTTPException, status
 
-from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
+from api.src.engine.graph_snapshot import GraphSnapshot, GraphSnapshotStore
+from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository, EXPORT_COLUMNS, PLAYER_CLUB_HISTORY_COLUMNS
+from api.src.tracing import traced
+
+
+MAX_BATCH_PLAYER_IDS = 200
+MAX_BATCH_PATH_PAIRS = 1000
+MAX_PATH_DEPTH = 10
+# mode=all / mode=k of the shortest-path endpoints: result caps and adjacency entries scanned per request
+PATH_MODES = {"single", "all", "k"}
+MAX_ENUMERATED_PATHS = {"all": 100, "k": 20}
+PATH_ENUMERATION_BUDGET = 500_000
+MAX_AUTOCOMPLETE_RESULTS = 10
+CLUB_PLAYER_ORDER_FIELDS = {"name", "appearances", "first_season", "last_season"}
+CLUB_PLAYER_COLUMNS = ["id", "name", "appearances", "first_season", "last_season"]
+# Largest question requests accepted (sampling runs on the uncancellable graph worker pool)
+MAX_QUESTION_STEPS = 6
+MAX_QUESTIONS = 50
+# Question difficulty bands over TeammateChainSampler.difficulty
+QUESTION_DIFFICULTY_BANDS = {"easy": (0.0, 0.35), "medium": (0.35, 0.65), "hard": (0.65, 1.0)}
+# Per-hop neighbor caps of the ego network: defaults, and the largest k / cap accepted
+DEFAULT_NETWORK_CAPS = (25, 10, 5)
+MAX_NETWORK_HOPS = 3
+MAX_NETWORK_CAP = 50
+NETWORK_RANK_FIELDS = {"weight", "seasons_overlap"}
+MAX_COMMON_TEAMMATE_PLAYERS = 10
+MAX_COMMON_TEAMMATE_RESULTS = 200
+# Rows per export page for node exports, and source players per page for edge exports
+EXPORT_NODE_PAGE_SIZE = 5000
+EXPORT_EDGE_PAGE_SIZE = 1000
+EXPORT_EDGE_ENTITIES = {"played_for", "played_with"}
 
 
 class SoccerService:
 
-    def __init__(self, repo: Neo4jGraphRepository):
+    def __init__(self, repo: Neo4jGraphRepository, graph_store: GraphSnapshotStore):
         self.repo: Neo4jGraphRepository = repo
+        self.graph_store: GraphSnapshotStore = graph_store
 
+    @traced("service.get_player_by_id")
     async def get_player_by_id(self, player_id: str) -> Dict[str, Any]:
         """Fetch a player record by ID from Neo4j."""
         player = await self.repo.get_player_by_id(player_id)
@@ -18,27 +51,69 @@ class SoccerService:
 
         return player
 
+    @traced("service.get_players_by_ids")
+    async def get_players_by_ids(self, player_ids: List[str], include_history: bool = False) -> Dict[str, Any]:
+        """Resolve many player IDs in one round trip, reporting unknown IDs instead of failing."""
+        if not player_ids:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one player id is required")
+
+        # Keep the caller's order but only look each ID up once
+        unique_ids = list(dict.fromkeys(player_ids))
+        if len(unique_ids) > MAX_BATCH_PLAYER_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_BATCH_PLAYER_IDS} player ids can be requested at once",
+            )
+
+        rows = await self.repo.get_players_by_ids(unique_ids, include_history=include_history)
+
+        players: List[Dict[str, Any]] = []
+        missing: List[str] = []
+        for row in rows:
+            if not row.pop("found"):
+                missing.append(row["id"])
+                continue
+            players.append(row)
+
+        return {"players": players, "missing": missing}
+
+    @traced("service.search_players")
     async def search_players(self, name: str) -> List[Dict[str, Any]]:
         """Normalize search text and fetch matching players with total appearances."""
         return await self.repo.search_players(name)
 
-    async def get_player_id_club_history(self, player_id: str) -> List[Dict[str, Any]]:
+    @traced("service.autocomplete_players")
+    async def autocomplete_players(self, prefix: str, limit: int = MAX_AUTOCOMPLETE_RESULTS) -> List[Dict[str, Any]]:
+        """Return the most-capped players whose name starts with `prefix`, from the in-memory name trie."""
+        snapshot = await self.graph_store.get(self.repo)
+        return snapshot.names.lookup(prefix, limit=max(1, min(limit, MAX_AUTOCOMPLETE_RESULTS)))
+
+    @traced("service.get_player_id_club_history")
+    async def get_player_id_club_history(self, player_id: str, as_rows: bool = False) -> List[Dict[str, Any]] | Dict[str, Any]:
         """Verify player exists, then fetch all PLAYED_FOR edges for that player."""
         player_row = await self.repo.get_player_by_id(player_id)
         if not player_row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Player with id '{player_id}' not found")
 
-        return await self.repo.get_player_club_history(player_id)
+        return await self._player_club_history(player_id, as_rows)
 
-    async def get_player_name_club_history(self, player_name: str) -> List[Dict[str, Any]]:
+    @traced("service.get_player_name_club_history")
+    async def get_player_name_club_history(self, player_name: str, as_rows: bool = False) -> List[Dict[str, Any]] | Dict[str, Any]:
         """Find player by name then fetch their full club history."""
         players = await self.repo.search_players(player_name)
         if not players:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No player found matching '{player_name}'")
 
         player_id = players[0]["id"]
+        return await self._player_club_history(player_id, as_rows)
+
+    async def _player_club_history(self, player_id: str, as_rows: bool) -> List[Dict[str, Any]] | Dict[str, Any]:
+        """Club history as objects, or columnar ({columns, rows}) straight from the driver's value lists."""
+        if as_rows:
+            return {"columns": PLAYER_CLUB_HISTORY_COLUMNS, "rows": await self.repo.get_player_club_history_rows(player_id)}
         return await self.repo.get_player_club_history(player_id)
 
+    @traced("service.get_club_players")
     async def get_club_players(
         self,
         club_name: str,
@@ -48,28 +123,116 @@ class SoccerService:
         season_to: Optional[int] = None,
         order_by: str = "appearances",
         order_dir: str = "desc",
+        as_rows: bool = False,
+    ) -> List[Dict[str, Any]] | Dict[str, Any]:
+        """
+        Fetch players who played for a club using filters (apps, seasons, ordering).
+        The season range uses overlap semantics: a stint counts if any of its seasons is in range.
+        """
+        if order_by not in CLUB_PLAYER_ORDER_FIELDS:
+            order_by = "appearances"
+
+        if order_dir not in {"asc", "desc"}:
+            order_dir = "desc"
+
+        snapshot = await self.graph_store.get(self.repo)
+        players = snapshot.rosters.players(club_name, season_from=season_from, season_to=season_to)
+
+        if min_apps is not None:
+            players = [p for p in players if p["appearances"] >= min_apps]
+
+        if max_apps is not None:
+            players = [p for p in players if p["appearances"] <= max_apps]
+
+        players.sort(key=lambda p: p[order_by], reverse=order_dir == "desc")
+        if as_rows:
+            return {"columns": CLUB_PLAYER_COLUMNS, "rows": [[p[c] for c in CLUB_PLAYER_COLUMNS] for p in players]}
+        return players
+
+    @traced("service.get_club_season_roster")
+    async def get_club_season_roster(self, club_name: str, season: int) -> List[Dict[str, Any]]:
+        """Fetch everyone on a club's books during one season, most appearances first."""
+        snapshot = await self.graph_store.get(self.repo)
+        if not snapshot.rosters.has_club(club_name):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Club '{club_name}' not found")
+
+        players = snapshot.rosters.players(club_name, season_from=season, season_to=season)
+        players.sort(key=lambda p: p["appearances"], reverse=True)
+        return players
+
+    @traced("service.get_player_network")
+    async def get_player_network(
+        self,
+        player_id: str,
+        k: int = 2,
+        caps: Optional[List[int]] = None,
+        club: Optional[str] = None,
+        rank_by: str = "weight",
+    ) -> Dict[str, Any]:
+        """
+        Return the player's k-hop teammate neighborhood as deduplicated node and edge lists.
+        caps[h] limits how many teammates each player at hop h links to (strongest by `rank_by`);
+        `club` keeps only teammate edges formed at that club.
+        """
+        if not 1 <= k <= MAX_NETWORK_HOPS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"k must be between 1 and {MAX_NETWORK_HOPS}")
+        if caps is None:
+            caps = list(DEFAULT_NETWORK_CAPS[:k])
+        if len(caps) != k or not all(1 <= cap <= MAX_NETWORK_CAP for cap in caps):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"caps must give one value between 1 and {MAX_NETWORK_CAP} per hop",
+            )
+        if rank_by not in NETWORK_RANK_FIELDS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"rank_by must be one of {sorted(NETWORK_RANK_FIELDS)}")
+
+        snapshot = await self.graph_store.get(self.repo)
+        center = snapshot.teammates.index.get(player_id)
+        if center is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Player with id '{player_id}' not found")
+        if club is not None and not snapshot.rosters.has_club(club):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Club '{club}' not found")
+
+        return await self.graph_store.run(snapshot.networks.network, center, tuple(caps), club, rank_by)
+
+    @traced("service.get_n_step_teammate_question")
+    async def get_n_step_teammate_question(
+        self,
+        steps: int = 2,
+        num_questions: int = 10,
+        num_options: int = 4,
+        close_distractors: bool = False,
+        difficulty: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Fetch players who played for a club using filters (apps, seasons, ordering)."""
-        return await self.repo.get_club_players(
-            club_name=club_name,
-            min_apps=min_apps,
-            max_apps=max_apps,
-            season_from=season_from,
-            season_to=season_to,
-            order_by=order_by,
-            order_dir=order_dir,
-        )
-
-    async def get_n_step_teammate_question(self, steps: int = 2, num_questions: int = 10, num_options: int = 4) -> List[Dict[str, Any]]:
         """
         Build MCQ questions for N-step teammate chains:
-        1. Fetch all valid N-step PLAYED_WITH paths
+        1. Sample valid N-step PLAYED_WITH paths from the in-memory graph (optionally within a difficulty band)
         2. For each path, identify middle players
-        3. Fetch distractor options for each missing node
+        3. Pick distractor options for each missing node (XOR teammate rule)
         4. Construct question with clubs, correct answers, and shuffled choices
         """
-        rows = await self.repo.get_n_step_teammate_paths(steps, limit=num_questions)
-        # print(rows)
+        if not 1 <= steps <= MAX_QUESTION_STEPS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"steps must be between 1 and {MAX_QUESTION_STEPS}")
+        if not 1 <= num_questions <= MAX_QUESTIONS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"num_questions must be between 1 and {MAX_QUESTIONS}")
+
+        band = None
+        if difficulty is not None:
+            band = QUESTION_DIFFICULTY_BANDS.get(difficulty)
+            if band is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"difficulty must be one of {sorted(QUESTION_DIFFICULTY_BANDS)}",
+                )
+
+        snapshot = await self.graph_store.get(self.repo)
+        if band is not None and not snapshot.teammates.has_centrality:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Player centrality has not been computed yet (run script/compute_centrality.py)",
+            )
+
+        rows = await self.graph_store.run(snapshot.chains.sample, steps, num_questions, difficulty=band)
         if not rows:
             return []
 
@@ -91,7 +254,7 @@ class SoccerService:
                 mid = players[i]
                 right = players[i + 1]
 
-                options = await self.repo.get_options(left["id"], mid["id"], right["id"], num_options)
+                options = snapshot.distractors.options(left["id"], mid["id"], right["id"], num_options, rank_by_closeness=close_distractors)
 
                 result[f"Club_{i-1}_{i}"] = clubs[i - 1]
                 result[f"Choices_{i}"] = options
@@ -104,34 +267,278 @@ class SoccerService:
 
         return questions
 
-    async def get_shortest_teammate_path_by_id(self, player_a: str, player_b: str) -> Dict[str, Any]:
-        """Validate both IDs then compute shortest PLAYED_WITH path between them."""
-        a = await self.repo.get_player_by_id(player_a)
-        if not a:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Player with id '{player_a}' not found")
+    @traced("service.get_common_teammates")
+    async def get_common_teammates(self, player_ids: List[str], limit: int = 50) -> Dict[str, Any]:
+        """
+        Find everyone who played with all of the given players, with the club and
+        overlap years of each shared tie, strongest combined weight first.
+        """
+        unique_ids = list(dict.fromkeys(player_ids))
+        if not 2 <= len(unique_ids) <= MAX_COMMON_TEAMMATE_PLAYERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Between 2 and {MAX_COMMON_TEAMMATE_PLAYERS} distinct player ids are required",
+            )
 
-        b = await self.repo.get_player_by_id(player_b)
-        if not b:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Player with id '{player_b}' not found")
+        snapshot = await self.graph_store.get(self.repo)
+        graph = snapshot.teammates
+        missing = next((pid for pid in unique_ids if pid not in graph.index), None)
+        if missing is not None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Player with id '{missing}' not found")
 
-        path = await self.repo.get_shortest_teammate_path(player_a, player_b)
-        if not path:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No path from '{player_a}' to {player_b}")
-        return path
+        nodes = [graph.index[pid] for pid in unique_ids]
+        total, ranked = await self.graph_store.run(graph.common_teammates, nodes, max(1, min(limit, MAX_COMMON_TEAMMATE_RESULTS)))
+
+        return {
+            "players": [graph.player(n) for n in nodes],
+            "total": total,
+            "common": [
+                {
+                    **graph.player(teammate),
+                    "combined_weight": combined_weight,
+                    "overlaps": [
+                        {
+                            "with": graph.ids[n],
+                            "club": graph.edge_club[e],
+                            "start": graph.edge_start[e],
+                            "end": graph.edge_end[e],
+                            "weight": graph.edge_weight[e],
+                        }
+                        for n, e in zip(nodes, eids)
+                    ],
+                }
+                for teammate, combined_weight, eids in ranked
+            ],
+        }
+
+    @traced("service.get_shortest_teammate_path_by_id")
+    async def get_shortest_teammate_path_by_id(
+        self,
+        player_a: str,
+        player_b: str,
+        season_from: Optional[int] = None,
+        season_to: Optional[int] = None,
+        chronological: bool = False,
+        mode: str = "single",
+        limit: int = 5,
+    ) -> Dict[str, Any]:
+        """Validate both IDs against the graph snapshot then compute shortest PLAYED_WITH path between them."""
+        if mode not in PATH_MODES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"mode must be one of {sorted(PATH_MODES)}")
+
+        # Unknown players and players in different components are answered from memory, without any Neo4j query
+        snapshot = await self.graph_store.get(self.repo)
+        a, b = self._resolve_path_ends(snapshot, player_a, player_b)
+        return await self._find_teammate_path(snapshot, player_a, player_b, a, b, season_from, season_to, chronological, mode, limit)
 
-    async def get_shortest_teammate_path_by_name(self, player_a: str, player_b: str) -> Dict[str, Any]:
+    @traced("service.get_shortest_teammate_path_by_name")
+    async def get_shortest_teammate_path_by_name(
+        self,
+        player_a: str,
+        player_b: str,
+        season_from: Optional[int] = None,
+        season_to: Optional[int] = None,
+        chronological: bool = False,
+        mode: str = "single",
+        limit: int = 5,
+    ) -> Dict[str, Any]:
         """Resolve both players by name, then compute their shortest connection path."""
-        a = await self.repo.search_players(player_a)
+        if mode not in PATH_MODES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"mode must be one of {sorted(PATH_MODES)}")
+
+        # Both name searches in a single round trip
+        a, b = await asyncio.gather(self.repo.search_players(player_a), self.repo.search_players(player_b))
         if not a:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No player found matching '{player_a}'")
-        player_a = a[0]["id"]
-
-        b = await self.repo.search_players(player_b)
         if not b:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No player found matching '{player_b}'")
-        player_b = b[0]["id"]
+        player_a, player_b = a[0]["id"], b[0]["id"]
+
+        snapshot = await self.graph_store.get(self.repo)
+        a, b = self._resolve_path_ends(snapshot, player_a, player_b)
+        return await self._find_teammate_path(snapshot, player_a, player_b, a, b, season_from, season_to, chronological, mode, limit)
+
+    @staticmethod
+    def _resolve_path_ends(snapshot: GraphSnapshot, player_a: str, player_b: str) -> Tuple[int, int]:
+        """Snapshot indices of both players; 404 if either is unknown or they are in different components (no path)."""
+        index = snapshot.teammates.index
+        for player_id in (player_a, player_b):
+            if player_id not in index:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Player with id '{player_id}' not found")
+
+        a, b = index[player_a], index[player_b]
+        if not snapshot.components.connected(a, b):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No path from '{player_a}' to {player_b}")
+        return a, b
+
+    async def _find_teammate_path(
+        self,
+        snapshot: GraphSnapshot,
+        player_a: str,
+        player_b: str,
+        a: int,
+        b: int,
+        season_from: Optional[int],
+        season_to: Optional[int],
+        chronological: bool,
+        mode: str = "single",
+        limit: int = 5,
+    ) -> Dict[str, Any]:
+        """
+        Compute the shortest path between two connected players (IDs and snapshot indices).
+        Without an era constraint this is a Cypher shortestPath; with one, it is a
+        time-windowed (optionally chronological) BFS over the temporal edge index.
+        mode=all / mode=k enumerate several paths instead (see _enumerate_teammate_paths).
+        """
+        if mode != "single":
+            return await self._enumerate_teammate_paths(snapshot, player_a, player_b, a, b, season_from, season_to, chronological, mode, limit)
+
+        if season_from is None and season_to is None and not chronological:
+            path = await self.repo.get_shortest_teammate_path(player_a, player_b)
+        else:
+            if season_from is not None and season_to is not None and season_from > season_to:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="season_from must not be after season_to")
+
+            graph = snapshot.teammates
+            found = await self.graph_store.run(snapshot.temporal.shortest_path, a, b, season_from, season_to, chronological, MAX_PATH_DEPTH)
+            path = graph.describe_path(*found, include_seasons=True) if found else None
 
-        path = await self.repo.get_shortest_teammate_path(player_a, player_b)
         if not path:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No path from '{player_a}' to {player_b}")
         return path
+
+    async def _enumerate_teammate_paths(
+        self,
+        snapshot: GraphSnapshot,
+        player_a: str,
+        player_b: str,
+        a: int,
+        b: int,
+        season_from: Optional[int],
+        season_to: Optional[int],
+        chronological: bool,
+        mode: str,
+        limit: int,
+    ) -> Dict[str, Any]:
+        """
+        Several paths between two connected players, from the in-memory graph:
+          • mode=all – every distinct fewest-hop path (at most `limit`)
+          • mode=k   – the `limit` best loopless paths, fewest hops first, then highest total weight
+        Both stop at a fixed work budget; `truncated` tells the caller more paths may exist.
+        """
+        if chronological:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"chronological is not supported with mode={mode}")
+        if season_from is not None and season_to is not None and season_from > season_to:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="season_from must not be after season_to")
+        if not 1 <= limit <= MAX_ENUMERATED_PATHS[mode]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"limit must be between 1 and {MAX_ENUMERATED_PATHS[mode]} for mode={mode}"
+            )
+
+        graph = snapshot.teammates
+        mask = snapshot.temporal.active_edges(season_from, season_to) if season_from is not None or season_to is not None else None
+        enumerate_paths = snapshot.paths.all_shortest if mode == "all" else snapshot.paths.k_shortest
+
+        paths, truncated = await self.graph_store.run(enumerate_paths, a, b, limit, MAX_PATH_DEPTH, PATH_ENUMERATION_BUDGET, mask)
+        if not paths and not truncated:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No path from '{player_a}' to {player_b}")
+
+        described = []
+        for nodes, path_edges in paths:
+            path = graph.describe_path(nodes, path_edges, include_seasons=mask is not None)
+            path["weight"] = sum(graph.edge_weight[e] for e in path_edges)
+            described.append(path)
+        return {"paths": described, "count": len(described), "truncated": truncated}
+
+    @traced("service.get_shortest_teammate_paths_batch")
+    async def get_shortest_teammate_paths_batch(self, pairs: List[Tuple[str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Compute shortest PLAYED_WITH paths for many (a, b) pairs:
+        1. Validate the batch up front so errors surface before streaming starts
+        2. Group pairs by source so each distinct source needs a single multi-target BFS
+        3. Run the BFS jobs on the bounded graph worker pool
+        4. Yield one result per pair as each source finishes
+        """
+        if not pairs:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one player pair is required")
+        if len(pairs) > MAX_BATCH_PATH_PAIRS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_BATCH_PATH_PAIRS} player pairs can be requested at once",
+            )
+
+        snapshot = await self.graph_store.get(self.repo)
+        return self._stream_shortest_paths(snapshot, pairs)
+
+    async def _stream_shortest_paths(self, snapshot: GraphSnapshot, pairs: List[Tuple[str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        graph = snapshot.teammates
+        by_source: Dict[int, List[Tuple[str, str]]] = {}
+
+        for player_a, player_b in pairs:
+            missing = next((pid for pid in (player_a, player_b) if pid not in graph.index), None)
+            if missing is not None:
+                yield {"player_a": player_a, "player_b": player_b, "error": f"Player with id '{missing}' not found"}
+                continue
+            if not snapshot.components.connected(graph.index[player_a], graph.index[player_b]):
+                yield {"player_a": player_a, "player_b": player_b, "error": f"No path from '{player_a}' to {player_b}"}
+                continue
+            by_source.setdefault(graph.index[player_a], []).append((player_a, player_b))
+
+        async def search(source: int) -> Tuple[int, Dict[int, Tuple[List[int], List[int]]]]:
+            targets = [graph.index[b] for _, b in by_source[source]]
+            return source, await self.graph_store.run(graph.shortest_paths_from, source, targets, MAX_PATH_DEPTH)
+
+        tasks = [asyncio.ensure_future(search(source)) for source in by_source]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                source, found = await next_done
+                for player_a, player_b in by_source[source]:
+                    path = found.get(graph.index[player_b])
+                    if path is None:
+                        yield {"player_a": player_a, "player_b": player_b, "error": f"No path from '{player_a}' to {player_b}"}
+                    else:
+                        yield {"player_a": player_a, "player_b": player_b, "path": graph.describe_path(*path)}
+        finally:
+            # The client may disconnect mid-stream; drop any BFS jobs that have not started yet
+            for task in tasks:
+                task.cancel()
+
+    @traced("service.export_graph")
+    async def export_graph(
+        self,
+        entity: str,
+        season_from: Optional[int] = None,
+        season_to: Optional[int] = None,
+    ) -> Tuple[List[str], AsyncIterator[List[List[Any]]]]:
+        """
+        Validate an export request and return (columns, pages) for it.
+        Pages are fetched lazily, one keyset page at a time, so only a single
+        page is ever held in memory however large the graph is. Seasons use
+        overlap semantics: nodes are kept if any of their stints overlaps the range.
+        """
+        if entity not in EXPORT_COLUMNS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"entity must be one of {sorted(EXPORT_COLUMNS)}")
+        if season_from is not None and season_to is not None and season_from > season_to:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="season_from must not be after season_to")
+
+        return EXPORT_COLUMNS[entity], self._export_pages(entity, season_from, season_to)
+
+    async def _export_pages(self, entity: str, season_from: Optional[int], season_to: Optional[int]) -> AsyncIterator[List[List[Any]]]:
+        fetch_page = getattr(self.repo, f"export_{entity}_page")
+        edges = entity in EXPORT_EDGE_ENTITIES
+        page_size = EXPORT_EDGE_PAGE_SIZE if edges else EXPORT_NODE_PAGE_SIZE
+
+        after = ""
+        while True:
+            rows = await fetch_page(after, page_size, season_from, season_to)
+            if not rows:
+                return
+
+            # Edge pages come back as one [player id, edges] row per source player
+            page = [edge for _, player_edges in rows for edge in player_edges] if edges else rows
+            if page:
+                yield page
+
+            if len(rows) < page_size:
+                return
+            after = rows[-1][0]
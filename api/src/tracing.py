@@ -0,0 +1,285 @@
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger(__name__ + ".slow")
+
+
+class Span:
+    """One timed operation in a request's trace; children are spans started while it was current."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent", "attributes", "children", "start_ns", "end_ns", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, **attributes: Any) -> None:
+        self.name: str = name
+        self.parent: Optional[Span] = parent
+        self.trace_id: str = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id: str = os.urandom(8).hex()
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.children: List[Span] = []
+        self.start_ns: int = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+        if parent is not None:
+            parent.children.append(self)
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def walk(self) -> Iterator["Span"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def format_tree(self, depth: int = 0) -> str:
+        """Indented `duration name attributes` lines for this span and everything below it."""
+        attrs = " ".join(f"{k}={v}" for k, v in self.attributes.items())
+        line = (
+            f"{'  ' * depth}{self.duration_ms:9.2f} ms  {self.name}"
+            + (f"  {attrs}" if attrs else "")
+            + (f"  error={self.error}" if self.error else "")
+        )
+        return "\n".join([line] + [child.format_tree(depth + 1) for child in self.children])
+
+
+# Innermost open span of the current request, if it is being traced
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class _NullSpan:
+    """Stand-in yielded by span() outside a traced request."""
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def current_span() -> Any:
+    """The innermost open span, or a no-op stand-in outside a traced request."""
+    return _current_span.get() or _NULL_SPAN
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Time the block as a child of the current span; a no-op outside a traced request."""
+    parent = _current_span.get()
+    if parent is None:
+        yield _NULL_SPAN
+        return
+
+    current = Span(name, parent, **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.end()
+        _current_span.reset(token)
+
+
+def traced(name: str) -> Callable:
+    """Decorator: run an async function inside span(name)."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ============================================================
+# 📤 EXPORTERS
+# ============================================================
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(root: Span, service_name: str) -> Dict[str, Any]:
+    """Encode a finished trace as an OTLP/JSON ExportTraceServiceRequest."""
+    spans = []
+    for s in root.walk():
+        encoded = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            # SPAN_KIND_SERVER for the request itself, SPAN_KIND_INTERNAL below it
+            "kind": 2 if s is root else 1,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns or s.start_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent is not None:
+            encoded["parentSpanId"] = s.parent.span_id
+        spans.append(encoded)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON document per trace to a local file."""
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+    def export(self, payload: Dict[str, Any]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+class OTLPHttpExporter:
+    """POSTs OTLP/JSON to a collector's /v1/traces endpoint."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0) -> None:
+        self.endpoint: str = endpoint
+        self.timeout: float = timeout
+
+    def export(self, payload: Dict[str, Any]) -> None:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+# ============================================================
+# 🛰️ TRACER
+# ============================================================
+
+
+class Tracer:
+    """
+    Starts one root span per request, logs the span tree of requests slower
+    than `slow_ms`, and hands finished traces to an exporter on a background
+    thread so exporting never blocks the event loop.
+    """
+
+    def __init__(self, exporter: Any = None, slow_ms: float = 1000.0, service_name: str = "sportgraph-api", max_pending: int = 1000) -> None:
+        self.exporter: Any = exporter
+        self.slow_ms: float = slow_ms
+        self.service_name: str = service_name
+        self._pending: "queue.Queue[Span]" = queue.Queue(maxsize=max_pending)
+        if exporter is not None:
+            threading.Thread(target=self._export_loop, name="trace-exporter", daemon=True).start()
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """
+        TRACE_EXPORTER      none (default) | file | otlp
+        TRACE_FILE          file exporter path (default traces.jsonl)
+        TRACE_OTLP_ENDPOINT otlp exporter URL (default http://127.0.0.1:4318/v1/traces)
+        SLOW_REQUEST_MS     slow-log threshold (default 1000)
+        SLOW_REQUEST_LOG    also write the slow log to this file
+        """
+        kind = os.environ.get("TRACE_EXPORTER", "none").lower()
+        exporter = None
+        if kind == "file":
+            exporter = FileSpanExporter(os.environ.get("TRACE_FILE", "traces.jsonl"))
+        elif kind == "otlp":
+            exporter = OTLPHttpExporter(os.environ.get("TRACE_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces"))
+
+        slow_log = os.environ.get("SLOW_REQUEST_LOG")
+        if slow_log:
+            slow_logger.addHandler(logging.FileHandler(slow_log))
+
+        return cls(exporter=exporter, slow_ms=float(os.environ.get("SLOW_REQUEST_MS", "1000")))
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Open a root span for the block; finish, slow-log and export it afterwards."""
+        root = Span(name, **attributes)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = type(e).__name__
+            raise
+        finally:
+            root.end()
+            _current_span.reset(token)
+            self._finish(root)
+
+    def _finish(self, root: Span) -> None:
+        if root.duration_ms >= self.slow_ms:
+            slow_logger.warning(f"Slow request ({root.duration_ms:.0f} ms, trace {root.trace_id}):\n{root.format_tree()}")
+
+        if self.exporter is not None:
+            try:
+                self._pending.put_nowait(root)
+            except queue.Full:
+                logger.warning("Trace export queue full, dropping trace")
+
+    def _export_loop(self) -> None:
+        while True:
+            root = self._pending.get()
+            try:
+                self.exporter.export(to_otlp(root, self.service_name))
+            except Exception as e:
+                logger.warning(f"Failed to export trace {root.trace_id}: {e}")
+
+
+class TracingMiddleware:
+    """ASGI middleware tracing every HTTP request, including the time spent streaming the body."""
+
+    def __init__(self, app: Any, tracer_provider: Callable[[], Tracer]) -> None:
+        self.app: Any = app
+        self.tracer_provider: Callable[[], Tracer] = tracer_provider
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with self.tracer_provider().trace(
+            f"{scope['method']} {scope['path']}", **{"http.method": scope["method"], "http.target": scope["path"]}
+        ) as root:
+
+            async def traced_send(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    root.set("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, traced_send)
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
+from api.src.database.neo4j_schema_manager import Neo4jSchemaManager, REPOSITORY_QUERY_SAMPLES
+from api.src.engine.graph_snapshot import GraphSnapshotStore
+from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Warm-up progress shared with the /ready probe."""
+
+    def __init__(self) -> None:
+        self.ready: bool = False
+        self.phase: str = "pending"
+        self.error: Optional[str] = None
+        self.attempts: int = 0
+        self.timings: Dict[str, float] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "phase": self.phase,
+            "error": self.error,
+            "attempts": self.attempts,
+            "timings": {name: round(seconds, 3) for name, seconds in self.timings.items()},
+        }
+
+
+async def warm_up(ncm: Neo4jConnectionManager, graph_store: GraphSnapshotStore, state: WarmupState) -> None:
+    """
+    Bring a worker to steady state before it takes traffic:
+    1. connect  – verify Neo4j is reachable
+    2. schema   – check every required index is online (read-only; migrations run on deploy)
+    3. pool     – pre-open pooled connections
+    4. plans    – run every repository query once so Neo4j caches its plan
+    5. snapshot – build the in-memory graph indexes
+    Marks the state ready only when every phase has finished.
+    """
+    repo = Neo4jGraphRepository(ncm)
+    started = time.perf_counter()
+    state.attempts += 1
+    state.timings = {}
+
+    async def phase(name: str, work) -> Any:
+        state.phase = name
+        phase_started = time.perf_counter()
+        result = await work
+        state.timings[name] = time.perf_counter() - phase_started
+        return result
+
+    try:
+        await phase("connect", ncm.verify_connection())
+        await phase("schema", Neo4jSchemaManager(ncm).verify())
+        opened = await phase("pool", ncm.warm_pool())
+        await phase("plans", _run_sample_queries(repo))
+        await phase("snapshot", graph_store.refresh(repo))
+    except Exception as e:
+        state.error = f"{state.phase}: {e}"
+        state.phase = "failed"
+        raise
+
+    state.timings["total"] = time.perf_counter() - started
+    state.phase = "done"
+    state.ready = True
+
+    breakdown = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in state.timings.items() if name != "total")
+    logger.info(f"Warm-up complete in {state.timings['total']:.2f}s ({breakdown}; {opened} pooled connections)")
+
+
+async def warm_up_until_ready(
+    ncm: Neo4jConnectionManager,
+    graph_store: GraphSnapshotStore,
+    state: WarmupState,
+    retry_delay: float = 5.0,
+    max_retry_delay: float = 60.0,
+) -> None:
+    """Run warm_up until it succeeds, backing off between attempts; /ready reports the last failure meanwhile."""
+    delay = retry_delay
+    while True:
+        try:
+            await warm_up(ncm, graph_store, state)
+            return
+        except Exception:
+            logger.exception(f"Warm-up attempt {state.attempts} failed ({state.error}); retrying in {delay:g}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_retry_delay)
+
+
+async def _run_sample_queries(repo: Neo4jGraphRepository) -> None:
+    for name, call, allowed_scans in REPOSITORY_QUERY_SAMPLES:
+        # Bulk loaders (the only queries allowed to scan) run as part of the snapshot phase
+        if allowed_scans:
+            continue
+        try:
+            await call(repo)
+        except Exception as e:
+            logger.warning(f"Warm-up query {name} failed: {e}")
@@ -0,0 +1,55 @@
+import json
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from neo4j import Record
+
+
+COLUMNS = ["club", "start", "end", "apps"]
+ROW_COUNTS = [10, 1_000, 50_000]
+REPEATS = 20
+
+
+def make_records(n: int) -> list[Record]:
+    """Build driver Records shaped like the club-history query."""
+    return [Record(zip(COLUMNS, (f"Club-{i % 500}", 2000 + i % 25, 2001 + i % 25, i % 300))) for i in range(n)]
+
+
+def before(records: list[Record]) -> bytes:
+    """Old path: record.data() -> repository rebuild -> jsonable_encoder -> stdlib json (JSONResponse.render)."""
+    rows = [record.data() for record in records]
+    rebuilt = [{"club": row["club"], "start": row["start"], "end": row["end"], "apps": row["apps"]} for row in rows]
+    encoded = jsonable_encoder(rebuilt)
+    return json.dumps(encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def after_objects(records: list[Record]) -> bytes:
+    """New default path: record.values() -> one dict per row -> orjson, no jsonable_encoder."""
+    rows = [record.values() for record in records]
+    return orjson.dumps([dict(zip(COLUMNS, row)) for row in rows])
+
+
+def after_rows(records: list[Record]) -> bytes:
+    """Opt-in columnar path (format=rows): record.values() straight into orjson."""
+    return orjson.dumps({"columns": COLUMNS, "rows": [record.values() for record in records]})
+
+
+def per_row_us(fn, records: list[Record]) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(records)
+        best = min(best, time.perf_counter() - start)
+    return best / len(records) * 1e6
+
+
+if __name__ == "__main__":
+    print(f"{'rows':>8} | {'before':>10} | {'objects':>10} | {'rows fmt':>10}   (µs per row, best of {REPEATS})")
+    for n in ROW_COUNTS:
+        records = make_records(n)
+        timings = [per_row_us(fn, records) for fn in (before, after_objects, after_rows)]
+        print(f"{n:>8} | {timings[0]:>10.3f} | {timings[1]:>10.3f} | {timings[2]:>10.3f}")
+
+
+# python script/bench_response_path.py
@@ -0,0 +1,217 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+try:
+    import psutil
+except ImportError:  # memory-based recycling is skipped without psutil
+    psutil = None
+    print("⚠️ psutil is not installed: browsers are only recycled by page count, never on memory")
+
+
+# Chrome DevTools URL patterns dropped before they hit the network
+BLOCKED_URL_PATTERNS = [
+    # images / media / fonts / stylesheets
+    *[f"*.{ext}*" for ext in ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "mp4", "webm", "mp3", "woff", "woff2", "ttf", "otf", "css")],
+    # third-party ads, analytics and tag managers
+    *[
+        f"*{domain}*"
+        for domain in (
+            "doubleclick.net",
+            "googlesyndication.com",
+            "googletagmanager.com",
+            "google-analytics.com",
+            "adservice.google.com",
+            "amazon-adsystem.com",
+            "adnxs.com",
+            "criteo.com",
+            "pubmatic.com",
+            "rubiconproject.com",
+            "openx.net",
+            "scorecardresearch.com",
+            "quantserve.com",
+            "facebook.net",
+            "hotjar.com",
+        )
+    ],
+]
+
+NAVIGATION_TIMING_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav ? [nav.domContentLoadedEventEnd, nav.loadEventEnd] : null;
+"""
+
+
+class _PooledBrowser:
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver: Any) -> None:
+        self.driver: Any = driver
+        self.pages: int = 0
+
+
+class _DomainTimings:
+    __slots__ = ("pages", "dom_ready_ms", "load_ms", "max_load_ms")
+
+    def __init__(self) -> None:
+        self.pages: int = 0
+        self.dom_ready_ms: float = 0.0
+        self.load_ms: float = 0.0
+        self.max_load_ms: float = 0.0
+
+
+class BrowserPool:
+    """
+    Keeps pre-launched Chrome instances so a failing browser is replaced
+    instantly instead of waiting for a fresh launch.
+
+      • `standby` idle browsers are kept warm (launched on a background thread)
+      • a browser is recycled after `max_pages` pages, when its process tree
+        grows past `max_memory_mb` (needs psutil), or when a page fails on it
+      • every browser blocks images, CSS, fonts, media and ad/analytics
+        domains through CDP before its first page
+      • DOM-ready and load timings are collected per domain
+    """
+
+    def __init__(self, factory: Callable[[], Any], standby: int = 1, max_pages: int = 200, max_memory_mb: float = 1500.0) -> None:
+        self.factory: Callable[[], Any] = factory
+        self.standby: int = standby
+        self.max_pages: int = max_pages
+        self.max_memory_mb: float = max_memory_mb
+
+        self._idle: List[_PooledBrowser] = []
+        self._lock = threading.Condition()
+        # undetected_chromedriver patches its binary on launch, so launches never overlap
+        self._launch_lock = threading.Lock()
+        self._launching: int = 0
+        self._closed: bool = False
+        self.launches: int = 0
+        self.recycled: int = 0
+        self.timings: Dict[str, _DomainTimings] = {}
+
+    # ----------------------------------------------------------------------
+    def _launch(self) -> _PooledBrowser:
+        with self._launch_lock:
+            started = time.perf_counter()
+            driver = self.factory()
+            self.launches += 1
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"⚠️ Could not enable resource blocking: {e}")
+        print(f"🧭 Browser launched in {time.perf_counter() - started:.1f}s")
+        return _PooledBrowser(driver)
+
+    def _launch_standby(self) -> None:
+        try:
+            browser = self._launch()
+        except Exception as e:
+            print(f"⚠️ Standby browser failed to launch: {e}")
+            browser = None
+        with self._lock:
+            self._launching -= 1
+            if browser is not None:
+                if self._closed:
+                    self._quit(browser)
+                else:
+                    self._idle.append(browser)
+            self._lock.notify_all()
+
+    def _top_up(self) -> None:
+        """Start background launches until `standby` browsers are idle or on their way (lock held)."""
+        while not self._closed and len(self._idle) + self._launching < self.standby:
+            self._launching += 1
+            threading.Thread(target=self._launch_standby, name="browser-standby", daemon=True).start()
+
+    def _quit(self, browser: _PooledBrowser) -> None:
+        self.recycled += 1
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+
+    def _memory_mb(self, browser: _PooledBrowser) -> Optional[float]:
+        if psutil is None:
+            return None
+        try:
+            root = psutil.Process(browser.driver.service.process.pid)
+            return sum(p.memory_info().rss for p in [root, *root.children(recursive=True)]) / 2**20
+        except Exception:
+            return None
+
+    def _worn_out(self, browser: _PooledBrowser) -> bool:
+        if browser.pages >= self.max_pages:
+            return True
+        memory = self._memory_mb(browser)
+        return memory is not None and memory > self.max_memory_mb
+
+    # ----------------------------------------------------------------------
+    @contextmanager
+    def browser(self) -> Iterator[Any]:
+        """
+        Borrow a driver for one page. A page that raises recycles the browser;
+        otherwise its timings are recorded and it goes back to the pool.
+        """
+        with self._lock:
+            if not self._idle:
+                # Waiting for a standby launch beats starting another one from scratch
+                self._top_up()
+                self._lock.wait_for(lambda: self._idle or not self._launching)
+            browser = self._idle.pop() if self._idle else None
+            # Warm a replacement while this page loads, so a failure can fail over instantly
+            self._top_up()
+        if browser is None:
+            browser = self._launch()
+
+        try:
+            yield browser.driver
+        except BaseException:
+            self._quit(browser)
+            with self._lock:
+                self._top_up()
+            raise
+
+        browser.pages += 1
+        self._record_timings(browser.driver)
+        with self._lock:
+            if self._worn_out(browser):
+                self._quit(browser)
+            else:
+                self._idle.append(browser)
+            self._top_up()
+
+    def _record_timings(self, driver: Any) -> None:
+        try:
+            timing = driver.execute_script(NAVIGATION_TIMING_JS)
+            domain = urlparse(driver.current_url).netloc
+        except Exception:
+            return
+        if not timing:
+            return
+
+        dom_ready, load = timing
+        stats = self.timings.setdefault(domain, _DomainTimings())
+        stats.pages += 1
+        stats.dom_ready_ms += dom_ready
+        stats.load_ms += load
+        stats.max_load_ms = max(stats.max_load_ms, load)
+
+    def close(self) -> None:
+        """Quit every idle browser; standbys that finish launching later are quit too."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            self._quit(browser)
+
+    def report(self) -> str:
+        lines = [f"🧭 Browsers: {self.launches} launched, {self.recycled} recycled"]
+        for domain, stats in sorted(self.timings.items()):
+            lines.append(
+                f"   {domain:<35} pages={stats.pages:<6} dom_ready={stats.dom_ready_ms / stats.pages:7.0f} ms  "
+                f"load={stats.load_ms / stats.pages:7.0f} ms  max_load={stats.max_load_ms:7.0f} ms"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.stats import rankdata
+
+from api.src.database.neo4j_schema_manager import STAMP_GRAPH_VERSION
+from api.src.dependencies import get_neo4j_connection_manager
+from api.src.repository.neo4j_graph_repository import Neo4jGraphRepository
+
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOL = 1e-10
+PAGERANK_MAX_ITER = 200
+BETWEENNESS_PIVOTS = 256
+BETWEENNESS_BATCH = 32
+WRITE_BATCH = 5000
+
+WRITE_CENTRALITY = """
+UNWIND $rows AS row
+MATCH (p:Player {id: row.id})
+SET
+    p.degree = row.degree,
+    p.pagerank = row.pagerank,
+    p.betweenness = row.betweenness,
+    p.centrality = row.centrality
+"""
+
+
+# ============================================================
+# 🧮 GRAPH MEASURES
+# ============================================================
+
+
+def build_adjacency(ids: List[str], edges: List[Dict[str, Any]]) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+    """Return (binary adjacency, weighted adjacency) of the undirected PLAYED_WITH graph."""
+    index = {pid: i for i, pid in enumerate(ids)}
+    pairs = [
+        (index[e["a"]], index[e["b"]], float(e["weight"] or 0) or 1.0) for e in edges if e["a"] in index and e["b"] in index and e["a"] != e["b"]
+    ]
+    n = len(ids)
+
+    rows = np.array([a for a, _, _ in pairs] + [b for _, b, _ in pairs], dtype=np.int64)
+    cols = np.array([b for _, b, _ in pairs] + [a for a, _, _ in pairs], dtype=np.int64)
+    weights = np.array([w for _, _, w in pairs] * 2, dtype=np.float64)
+
+    weighted = sparse.csr_matrix((weights, (rows, cols)), shape=(n, n))
+    binary = weighted.copy()
+    binary.data[:] = 1.0
+    return binary, weighted
+
+
+def pagerank(weighted: sparse.csr_matrix) -> np.ndarray:
+    """Weighted PageRank by power iteration; dangling players spread their rank uniformly."""
+    n = weighted.shape[0]
+    out = np.asarray(weighted.sum(axis=1)).ravel()
+    dangling = out == 0
+    inv_out = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+    transition_t = (sparse.diags(inv_out) @ weighted).T.tocsr()
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(PAGERANK_MAX_ITER):
+        nxt = PAGERANK_DAMPING * (transition_t @ rank + rank[dangling].sum() / n) + (1.0 - PAGERANK_DAMPING) / n
+        converged = np.abs(nxt - rank).sum() < PAGERANK_TOL
+        rank = nxt
+        if converged:
+            break
+    return rank
+
+
+def approximate_betweenness(binary: sparse.csr_matrix, pivots: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Brandes betweenness estimated from `pivots` random sources.
+
+    Each batch of sources is a block of columns: the BFS forward pass counts
+    shortest paths level by level with sparse mat-mat products, and the
+    dependency accumulation walks the levels back the same way.
+    """
+    n = binary.shape[0]
+    pivots = min(pivots, n)
+    sources = rng.choice(n, size=pivots, replace=False)
+    scores = np.zeros(n)
+
+    for start in range(0, pivots, BETWEENNESS_BATCH):
+        batch = sources[start : start + BETWEENNESS_BATCH]
+        cols = np.arange(len(batch))
+
+        sigma = np.zeros((n, len(batch)))
+        sigma[batch, cols] = 1.0
+        dist = np.full((n, len(batch)), -1, dtype=np.int32)
+        dist[batch, cols] = 0
+
+        frontier = sigma.copy()
+        depth = 0
+        while frontier.any():
+            reached = binary @ frontier
+            reached[dist >= 0] = 0.0
+            new = reached > 0
+            depth += 1
+            dist[new] = depth
+            sigma[new] = reached[new]
+            frontier = np.where(new, reached, 0.0)
+
+        delta = np.zeros_like(sigma)
+        for level in range(depth - 1, 0, -1):
+            below = np.where(dist == level + 1, (1.0 + delta) / np.where(sigma > 0, sigma, 1.0), 0.0)
+            delta += np.where(dist == level, sigma * (binary @ below), 0.0)
+
+        scores += delta.sum(axis=1)
+
+    # Scale the sample up to all sources; each undirected path was counted from both ends
+    return scores * (n / pivots) / 2.0
+
+
+def combined_centrality(*measures: np.ndarray) -> np.ndarray:
+    """Mean percentile rank of the given measures, in [0, 1]."""
+    n = len(measures[0])
+    if n <= 1:
+        return np.ones(n)
+    return np.mean([(rankdata(m, method="average") - 1.0) / (n - 1) for m in measures], axis=0)
+
+
+# ============================================================
+# 🚀 JOB
+# ============================================================
+
+
+async def _main(pivots: int, seed: int, dry_run: bool) -> None:
+    ncm = get_neo4j_connection_manager()
+    try:
+        repo = Neo4jGraphRepository(ncm)
+        started = time.perf_counter()
+        players = await repo.get_all_players()
+        edges = await repo.get_all_teammate_edges()
+        ids = [p["id"] for p in players]
+        print(f"Loaded {len(ids)} players / {len(edges)} PLAYED_WITH edges in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        binary, weighted = build_adjacency(ids, edges)
+        degree = np.diff(binary.indptr).astype(np.int64)
+        rank = pagerank(weighted)
+        betweenness = approximate_betweenness(binary, pivots, np.random.default_rng(seed))
+        centrality = combined_centrality(degree, rank, betweenness)
+        print(f"Computed degree, PageRank and betweenness ({pivots} pivots) in {time.perf_counter() - started:.1f}s")
+
+        for i in np.argsort(-centrality)[:10]:
+            print(f"  {players[i]['name']:<30} centrality={centrality[i]:.4f} degree={degree[i]} pagerank={rank[i]:.2e}")
+
+        if dry_run:
+            return
+
+        rows = [
+            {
+                "id": pid,
+                "degree": int(degree[i]),
+                "pagerank": float(rank[i]),
+                "betweenness": float(betweenness[i]),
+                "centrality": float(centrality[i]),
+            }
+            for i, pid in enumerate(ids)
+        ]
+        for start in range(0, len(rows), WRITE_BATCH):
+            await ncm.query_none(WRITE_CENTRALITY, {"rows": rows[start : start + WRITE_BATCH]})
+        # Search order and question difficulty changed: let API workers refresh and revalidate
+        await ncm.query_none(STAMP_GRAPH_VERSION)
+        print(f"✅ Wrote centrality for {len(rows)} players")
+    finally:
+        await ncm.close_all()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute player centrality over the PLAYED_WITH graph.")
+    parser.add_argument("--pivots", type=int, default=BETWEENNESS_PIVOTS, help="Sampled sources for approximate betweenness")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for pivot sampling")
+    parser.add_argument("--dry-run", action="store_true", help="Compute and print the top players without writing")
+    args = parser.parse_args()
+    asyncio.run(_main(args.pivots, args.seed, args.dry_run))
+
+
+# python -m script.compute_centrality
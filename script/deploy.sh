@@ -3,6 +3,11 @@ set -e
 
 APP_DIR="/opt/SportGraph"
 VENV_DIR="/opt/SportGraph/.venv"
+# Space-separated "systemd-unit=ready-url" pairs, restarted one at a time. With several
+# instances behind a load balancer that health-checks /ready, the others keep serving
+# while each one warms up. A single instance cannot roll: it is unready until warm.
+INSTANCES="${INSTANCES:-sportgraph=http://127.0.0.1:8000/ready}"
+READY_TIMEOUT="${READY_TIMEOUT:-180}"
 
 echo ">>> Pulling latest code"
 cd $APP_DIR
@@ -11,9 +16,40 @@ git pull --rebase origin main
 echo ">>> Installing dependencies"
 make venv-install
 
-echo ">>> Restarting service"
-sudo systemctl restart sportgraph
+# Once per deploy, before any worker restarts; workers only verify the schema at boot,
+# so migrations must stay compatible with the code still running on the old instances
+echo ">>> Applying schema migrations"
+make api-migrate
 
-echo ">>> Deployment complete!"
-sudo systemctl status sportgraph --no-pager
+for instance in $INSTANCES; do
+    unit="${instance%%=*}"
+    ready_url="${instance#*=}"
+
+    echo ">>> Restarting $unit"
+    sudo systemctl restart "$unit"
+
+    echo ">>> Waiting for $unit to warm up ($ready_url)"
+    ready=0
+    for ((elapsed = 0; elapsed < READY_TIMEOUT; elapsed += 2)); do
+        if curl -fsS "$ready_url" > /dev/null 2>&1; then
+            echo ">>> $unit ready after ${elapsed}s"
+            ready=1
+            break
+        fi
+        sleep 2
+    done
 
+    if [ "$ready" -ne 1 ]; then
+        # Stop the rollout so the instances not yet restarted keep serving the old version
+        echo ">>> $unit did not become ready within ${READY_TIMEOUT}s, stopping the rollout"
+        curl -sS "$ready_url" || true
+        echo
+        sudo systemctl status "$unit" --no-pager
+        exit 1
+    fi
+done
+
+echo ">>> Deployment complete!"
+for instance in $INSTANCES; do
+    sudo systemctl status "${instance%%=*}" --no-pager
+done
@@ -0,0 +1,111 @@
+import re
+from typing import Callable, Optional
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from browser_pool import BrowserPool
+from rate_controller import HostRateController, ThrottledError, looks_blocked
+
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Sports-Reference sites ship many tables inside <!-- --> and unhide them with JS
+_COMMENT = re.compile(r"<!--(.*?)-->", re.S)
+_TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.S | re.I)
+
+
+def uncomment_tables(html: str) -> str:
+    """Unwrap HTML comments that contain a <table>, so the static HTML has every table."""
+    return _COMMENT.sub(lambda m: m.group(1) if "<table" in m.group(1) else m.group(0), html)
+
+
+class HttpFetcher:
+    """
+    Plain-HTTP page fetcher: one pooled keep-alive requests.Session with
+    gzip, paced by the shared HostRateController.
+    """
+
+    def __init__(self, rate: HostRateController, timeout: float = 20.0, pool_size: int = 8) -> None:
+        self.rate: HostRateController = rate
+        self.timeout: float = timeout
+        self.session: requests.Session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch(self, url: str) -> str:
+        """GET a page and return its HTML with commented-out tables unwrapped; ThrottledError on 429/503/block pages."""
+        self.rate.wait(url)
+        response = self.session.get(url, timeout=self.timeout)
+
+        retry_after = response.headers.get("Retry-After")
+        retry_after = float(retry_after) if retry_after and retry_after.isdigit() else None
+
+        # Bot-check / rate-limit pages arrive as 200s as well as 403s (e.g. Cloudflare "Just a moment...")
+        title = _TITLE.search(response.text)
+        blocked = (title is not None and looks_blocked(title.group(1))) or response.headers.get("cf-mitigated") == "challenge"
+        if not blocked and not response.ok:
+            blocked = looks_blocked(response.text)
+        if blocked:
+            self.rate.throttled(url, retry_after)
+            raise ThrottledError(f"Block page (HTTP {response.status_code}) for {url}")
+
+        # 429/503 back off and raise ThrottledError; other error statuses raise without counting as a success
+        self.rate.record(url, response.status_code, retry_after)
+        response.raise_for_status()
+        return uncomment_tables(response.text)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class PageSource:
+    """
+    Fetches pages over plain HTTP and only falls back to a browser from the
+    pool (started on first need) when the static HTML does not have what the
+    caller needs.
+    """
+
+    def __init__(self, http: HttpFetcher, pool: BrowserPool, browser_load: Callable[[object, str, Optional[str]], str]) -> None:
+        self.http: HttpFetcher = http
+        self.pool: BrowserPool = pool
+        self.browser_load: Callable[[object, str, Optional[str]], str] = browser_load
+        self.http_pages: int = 0
+        self.browser_pages: int = 0
+
+    def soup(self, url: str, ready: Callable[[BeautifulSoup], bool], wait_id: Optional[str] = None) -> BeautifulSoup:
+        """
+        Parsed page for `url`. Uses the HTTP response when `ready(soup)` holds,
+        otherwise renders the page in the browser (waiting for `wait_id`).
+        """
+        soup = BeautifulSoup(self.http.fetch(url), "html.parser")
+        if ready(soup):
+            self.http_pages += 1
+            return soup
+
+        print(f"🧭 Static HTML incomplete, using browser for {url}")
+        self.browser_pages += 1
+        with self.pool.browser() as driver:
+            html = self.browser_load(driver, url, wait_id)
+        return BeautifulSoup(uncomment_tables(html), "html.parser")
+
+    def table(self, url: str, table_id: str):
+        """The <table id=table_id> on a page (browser fallback when it is not in the static HTML)."""
+        table = self.soup(url, lambda soup: soup.find("table", id=table_id) is not None, wait_id=table_id).find("table", id=table_id)
+        if table is None:
+            raise ValueError(f"Table '{table_id}' not found on page: {url}")
+        return table
+
+    def close(self) -> None:
+        self.pool.close()
+        self.http.close()
+        print(f"📊 Pages fetched: {self.http_pages} over HTTP, {self.browser_pages} via browser")
+        print(self.pool.report())
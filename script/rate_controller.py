@@ -0,0 +1,164 @@
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+STATE_FILE = "data/rate_state.json"
+
+# Text that only shows up on throttling / bot-check pages
+BLOCK_PAGE_MARKERS = (
+    "rate limited request",
+    "too many requests",
+    "429 error",
+    "just a moment...",
+    "access denied",
+    "checking your browser",
+)
+
+THROTTLE_STATUSES = {429, 503}
+
+
+class ThrottledError(Exception):
+    """The host answered with a throttle status or a block page."""
+
+
+def looks_blocked(text: Optional[str]) -> bool:
+    """True if a page title / body looks like a throttling or bot-check page."""
+    lowered = (text or "").lower()
+    return any(marker in lowered for marker in BLOCK_PAGE_MARKERS)
+
+
+class _HostState:
+    __slots__ = ("rate", "next_at", "strikes", "successes")
+
+    def __init__(self, rate: float) -> None:
+        self.rate: float = rate  # requests per second
+        self.next_at: float = 0.0  # monotonic time of the next allowed request
+        self.strikes: int = 0  # consecutive throttles
+        self.successes: int = 0  # successes since the last save
+
+
+class HostRateController:
+    """
+    Per-host AIMD pacing for the scrapers.
+
+      • wait(url)       – sleep until the host's next request slot
+      • success(url)    – additive increase of the host's rate
+      • throttled(url)  – halve the rate and back off exponentially
+                          (or for Retry-After seconds, when given)
+
+    Learned rates are persisted to a JSON file so the next run starts at
+    the rate the site last tolerated instead of a fixed sleep.
+    """
+
+    def __init__(
+        self,
+        state_file: str = STATE_FILE,
+        initial_rate: float = 1.0,
+        min_rate: float = 0.05,
+        max_rate: float = 5.0,
+        additive_step: float = 0.02,
+        decrease_factor: float = 0.5,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        save_every: int = 20,
+    ) -> None:
+        self.state_file: str = state_file
+        self.initial_rate: float = initial_rate
+        self.min_rate: float = min_rate
+        self.max_rate: float = max_rate
+        self.additive_step: float = additive_step
+        self.decrease_factor: float = decrease_factor
+        self.base_backoff: float = base_backoff
+        self.max_backoff: float = max_backoff
+        self.save_every: int = save_every
+
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+        self._load()
+        atexit.register(self.save)
+
+    # ----------------------------------------------------------------------
+    def _host(self, url: str) -> _HostState:
+        host = urlparse(url).netloc or url
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.initial_rate)
+        return state
+
+    def wait(self, url: str) -> None:
+        """Block until the next request to this URL's host is allowed, and reserve that slot."""
+        with self._lock:
+            state = self._host(url)
+            now = time.monotonic()
+            start = max(now, state.next_at)
+            # ±10% jitter keeps parallel scrapers from falling into lockstep
+            state.next_at = start + random.uniform(0.9, 1.1) / state.rate
+        if start > now:
+            time.sleep(start - now)
+
+    def success(self, url: str) -> None:
+        """Additive increase: the host handled a request fine."""
+        with self._lock:
+            state = self._host(url)
+            state.rate = min(self.max_rate, state.rate + self.additive_step)
+            state.strikes = 0
+            state.successes += 1
+            save = state.successes >= self.save_every
+            if save:
+                state.successes = 0
+        if save:
+            self.save()
+
+    def throttled(self, url: str, retry_after: Optional[float] = None) -> float:
+        """Multiplicative decrease plus exponential backoff; returns the backoff in seconds."""
+        with self._lock:
+            state = self._host(url)
+            state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+            backoff = retry_after if retry_after is not None else min(self.max_backoff, self.base_backoff * 2**state.strikes)
+            state.strikes += 1
+            state.next_at = max(state.next_at, time.monotonic() + backoff)
+            rate = state.rate
+        print(f"🐢 Throttled by {urlparse(url).netloc}: backing off {backoff:.0f}s, rate now {rate:.2f} req/s")
+        self.save()
+        return backoff
+
+    def record(self, url: str, status: int, retry_after: Optional[float] = None) -> None:
+        """Feed an HTTP status into the controller; raise ThrottledError on 429/503. Only non-error statuses count as success."""
+        if status in THROTTLE_STATUSES:
+            self.throttled(url, retry_after)
+            raise ThrottledError(f"HTTP {status} from {url}")
+        if status < 400:
+            self.success(url)
+
+    def rate(self, url: str) -> float:
+        with self._lock:
+            return self._host(url).rate
+
+    # ----------------------------------------------------------------------
+    def _load(self) -> None:
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable rate state {self.state_file}: {e}")
+            return
+        for host, entry in saved.items():
+            self._hosts[host] = _HostState(min(self.max_rate, max(self.min_rate, float(entry["rate"]))))
+
+    def save(self) -> None:
+        """Persist the learned per-host rates (atomic replace)."""
+        with self._lock:
+            data = {host: {"rate": round(state.rate, 4)} for host, state in self._hosts.items()}
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        tmp = self.state_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.state_file)
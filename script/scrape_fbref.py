@@ -1,6 +1,7 @@
 import os
 import csv
 import time
+from typing import Optional
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from selenium.common.exceptions import TimeoutException
@@ -11,10 +12,17 @@ from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
+from browser_pool import BrowserPool
+from http_fetcher import HttpFetcher, PageSource
+from rate_controller import HostRateController, ThrottledError, looks_blocked
+
 
 PROGRESS_FILE = "data/completed_players.txt"
 OUTPUT_FILE = "data/player_club_history.csv"
 
+# Per-host AIMD pacing, learned rates persisted between runs
+RATE = HostRateController()
+
 
 # Make a new class from uc_orig.Chrome and redefine __del__ function to suppress exception
 class Chrome(uc.Chrome):
@@ -56,9 +64,31 @@ def wait_for_id(driver: WebDriver, element_id: str, timeout: int = 5) -> WebElem
         element = WebDriverWait(driver, timeout).until(expected_conditions.presence_of_element_located((By.ID, element_id)))
         return element
     except TimeoutException:
+        # A missing table is often a rate-limit page with an ordinary title
+        if looks_blocked(driver.page_source):
+            RATE.throttled(driver.current_url)
+            raise ThrottledError(f"Block page for {driver.current_url}")
         raise
 
 
+def load_page(driver: WebDriver, url: str) -> None:
+    """Open a URL at the host's learned pace; raise ThrottledError on a block page."""
+    RATE.wait(url)
+    driver.get(url)
+    if looks_blocked(driver.title):
+        RATE.throttled(url)
+        raise ThrottledError(f"Block page for {url}")
+    RATE.success(url)
+
+
+def browser_page(driver: WebDriver, url: str, wait_id: Optional[str] = None) -> str:
+    """Render a page in the browser (fallback for pages that need JavaScript) and return its HTML."""
+    load_page(driver, url)
+    if wait_id:
+        wait_for_id(driver, wait_id)
+    return driver.page_source
+
+
 def format_duration(seconds: float) -> str:
     seconds = int(seconds)
     h, rem = divmod(seconds, 3600)
@@ -107,21 +137,15 @@ def generate_big5_season_league_urls(start_year: int, end_year: int) -> list[str
     return urls
 
 
-def get_season_club_links(driver: WebDriver, url: str) -> tuple[str, list[str]]:
-    """Fetch all Premier League club 'Stats' page links from the given season page using Selenium."""
+def get_season_club_links(source: PageSource, url: str) -> tuple[str, list[str]]:
+    """Fetch all Premier League club 'Stats' page links from the given season page."""
     print(f"🌐 Fetching season clubs links from {url}")
 
-    driver.get(url)
-
     # Example: https://fbref.com/en/comps/9/2024-2025/2024-2025-Premier-League-Stats
     url_parts = url.split("/")
     competition_id, season = url_parts[-3], url_parts[-2]
 
-    table_id = f"results{season}{competition_id}1_overall"
-    table_el = wait_for_id(driver, table_id)
-
-    soup = BeautifulSoup(table_el.get_attribute("outerHTML"), "html.parser")
-    table = soup.find("table")
+    table = source.table(url, f"results{season}{competition_id}1_overall")
 
     clubs = []
     for a in table.select("a[href^='/en/squads/']"):
@@ -148,17 +172,11 @@ def normalize_player_url(url: str) -> str:
     return url
 
 
-def get_player_links_from_season_club_link(driver: WebDriver, season_club_url: str, competition_id: str) -> list[str]:
+def get_player_links_from_season_club_link(source: PageSource, season_club_url: str, competition_id: str) -> list[str]:
     """Fetch all player profile links from a given club's page."""
     print(f"⚽ Fetching players from season club page: {season_club_url}")
 
-    driver.get(season_club_url)
-
-    table_id = f"stats_standard_{competition_id}"
-    table_el = wait_for_id(driver, table_id)
-
-    soup = BeautifulSoup(table_el.get_attribute("outerHTML"), "html.parser")
-    table = soup.find("table")
+    table = source.table(season_club_url, f"stats_standard_{competition_id}")
 
     players = []
     for a in table.select("a[href^='/en/players/']"):
@@ -168,21 +186,15 @@ def get_player_links_from_season_club_link(driver: WebDriver, season_club_url: s
     return players
 
 
-def store_player_club_history(driver: WebDriver, url: str, csv_writer) -> None:
-    """Fetch a player's club history page HTML using the shared Selenium driver."""
+def store_player_club_history(source: PageSource, url: str, csv_writer) -> None:
+    """Fetch a player's club history table (plain HTTP, browser only as a fallback)."""
     print(f"🌐 Fetching page for {url}")
 
-    driver.get(url)
-
     # Example: https://fbref.com/en/players/d70ce98e/Lionel-Messi -> d70ce98e
     url_parts = url.split("/")
     player_id, player_name = url_parts[-2], url_parts[-1]
 
-    table_id = f"stats_player_summary_{player_id}"
-    table_el = wait_for_id(driver, table_id)
-
-    soup = BeautifulSoup(table_el.get_attribute("outerHTML"), "html.parser")
-    table = soup.find("table")
+    table = source.table(url, f"stats_player_summary_{player_id}")
 
     records = []
     for row in table.select("tbody tr"):
@@ -229,7 +241,8 @@ def store_player_club_history(driver: WebDriver, url: str, csv_writer) -> None:
 if __name__ == "__main__":
     start_ts = time.time()
 
-    driver = get_driver()
+    # Static pages over keep-alive HTTP; Chrome is only started if a page needs JavaScript
+    source = PageSource(HttpFetcher(RATE), BrowserPool(get_driver), browser_page)
 
     player_links = set()
 
@@ -243,21 +256,23 @@ if __name__ == "__main__":
             try:
                 print(f"🌍 Processing season {season_league_url} (Attempt {attempt+1}/{MAX_RETRIES})")
 
-                competition_id, season_club_links = get_season_club_links(driver, season_league_url)
+                competition_id, season_club_links = get_season_club_links(source, season_league_url)
                 print(f"✅ Found {len(season_club_links)} clubs for {season_league_url}")
 
                 for link in season_club_links:
-                    player_links.update(get_player_links_from_season_club_link(driver, link, competition_id))
+                    player_links.update(get_player_links_from_season_club_link(source, link, competition_id))
 
                 # ✅ If successful, break out of retry loop
                 break
 
+            except ThrottledError as e:
+                # The browser is fine; the controller's backoff applies before the next attempt
+                print(f"🐢 {e} (attempt {attempt+1}/{MAX_RETRIES})")
+
             except Exception as e:
                 print(f"⚠️ Error while processing {season_league_url}: {e}")
-                print(f"🔁 Restarting driver (attempt {attempt+1}/{MAX_RETRIES})...")
-
-                driver.quit()
-                driver = get_driver()
+                # A browser that failed mid-page was already swapped for a warm standby
+                print(f"🔁 Retrying (attempt {attempt+1}/{MAX_RETRIES})...")
 
                 if attempt == MAX_RETRIES - 1:
                     print(f"❌ Failed {season_league_url} after {MAX_RETRIES} retries — skipping.")
@@ -279,25 +294,31 @@ if __name__ == "__main__":
 
         # ["https://fbref.com/en/players/d70ce98e/Lionel-Messi"]
         for idx, link in enumerate(player_links, start=1):
-            try:
-                store_player_club_history(driver, link, writer)
-                save_completed_player(link)
-
-                # ✅ Force flush to disk after every write
-                f.flush()
-                os.fsync(f.fileno())
-
-                print(f"[{idx}/{total}] 📝 Stored club history for: {link}")
-            except TimeoutException:
-                print(f"[{idx}/{total}] ⏰ Timeout — element not found for {link}. Skipping.")
-                continue
-            except:
-                print(f"⚠️ Restarting driver.")
-                driver.quit()
-                driver = get_driver()
-                continue
-
-    driver.quit()
+            for attempt in range(MAX_RETRIES):
+                try:
+                    store_player_club_history(source, link, writer)
+                    save_completed_player(link)
+
+                    # ✅ Force flush to disk after every write
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                    print(f"[{idx}/{total}] 📝 Stored club history for: {link}")
+                    break
+                except ThrottledError:
+                    print(f"[{idx}/{total}] 🐢 Throttled on {link}, retrying after backoff ({attempt+1}/{MAX_RETRIES})")
+                    continue
+                except TimeoutException:
+                    print(f"[{idx}/{total}] ⏰ Timeout — element not found for {link}. Skipping.")
+                    break
+                except ValueError as e:
+                    print(f"[{idx}/{total}] {e}. Skipping.")
+                    break
+                except Exception as e:
+                    print(f"[{idx}/{total}] ⚠️ Failed on {link}: {e}. Skipping.")
+                    break
+
+    source.close()
     print("✅ All done.")
 
     elapsed = time.time() - start_ts
@@ -1,7 +1,7 @@
 import os
 import csv
-import random
 import time
+from typing import Optional
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from selenium.common.exceptions import TimeoutException
@@ -12,10 +12,17 @@ from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
+from browser_pool import BrowserPool
+from http_fetcher import HttpFetcher, PageSource
+from rate_controller import HostRateController, ThrottledError, looks_blocked
+
 
 PROGRESS_FILE = "data/nfl_completed_players.txt"
 OUTPUT_FILE = "data/nfl_player_club_history.csv"
 
+# Per-host AIMD pacing (replaces fixed sleeps), learned rates persisted between runs
+RATE = HostRateController()
+
 
 NFL_TEAMS = [
     "crd",  # Arizona Cardinals
@@ -98,6 +105,24 @@ def wait_for_id(driver: WebDriver, element_id: str, timeout: int = 5) -> WebElem
         raise
 
 
+def load_page(driver: WebDriver, url: str) -> None:
+    """Open a URL at the host's learned pace; raise ThrottledError on a block page."""
+    RATE.wait(url)
+    driver.get(url)
+    if looks_blocked(driver.title):
+        RATE.throttled(url)
+        raise ThrottledError(f"Block page for {url}")
+    RATE.success(url)
+
+
+def browser_page(driver: WebDriver, url: str, wait_id: Optional[str] = None) -> str:
+    """Render a page in the browser (fallback for pages that need JavaScript) and return its HTML."""
+    load_page(driver, url)
+    if wait_id:
+        wait_for_id(driver, wait_id)
+    return driver.page_source
+
+
 def format_duration(seconds: float) -> str:
     seconds = int(seconds)
     h, rem = divmod(seconds, 3600)
@@ -168,13 +193,11 @@ def get_season_club_links(season_league_url: str) -> list[str]:
 #     return url
 
 
-def get_player_links_from_season_club_link(driver: WebDriver, roster_url: str) -> list[str]:
+def get_player_links_from_season_club_link(source: PageSource, roster_url: str) -> list[str]:
     print(f"Fetching players from roster page: {roster_url}")
-    driver.get(roster_url)
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-
-    # Every NFL team roster page has this table.
+    # Every NFL team roster page has this table (inside an HTML comment in the static page).
+    soup = source.soup(roster_url, lambda s: s.find("table", id="roster") is not None, wait_id="roster")
     table = soup.find("table", id="roster")
 
     players = set()
@@ -187,11 +210,9 @@ def get_player_links_from_season_club_link(driver: WebDriver, roster_url: str) -
     return sorted(players)
 
 
-def store_player_club_history(driver: WebDriver, url: str, csv_writer) -> None:
+def store_player_club_history(source: PageSource, url: str, csv_writer) -> None:
     print(f"Fetching NFL player page: {url}")
-    driver.get(url)
-
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = source.soup(url, lambda s: s.select_one("div#meta h1 span") is not None, wait_id="meta")
 
     filename = url.split("/")[-1]
     player_id = filename.replace(".htm", "")
@@ -260,7 +281,8 @@ def store_player_club_history(driver: WebDriver, url: str, csv_writer) -> None:
 if __name__ == "__main__":
     start_ts = time.time()
 
-    driver = get_driver()
+    # Static pages over keep-alive HTTP; Chrome is only started if a page needs JavaScript
+    source = PageSource(HttpFetcher(RATE), BrowserPool(get_driver), browser_page)
 
     player_links = set()
 
@@ -278,18 +300,19 @@ if __name__ == "__main__":
                 print(f"✅ Found {len(season_club_links)} clubs for {season_league_url}")
 
                 for link in season_club_links:
-                    time.sleep(random.uniform(0.5, 1))
-                    player_links.update(get_player_links_from_season_club_link(driver, link))
+                    player_links.update(get_player_links_from_season_club_link(source, link))
 
                 # ✅ If successful, break out of retry loop
                 break
 
+            except ThrottledError as e:
+                # The browser is fine; the controller's backoff applies before the next attempt
+                print(f"🐢 {e} (attempt {attempt+1}/{MAX_RETRIES})")
+
             except Exception as e:
                 print(f"⚠️ Error while processing {season_league_url}: {e}")
-                print(f"🔁 Restarting driver (attempt {attempt+1}/{MAX_RETRIES})...")
-
-                driver.quit()
-                driver = get_driver()
+                # A browser that failed mid-page was already swapped for a warm standby
+                print(f"🔁 Retrying (attempt {attempt+1}/{MAX_RETRIES})...")
 
                 if attempt == MAX_RETRIES - 1:
                     print(f"❌ Failed {season_league_url} after {MAX_RETRIES} retries — skipping.")
@@ -313,28 +336,31 @@ if __name__ == "__main__":
         # total = 1
 
         for idx, link in enumerate(player_links, start=1):
-            try:
-                time.sleep(random.uniform(0.5, 1))
-                store_player_club_history(driver, link, writer)
-                save_completed_player(link)
-
-                # ✅ Force flush to disk after every write
-                f.flush()
-                os.fsync(f.fileno())
-
-                print(f"[{idx}/{total}] 📝 Stored club history for: {link}")
-            except TimeoutException:
-                print(f"[{idx}/{total}] ⏰ Timeout — element not found for {link}. Skipping.")
-                continue
-            except ValueError as e:
-                print(e)
-            except:
-                print(f"⚠️ Restarting driver.")
-                driver.quit()
-                driver = get_driver()
-                continue
-
-    driver.quit()
+            for attempt in range(MAX_RETRIES):
+                try:
+                    store_player_club_history(source, link, writer)
+                    save_completed_player(link)
+
+                    # ✅ Force flush to disk after every write
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                    print(f"[{idx}/{total}] 📝 Stored club history for: {link}")
+                    break
+                except ThrottledError:
+                    print(f"[{idx}/{total}] 🐢 Throttled on {link}, retrying after backoff ({attempt+1}/{MAX_RETRIES})")
+                    continue
+                except TimeoutException:
+                    print(f"[{idx}/{total}] ⏰ Timeout — element not found for {link}. Skipping.")
+                    break
+                except ValueError as e:
+                    print(e)
+                    break
+                except Exception as e:
+                    print(f"[{idx}/{total}] ⚠️ Failed on {link}: {e}. Skipping.")
+                    break
+
+    source.close()
     print("✅ All done.")
 
     elapsed = time.time() - start_ts
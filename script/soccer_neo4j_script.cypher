@@ -6,6 +6,8 @@ DETACH DELETE n;
 
 // -----------------------------
 // 2. Create Constraints
+// (indexes and later schema versions are applied by
+//  `make api-migrate`, see api/src/database/neo4j_schema_manager.py)
 // -----------------------------
 CREATE CONSTRAINT player_id_unique IF NOT EXISTS
 FOR (p:Player)
@@ -44,7 +46,9 @@ WITH
   toInteger(row.appearances) AS apps
 
 MERGE (p:Player {id: row.player_id})
-SET p.name = row.player_name
+SET
+  p.name = row.player_name,
+  p.search_name = toLower(row.player_name)
 
 MERGE (c:Club {name: row.club})
 
@@ -89,4 +93,12 @@ SET
   pw.start = overlap_start,
   pw.end = overlap_end,
   pw.seasons_overlap = overlap_end - overlap_start + 1,
-  pw.weight = weight;
\ No newline at end of file
+  pw.weight = weight;
+
+// -----------------------------
+// 6. Materialize Aggregates and Stamp Graph Version
+// Not part of this script: run `make api-refresh-aggregates`
+// after the load. It recomputes the player/club aggregates
+// the API reads and stamps a new graph version, which API
+// workers poll to refresh their snapshot and ETags.
+// -----------------------------
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
+from api.src.engine.graph_snapshot import GraphSnapshotStore
+
+
+# ============================================================
+# 🧩 FAKE DRIVER SESSION
+# ============================================================
+
+
+class FakeRecord:
+    def __init__(self, data: dict) -> None:
+        self._data = data
+
+    def data(self) -> dict:
+        return self._data
+
+
+class FakeResult:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def __aiter__(self):
+        return self._records()
+
+    async def _records(self):
+        for row in self.rows:
+            yield FakeRecord(row)
+
+    async def consume(self):
+        return None
+
+
+class FakeBackend:
+    """Records every Query sent and holds each run until `release` is set."""
+
+    def __init__(self) -> None:
+        self.queries = []
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    def session(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, backend: FakeBackend) -> None:
+        self.backend = backend
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run(self, query, params):
+        self.backend.queries.append(query)
+        try:
+            await self.backend.release.wait()
+        except asyncio.CancelledError:
+            self.backend.cancelled += 1
+            raise
+        return FakeResult([{"n": 1}])
+
+
+@pytest.fixture
+async def ncm():
+    manager = Neo4jConnectionManager("bolt://127.0.0.1:1", "neo4j", "unused")
+    yield manager
+    await manager.close_all()
+
+
+@pytest.fixture
+def backend(ncm):
+    fake = FakeBackend()
+    ncm.get_session = fake.session
+    return fake
+
+
+# ============================================================
+# 🕸️ GRAPH SNAPSHOTS
+# ============================================================
+
+
+class FakeGraphRepository:
+    """Serves the rows a GraphSnapshot is built from."""
+
+    def __init__(self, players: list, edges: list, stints: list = ()) -> None:
+        self.players = players
+        self.edges = edges
+        self.stints = list(stints)
+
+    async def get_graph_version(self):
+        return "test"
+
+    async def get_all_players(self):
+        return self.players
+
+    async def get_all_teammate_edges(self):
+        return self.edges
+
+    async def get_all_stints(self):
+        return self.stints
+
+
+@pytest.fixture
+def graph_repository():
+    """Factory for a FakeGraphRepository over the given rows."""
+    return FakeGraphRepository
+
+
+@pytest.fixture
+def graph_store():
+    store = GraphSnapshotStore(max_workers=1)
+    yield store
+    store.close()
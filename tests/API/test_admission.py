@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from api.src import admission
+from api.src.admission import AdmissionController, EndpointClassLimiter, TokenBucket
+from api.src.dependencies import client_key, get_trusted_proxies
+
+
+# ============================================================
+# 🪣 TOKEN BUCKET
+# ============================================================
+
+
+def test_token_bucket_spends_the_burst_then_refills(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now)
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    assert bucket.take("a") == bucket.take("a") == 0
+    assert bucket.take("a") == pytest.approx(0.5)
+    # Other clients have their own bucket
+    assert bucket.take("b") == 0
+
+    now += 0.5
+    assert bucket.take("a") == 0
+
+
+def test_token_bucket_evicts_the_oldest_clients():
+    bucket = TokenBucket(rate=1.0, burst=1, max_clients=2)
+    for client in ("a", "b", "c"):
+        bucket.take(client)
+    assert list(bucket._buckets) == ["b", "c"]
+
+
+# ============================================================
+# 🚦 ENDPOINT CLASS LIMITER
+# ============================================================
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_limiter_queues_then_sheds_with_503():
+    limiter = EndpointClassLimiter("expensive", max_concurrency=1, max_queue=1, max_wait=5.0)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.admit("a"):
+            await release.wait()
+
+    running = asyncio.ensure_future(hold())
+    await settle()
+    queued = asyncio.ensure_future(hold())
+    await settle()
+    try:
+        assert limiter.stats()["active"] == 1 and limiter.stats()["queue_depth"] == 1
+
+        with pytest.raises(HTTPException) as shed:
+            async with limiter.admit("b"):
+                pass
+        assert shed.value.status_code == 503 and shed.value.headers["Retry-After"] == "5"
+    finally:
+        release.set()
+        await asyncio.gather(running, queued)
+
+    assert limiter.stats() == {"max_concurrency": 1, "active": 0, "queue_depth": 0, "admitted": 2, "shed": 1, "rate_limited": 0}
+
+
+async def test_limiter_sheds_waiters_past_max_wait():
+    limiter = EndpointClassLimiter("search", max_concurrency=1, max_queue=8, max_wait=0.01)
+    async with limiter.admit("a"):
+        with pytest.raises(HTTPException) as shed:
+            async with limiter.admit("b"):
+                pass
+    assert shed.value.status_code == 503
+    assert limiter.waiting == 0 and limiter.shed == 1
+
+
+async def test_limiter_rate_limits_each_client_with_429():
+    limiter = EndpointClassLimiter("export", max_concurrency=4, max_queue=4, max_wait=1.0, rate=0.1, burst=1)
+    async with limiter.admit("a"):
+        pass
+
+    with pytest.raises(HTTPException) as limited:
+        async with limiter.admit("a"):
+            pass
+    assert limited.value.status_code == 429 and limited.value.headers["Retry-After"] == "10"
+    async with limiter.admit("b"):
+        pass
+    assert limiter.rate_limited == 1
+
+
+def test_controller_builds_one_limiter_per_class():
+    controller = AdmissionController({"cheap": {"max_concurrency": 2, "max_queue": 2, "max_wait": 1.0}})
+    assert set(controller.stats()) == {"cheap"}
+    with pytest.raises(KeyError):
+        controller.admit("unknown", "a")
+
+
+# ============================================================
+# 🪪 CLIENT KEY
+# ============================================================
+
+
+def request_from(peer: str, forwarded: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (peer, 1234)})
+
+
+@pytest.fixture
+def trusted_proxies(monkeypatch):
+    monkeypatch.setenv("TRUSTED_PROXIES", "10.0.0.1, 10.0.0.2")
+    get_trusted_proxies.cache_clear()
+    yield
+    get_trusted_proxies.cache_clear()
+
+
+@pytest.mark.parametrize(
+    ("peer", "forwarded", "expected"),
+    [
+        ("203.0.113.9", None, "203.0.113.9"),
+        # Untrusted peers cannot pick their own key
+        ("203.0.113.9", "198.51.100.1", "203.0.113.9"),
+        ("10.0.0.1", "198.51.100.1", "198.51.100.1"),
+        # A spoofed leftmost hop is skipped in favour of the nearest untrusted one
+        ("10.0.0.1", "1.1.1.1, 198.51.100.1, 10.0.0.2", "198.51.100.1"),
+        ("10.0.0.1", "10.0.0.2", "10.0.0.2"),
+    ],
+)
+def test_client_key_only_trusts_forwarded_for_from_proxies(trusted_proxies, peer, forwarded, expected):
+    assert client_key(request_from(peer, forwarded)) == expected
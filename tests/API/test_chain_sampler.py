@@ -0,0 +1,96 @@
+import random
+from collections import Counter
+
+import pytest
+
+from api.src.engine.chain_sampler import MAX_SAMPLE_ATTEMPTS, AliasTable, TeammateChainSampler
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+def players(*ids: str, centrality: dict = None) -> list:
+    return [{"id": pid, "name": pid.upper(), "appearances": 1, "centrality": (centrality or {}).get(pid)} for pid in ids]
+
+
+def edge(a: str, b: str, club: str, weight: int = 1) -> dict:
+    return {"a": a, "b": b, "club": club, "start": 2000, "end": 2001, "seasons_overlap": 1, "weight": weight}
+
+
+# ============================================================
+# 🎲 ALIAS TABLE
+# ============================================================
+
+
+def test_alias_table_draws_in_proportion_to_weight():
+    table, rng = AliasTable([1, 0, 3]), random.Random(7)
+    counts = Counter(table.draw(rng) for _ in range(20_000))
+
+    assert counts[1] == 0
+    assert counts[2] / counts[0] == pytest.approx(3, rel=0.1)
+
+
+def test_alias_table_without_weight_draws_uniformly():
+    table, rng = AliasTable([0, 0]), random.Random(7)
+    counts = Counter(table.draw(rng) for _ in range(10_000))
+    assert counts[0] / counts[1] == pytest.approx(1, rel=0.1)
+
+
+# ============================================================
+# 🔗 CHAIN SAMPLING
+# ============================================================
+
+
+def test_chains_respect_the_walk_rules():
+    # a - b - c - d line with a shortcut a - c, and a second X club edge d - e
+    graph = TeammateGraph(
+        players("a", "b", "c", "d", "e"),
+        [edge("a", "b", "X"), edge("b", "c", "Y"), edge("a", "c", "Z"), edge("c", "d", "X"), edge("d", "e", "X")],
+    )
+    chains = TeammateChainSampler(graph).sample(2, limit=50, rng=random.Random(1))
+
+    assert chains
+    for chain in chains:
+        nodes = [p["id"] for p in chain["players"]]
+        assert len(nodes) == 3 == len(set(nodes))
+        assert nodes[0] < nodes[-1]
+        assert chain["clubs"][0] != chain["clubs"][1]
+        assert not graph.are_teammates(graph.index[nodes[0]], graph.index[nodes[2]])
+        assert chain["totalWeight"] == 2
+    assert len({tuple(p["id"] for p in chain["players"]) for chain in chains}) == len(chains)
+
+
+def test_impossible_chains_stop_after_the_bounded_attempts():
+    # Every two-hop walk on a triangle hits a shortcut edge
+    graph = TeammateGraph(players("a", "b", "c"), [edge("a", "b", "X"), edge("b", "c", "Y"), edge("a", "c", "Z")])
+    sampler = TeammateChainSampler(graph)
+    walks = 0
+    walk = sampler._walk
+
+    def counted_walk(steps, rng):
+        nonlocal walks
+        walks += 1
+        return walk(steps, rng)
+
+    sampler._walk = counted_walk
+    assert sampler.sample(2, limit=1, max_attempts=50, rng=random.Random(1)) == []
+    assert walks == 50
+
+    walks = 0
+    assert sampler.sample(2, limit=1, max_attempts=10 * MAX_SAMPLE_ATTEMPTS, rng=random.Random(1)) == []
+    assert walks == MAX_SAMPLE_ATTEMPTS
+
+
+def test_difficulty_band_keeps_chains_through_obscure_players():
+    centrality = {"a": 1.0, "b": 0.9, "c": 1.0, "d": 0.1, "e": 1.0}
+    graph = TeammateGraph(
+        players("a", "b", "c", "d", "e", centrality=centrality),
+        [edge("a", "b", "X"), edge("b", "c", "Y"), edge("c", "d", "X"), edge("d", "e", "Y")],
+    )
+    chains = TeammateChainSampler(graph).sample(2, limit=10, rng=random.Random(3), difficulty=(0.5, 1.0))
+
+    assert [[p["id"] for p in chain["players"]] for chain in chains] == [["c", "d", "e"]]
+
+
+def test_degenerate_requests_return_nothing():
+    sampler = TeammateChainSampler(TeammateGraph([], []))
+    assert sampler.sample(2, limit=5) == []
+    assert TeammateChainSampler(TeammateGraph(players("a"), [])).sample(0, limit=5) == []
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from api.src.engine.club_rosters import ClubRosterIndex, IntervalTree
+
+
+def stint(player: str, club: str, start, end, apps: int = 10) -> dict:
+    return {"player_id": player, "name": player.upper(), "club": club, "start": start, "end": end, "apps": apps}
+
+
+# ============================================================
+# 🌲 INTERVAL TREE
+# ============================================================
+
+
+def test_interval_tree_matches_a_linear_scan():
+    rng = random.Random(5)
+    intervals = []
+    for payload in range(300):
+        start = rng.randint(1950, 2024)
+        intervals.append((start, start + rng.randint(0, 8), payload))
+    tree = IntervalTree(intervals)
+
+    for _ in range(200):
+        lo = rng.randint(1945, 2030)
+        hi = lo + rng.randint(0, 10)
+        expected = {payload for start, end, payload in intervals if start <= hi and end >= lo}
+        assert sorted(tree.overlapping(lo, hi)) == sorted(expected)
+
+
+@pytest.mark.parametrize(
+    ("lo", "hi", "expected"),
+    [(2005, 2005, {0}), (2010, 2010, {0, 1}), (2011, 2014, {1}), (2016, 2030, set()), (1990, 1999, set())],
+)
+def test_interval_tree_overlap_is_closed_on_both_ends(lo, hi, expected):
+    tree = IntervalTree([(2000, 2010, 0), (2010, 2015, 1)])
+    assert set(tree.overlapping(lo, hi)) == expected
+
+
+# ============================================================
+# 🏟️ CLUB ROSTERS
+# ============================================================
+
+
+def test_roster_aggregates_overlapping_stints_per_player():
+    index = ClubRosterIndex(
+        [
+            stint("a", "X", 2000, 2003, apps=30),
+            stint("a", "X", 2008, 2009, apps=5),
+            stint("b", "X", 2004, 2006),
+            stint("c", "Y", 2000, 2001),
+        ]
+    )
+
+    rows = {row["id"]: row for row in index.players("X")}
+    assert set(rows) == {"a", "b"}
+    assert rows["a"] == {"id": "a", "name": "A", "appearances": 35, "first_season": 2000, "last_season": 2009}
+
+    assert [row["id"] for row in index.players("X", season_from=2005, season_to=2007)] == ["b"]
+    assert [row["id"] for row in index.players("X", season_from=2009)] == ["a"]
+    assert index.players("X", season_from=2007, season_to=2005) == []
+
+
+def test_missing_seasons_fall_back_to_the_known_end():
+    index = ClubRosterIndex([stint("a", "X", None, 2005), stint("b", "X", 2003, None), stint("c", "X", None, None)])
+
+    assert index.has_club("X")
+    assert [row["id"] for row in index.players("X", season_from=2004)] == ["a"]
+    assert len(index.stints) == 2
+
+
+def test_unknown_club_has_no_roster():
+    index = ClubRosterIndex([stint("a", "X", 2000, 2001)])
+    assert not index.has_club("Y")
+    assert index.players("Y") == []
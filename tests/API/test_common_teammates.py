@@ -0,0 +1,74 @@
+import pytest
+from fastapi import HTTPException
+
+from api.src.engine.teammate_graph import TeammateGraph
+from api.src.service.soccer_service import MAX_COMMON_TEAMMATE_PLAYERS, SoccerService
+
+
+def players(*ids: str) -> list:
+    return [{"id": pid, "name": pid.upper(), "appearances": 1, "centrality": None} for pid in ids]
+
+
+def edge(a: str, b: str, club: str = "X", weight: int = 1) -> dict:
+    return {"a": a, "b": b, "club": club, "start": 2000, "end": 2001, "seasons_overlap": 1, "weight": weight}
+
+
+# t1 and t2 played with both x and y (t1 twice with x), z only with x; x and y were teammates too
+PLAYERS = players("x", "y", "t1", "t2", "z")
+EDGES = [
+    edge("x", "y"),
+    edge("x", "t1", "A", 3),
+    edge("x", "t1", "B", 5),
+    edge("y", "t1", "C", 2),
+    edge("x", "t2", "D", 1),
+    edge("y", "t2", "E", 1),
+    edge("x", "z"),
+]
+
+
+def test_common_teammates_are_ranked_by_combined_weight():
+    graph = TeammateGraph(PLAYERS, EDGES)
+    total, ranked = graph.common_teammates([graph.index["x"], graph.index["y"]], limit=10)
+
+    assert total == 2
+    assert [(graph.ids[t], weight) for t, weight, _ in ranked] == [("t1", 7), ("t2", 2)]
+    # The heaviest of the two x - t1 edges is reported
+    assert [graph.edge_club[e] for e in ranked[0][2]] == ["B", "C"]
+
+
+def test_common_teammates_limit_and_empty_intersection():
+    graph = TeammateGraph(PLAYERS, EDGES)
+    total, ranked = graph.common_teammates([graph.index["x"], graph.index["y"]], limit=1)
+    assert total == 2 and [graph.ids[t] for t, _, _ in ranked] == ["t1"]
+
+    total, ranked = graph.common_teammates([graph.index["z"], graph.index["t1"], graph.index["t2"]], limit=10)
+    assert total == 1 and [graph.ids[t] for t, _, _ in ranked] == ["x"]
+    # The queried players themselves never count
+    assert graph.common_teammates([graph.index["z"], graph.index["x"]], limit=10) == (0, [])
+
+
+async def test_service_describes_each_shared_tie(graph_repository, graph_store):
+    result = await SoccerService(graph_repository(PLAYERS, EDGES), graph_store).get_common_teammates(["x", "y", "x"])
+
+    assert result["players"] == [{"id": "x", "name": "X"}, {"id": "y", "name": "Y"}]
+    assert result["total"] == 2
+    assert result["common"][0] == {
+        "id": "t1",
+        "name": "T1",
+        "combined_weight": 7,
+        "overlaps": [
+            {"with": "x", "club": "B", "start": 2000, "end": 2001, "weight": 5},
+            {"with": "y", "club": "C", "start": 2000, "end": 2001, "weight": 2},
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    ("player_ids", "status_code"),
+    [(["x"], 400), (["x", "x"], 400), ([f"p{i}" for i in range(MAX_COMMON_TEAMMATE_PLAYERS + 1)], 400), (["x", "nobody"], 404)],
+)
+async def test_service_rejects_bad_player_lists(graph_repository, graph_store, player_ids, status_code):
+    with pytest.raises(HTTPException) as rejected:
+        await SoccerService(graph_repository(PLAYERS, EDGES), graph_store).get_common_teammates(player_ids)
+    assert rejected.value.status_code == status_code
+
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+from fastapi import HTTPException
+
+from api.src.engine.components import ComponentIndex
+from api.src.engine.teammate_graph import TeammateGraph
+from api.src.service.soccer_service import SoccerService
+
+
+def rows_of(ids: str, pairs: list) -> tuple:
+    players = [{"id": pid, "name": pid.upper(), "appearances": 1, "centrality": None} for pid in ids]
+    edges = [{"a": a, "b": b, "club": "X", "start": 2000, "end": 2001, "seasons_overlap": 1, "weight": 1} for a, b in pairs]
+    return players, edges
+
+
+def graph_of(ids: str, pairs: list) -> TeammateGraph:
+    return TeammateGraph(*rows_of(ids, pairs))
+
+
+# a - b - c - d - e, f - g, and h on its own
+ROWS = rows_of("abcdefgh", [("a", "b"), ("b", "c"), ("c", "d"), ("d", "e"), ("f", "g")])
+GRAPH = TeammateGraph(*ROWS)
+
+
+def node(pid: str) -> int:
+    return GRAPH.index[pid]
+
+
+def test_components_are_numbered_largest_first():
+    components = ComponentIndex(GRAPH)
+
+    assert components.sizes == [5, 2, 1]
+    assert [components.component[node(pid)] for pid in "abcdefgh"] == [0, 0, 0, 0, 0, 1, 1, 2]
+    assert components.connected(node("a"), node("e"))
+    assert not components.connected(node("a"), node("f"))
+    assert not components.connected(node("g"), node("h"))
+
+
+def test_sweeps_find_the_exact_eccentricity_of_a_path():
+    components = ComponentIndex(GRAPH)
+    assert [components.eccentricity[node(pid)] for pid in "abcdefgh"] == [4, 3, 2, 3, 4, 1, 1, 0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_eccentricity_is_a_lower_bound(seed):
+    rng = random.Random(seed)
+    ids = [chr(ord("a") + i) for i in range(20)]
+    graph = graph_of(ids, [tuple(rng.sample(ids, 2)) for _ in range(24)])
+    components = ComponentIndex(graph, sweeps=2)
+
+    for i in range(graph.node_count):
+        exact = max(components._distances(i).values())
+        assert 0 <= components.eccentricity[i] <= exact
+
+
+def test_stats_describe_the_largest_component():
+    assert ComponentIndex(GRAPH).stats() == {
+        "players": 8,
+        "components": 3,
+        "isolated_players": 1,
+        "largest_sizes": [5, 2, 1],
+        "largest_share": 5 / 8,
+        "largest_component": {"diameter_estimate": 4, "radius_estimate": 2, "median_eccentricity": 3},
+    }
+
+
+def test_empty_graph_has_no_components():
+    stats = ComponentIndex(graph_of("", [])).stats()
+    assert stats["components"] == 0 and stats["largest_share"] == 0.0
+
+
+@pytest.mark.parametrize("mode", ["single", "all", "k"])
+async def test_disconnected_players_get_404_without_a_search(graph_repository, graph_store, mode):
+    class Repository(graph_repository):
+        async def get_shortest_teammate_path(self, player_a, player_b):
+            raise AssertionError("no query should run for players in different components")
+
+    service = SoccerService(Repository(*ROWS), graph_store)
+    with pytest.raises(HTTPException) as missing:
+        await service.get_shortest_teammate_path_by_id("a", "f", mode=mode)
+    assert missing.value.status_code == 404 and missing.value.detail == "No path from 'a' to f"
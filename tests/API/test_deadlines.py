@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from api.src.database.neo4j_connection_manager import COALESCE_DEADLINE_SLACK
+from api.src.router import deadlines
+from api.src.router.deadlines import CLIENT_CLOSED_REQUEST, DeadlineRoute, parse_endpoint_deadlines
+
+
+# ============================================================
+# 🧩 ASGI HELPERS
+# ============================================================
+
+
+def make_app(monkeypatch, path: str, seconds: float, endpoint) -> FastAPI:
+    # The deadline is resolved when the route is built, so patch before adding it
+    monkeypatch.setitem(deadlines.ENDPOINT_DEADLINES, path, seconds)
+    router = APIRouter(route_class=DeadlineRoute)
+    router.add_api_route(path, endpoint, methods=["GET"])
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def call(app: FastAPI, path: str, disconnect_after: float = None) -> list:
+    """Send one GET; the client disconnects after `disconnect_after` seconds, or never."""
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return messages
+
+
+def status_of(messages: list) -> int:
+    return next(m["status"] for m in messages if m["type"] == "http.response.start")
+
+
+# ============================================================
+# ⏱️ DEADLINES
+# ============================================================
+
+
+async def test_fast_handler_answers_normally(monkeypatch):
+    async def fast():
+        return {"ok": True}
+
+    app = make_app(monkeypatch, "/fast", 1.0, fast)
+    assert status_of(await call(app, "/fast")) == 200
+
+
+async def test_handler_past_its_deadline_gets_504_and_is_cancelled(monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    app = make_app(monkeypatch, "/slow", 0.05, slow)
+    assert status_of(await call(app, "/slow")) == 504
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+
+
+async def test_client_disconnect_cancels_the_handler_with_499(monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    app = make_app(monkeypatch, "/slow", 5.0, slow)
+    assert status_of(await call(app, "/slow", disconnect_after=0.02)) == CLIENT_CLOSED_REQUEST
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+
+
+async def test_queries_get_the_endpoint_deadline_as_timeout_and_stop_with_it(monkeypatch, ncm, backend):
+    async def read():
+        return await ncm.query_all("MATCH (p:Player) RETURN p.id")
+
+    app = make_app(monkeypatch, "/read", 0.1, read)
+    assert status_of(await call(app, "/read")) == 504
+
+    assert backend.queries[0].timeout == pytest.approx(0.1 + COALESCE_DEADLINE_SLACK, abs=0.05)
+    # The abandoned query is cancelled once its only waiter is gone
+    await asyncio.sleep(0.01)
+    assert backend.cancelled == 1
+
+
+async def test_writes_get_the_endpoint_deadline_as_timeout(monkeypatch, ncm, backend):
+    backend.release.set()
+
+    async def write():
+        await ncm.query_none("MERGE (m:GraphMeta {key: 'graph'})")
+        return {"ok": True}
+
+    app = make_app(monkeypatch, "/write", 2.0, write)
+    assert status_of(await call(app, "/write")) == 200
+    assert backend.queries[0].timeout == pytest.approx(2.0, abs=0.05)
+
+
+# ============================================================
+# ⚙️ CONFIGURATION
+# ============================================================
+
+
+def test_parse_endpoint_deadlines():
+    assert parse_endpoint_deadlines("") == {}
+    assert parse_endpoint_deadlines(" /soccer/player/id=2 , /soccer/teammates/question=20.5,") == {
+        "/soccer/player/id": 2.0,
+        "/soccer/teammates/question": 20.5,
+    }
+
+
+@pytest.mark.parametrize("spec", ["/soccer/player/id", "soccer/player/id=2", "/soccer/player/id=fast"])
+def test_parse_endpoint_deadlines_rejects_bad_entries(spec):
+    with pytest.raises(ValueError):
+        parse_endpoint_deadlines(spec)
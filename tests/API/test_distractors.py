@@ -0,0 +1,53 @@
+import random
+
+from api.src.engine.distractors import DistractorEngine
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+def players(*ids: str) -> list:
+    return [{"id": pid, "name": pid.upper(), "appearances": 1, "centrality": None} for pid in ids]
+
+
+def edge(a: str, b: str, weight: int = 1) -> dict:
+    return {"a": a, "b": b, "club": "X", "start": 2000, "end": 2001, "seasons_overlap": 1, "weight": weight}
+
+
+# Chain a - b - c; x and y played with A only, z with C only, both with w
+ENGINE = DistractorEngine(
+    TeammateGraph(
+        players("a", "b", "c", "w", "x", "y", "z", "q"),
+        [edge("a", "b"), edge("b", "c"), edge("a", "x", 5), edge("a", "y", 1), edge("c", "z", 3), edge("a", "w"), edge("c", "w")],
+    )
+)
+
+
+def ids(options: list) -> set:
+    return {option["id"] for option in options}
+
+
+def test_distractors_played_with_exactly_one_side():
+    options = ENGINE.options("a", "b", "c", limit=10, rng=random.Random(1))
+    assert ids(options) == {"b", "x", "y", "z"}
+
+
+def test_distractors_are_capped_and_the_answer_is_always_included():
+    for seed in range(20):
+        options = ENGINE.options("a", "b", "c", limit=2, rng=random.Random(seed))
+        assert len(options) == 3 and "b" in ids(options)
+
+
+def test_closeness_ranking_prefers_the_strongest_ties():
+    # limit 1 draws from the 3 strongest candidates, so the weakest never shows up
+    engine = DistractorEngine(
+        TeammateGraph(
+            players("a", "b", "c", "s1", "s2", "s3", "s4", "weak"),
+            [edge("a", "b"), edge("b", "c"), *[edge("a", f"s{i}", 10) for i in range(1, 5)], edge("a", "weak", 1)],
+        )
+    )
+    for seed in range(20):
+        assert "weak" not in ids(engine.options("a", "b", "c", limit=1, rank_by_closeness=True, rng=random.Random(seed)))
+
+
+def test_unknown_answer_returns_none_and_unknown_anchor_is_ignored():
+    assert ENGINE.options("a", "nobody", "c", limit=3) is None
+    assert ids(ENGINE.options("nobody", "b", "c", limit=10)) == {"b", "w", "z"}
@@ -0,0 +1,68 @@
+from api.src.engine.ego_network import EgoNetworkBuilder
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+def players(*ids: str) -> list:
+    return [{"id": pid, "name": pid.upper(), "appearances": 1, "centrality": None} for pid in ids]
+
+
+def edge(a: str, b: str, club: str = "X", weight: int = 1, overlap: int = 1) -> dict:
+    return {"a": a, "b": b, "club": club, "start": 2000, "end": 2001, "seasons_overlap": overlap, "weight": weight}
+
+
+# a is the center: b, c, d one hop out (d through club Y), e two hops out through b; b and c are also linked
+GRAPH = TeammateGraph(
+    players("a", "b", "c", "d", "e"),
+    [edge("a", "b", weight=5), edge("a", "c", weight=3), edge("a", "d", "Y", weight=1, overlap=9), edge("b", "e", weight=2), edge("b", "c")],
+)
+
+
+def node(pid: str) -> int:
+    return GRAPH.index[pid]
+
+
+def hops(network: dict) -> dict:
+    return {n["id"]: n["hop"] for n in network["nodes"]}
+
+
+def pairs(network: dict) -> set:
+    return {(e["source"], e["target"]) for e in network["edges"]}
+
+
+def test_network_expands_hop_by_hop_without_same_hop_links():
+    network = EgoNetworkBuilder(GRAPH).network(node("a"), (5, 5))
+
+    assert network["center"] == {"id": "a", "name": "A"}
+    assert hops(network) == {"a": 0, "b": 1, "c": 1, "d": 1, "e": 2}
+    assert pairs(network) == {("a", "b"), ("a", "c"), ("a", "d"), ("b", "e")}
+    assert not network["truncated"]
+
+
+def test_caps_keep_the_strongest_ties_and_flag_truncation():
+    builder = EgoNetworkBuilder(GRAPH)
+    assert pairs(builder.network(node("a"), (2,))) == {("a", "b"), ("a", "c")}
+    assert builder.network(node("a"), (2,))["truncated"]
+
+    assert pairs(builder.network(node("a"), (1,), rank_by="seasons_overlap")) == {("a", "d")}
+
+
+def test_club_filter_only_follows_that_clubs_edges():
+    network = EgoNetworkBuilder(GRAPH).network(node("a"), (5, 5), club="Y")
+    assert hops(network) == {"a": 0, "d": 1}
+    assert network["edges"][0]["club"] == "Y" and network["edges"][0]["seasons_overlap"] == 9
+
+
+def test_scan_budget_stops_the_expansion():
+    network = EgoNetworkBuilder(GRAPH, max_scanned=4).network(node("a"), (5, 5))
+    # a's 3 entries fit the budget, b's 3 do not
+    assert hops(network) == {"a": 0, "b": 1, "c": 1, "d": 1}
+    assert network["truncated"]
+
+
+def test_results_are_cached_per_request_shape():
+    builder = EgoNetworkBuilder(GRAPH, cache_size=1)
+    first = builder.network(node("a"), (2,))
+    assert builder.network(node("a"), (2,)) is first
+
+    builder.network(node("b"), (2,))
+    assert builder.network(node("a"), (2,)) is not first
@@ -0,0 +1,69 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from api.src.router import exports
+from api.src.router.exports import export_response
+
+
+COLUMNS = ["id", "name", "appearances", "centrality"]
+PAGES = [[["a", "Al", 3, 0.5], ["b", "Bo, Jr.", 1, None]], [["c", "Cy", 7, 0.25]]]
+
+
+async def pages(rows: list = PAGES):
+    for page in rows:
+        yield page
+
+
+async def body_of(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+async def test_ndjson_export_has_one_object_per_row():
+    response = export_response(COLUMNS, pages(), "ndjson", "players", "")
+    lines = (await body_of(response)).decode().splitlines()
+
+    assert [json.loads(line) for line in lines] == [dict(zip(COLUMNS, row)) for page in PAGES for row in page]
+    assert response.media_type == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="players.ndjson"'
+
+
+async def test_csv_export_has_a_header_and_quotes_values():
+    rows = list(csv.reader(io.StringIO((await body_of(export_response(COLUMNS, pages(), "csv", "players", ""))).decode())))
+    assert rows == [COLUMNS, ["a", "Al", "3", "0.5"], ["b", "Bo, Jr.", "1", ""], ["c", "Cy", "7", "0.25"]]
+
+
+async def test_empty_csv_export_still_has_its_header():
+    assert await body_of(export_response(COLUMNS, pages([]), "csv", "players", "")) == b"id,name,appearances,centrality\r\n"
+
+
+async def test_gzip_is_used_when_accepted():
+    response = export_response(COLUMNS, pages(), "ndjson", "players", "br, GZIP;q=0.5")
+    assert response.headers["content-encoding"] == "gzip" and response.headers["vary"] == "Accept-Encoding"
+    assert len(gzip.decompress(await body_of(response)).splitlines()) == 3
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(HTTPException) as rejected:
+        export_response(COLUMNS, pages(), "xml", "players", "")
+    assert rejected.value.status_code == 400
+
+
+def test_arrow_without_pyarrow_is_not_implemented(monkeypatch):
+    monkeypatch.setattr(exports, "pa", None)
+    with pytest.raises(HTTPException) as rejected:
+        export_response(COLUMNS, pages(), "arrow", "players", "")
+    assert rejected.value.status_code == 501
+
+
+async def test_arrow_export_streams_typed_record_batches():
+    pa = pytest.importorskip("pyarrow")
+    response = export_response(COLUMNS, pages(), "arrow", "players", "")
+    table = pa.ipc.open_stream(await body_of(response)).read_all()
+
+    assert table.schema.types == [pa.string(), pa.string(), pa.int64(), pa.float64()]
+    assert table.column("centrality").to_pylist() == [0.5, None, 0.25]
@@ -0,0 +1,135 @@
+import pytest
+
+from api.src.http_cache import ConditionalCacheMiddleware, _matches, etag_for
+
+
+PLAYER = "/soccer/player/id"
+SHORTEST = "/soccer/teammates/shortest/id"
+QUESTION = "/soccer/teammates/question"
+
+
+# ============================================================
+# 🏷️ ETAGS
+# ============================================================
+
+
+def test_etag_ignores_query_parameter_order():
+    assert etag_for("v1", PLAYER, b"id=a&x=1") == etag_for("v1", PLAYER, b"x=1&id=a")
+    assert etag_for("v1", PLAYER, b"id=a") != etag_for("v1", PLAYER, b"id=b")
+
+
+def test_etag_changes_with_the_graph_version_and_route():
+    assert etag_for("v1", PLAYER, b"id=a") != etag_for("v2", PLAYER, b"id=a")
+    assert etag_for("v1", PLAYER, b"id=a").removeprefix("W/") != etag_for("v1", SHORTEST, b"id=a").removeprefix("W/")
+
+
+def test_arbitrary_shortest_paths_only_get_a_weak_etag():
+    assert etag_for("v1", SHORTEST, b"a=x&b=y").startswith('W/"')
+    assert etag_for("v1", PLAYER, b"id=a").startswith('"')
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "etag", "expected"),
+    [
+        ('"abc"', '"abc"', True),
+        ('W/"abc"', '"abc"', True),
+        ('"abc"', 'W/"abc"', True),
+        ('"old", "abc"', '"abc"', True),
+        ("*", '"abc"', True),
+        ('"old"', '"abc"', False),
+    ],
+)
+def test_if_none_match_uses_weak_comparison(if_none_match, etag, expected):
+    assert _matches(if_none_match, etag) is expected
+
+
+# ============================================================
+# 🧩 MIDDLEWARE
+# ============================================================
+
+
+async def call(path: str, version="v1", status: int = 200, method: str = "GET", query: bytes = b"", if_none_match: str = None):
+    """Run one request through the middleware; returns (response start message, whether the app ran)."""
+    ran = False
+
+    async def app(scope, receive, send):
+        nonlocal ran
+        ran = True
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    scope = {"type": "http", "method": method, "path": path, "query_string": query, "headers": headers}
+    await ConditionalCacheMiddleware(app, lambda: version)(scope, None, send)
+    return sent[0], ran
+
+
+async def test_cacheable_response_gets_etag_and_max_age():
+    start, ran = await call(PLAYER, query=b"id=a")
+    headers = dict(start["headers"])
+
+    assert ran and start["status"] == 200
+    assert headers[b"etag"] == etag_for("v1", PLAYER, b"id=a").encode()
+    assert headers[b"cache-control"] == b"public, max-age=3600"
+    assert headers[b"content-type"] == b"application/json"
+
+
+async def test_matching_if_none_match_is_answered_with_304_before_the_app():
+    etag = etag_for("v1", PLAYER, b"id=a")
+    start, ran = await call(PLAYER, query=b"id=a", if_none_match=etag)
+
+    assert not ran and start["status"] == 304
+    assert dict(start["headers"])[b"etag"] == etag.encode()
+
+
+async def test_stale_etag_after_a_graph_reload_gets_the_full_response():
+    start, ran = await call(PLAYER, version="v2", query=b"id=a", if_none_match=etag_for("v1", PLAYER, b"id=a"))
+    assert ran and start["status"] == 200
+
+
+async def test_randomized_routes_are_never_stored():
+    start, ran = await call(QUESTION, if_none_match="*")
+    assert ran and dict(start["headers"])[b"cache-control"] == b"no-store"
+
+
+@pytest.mark.parametrize(
+    ("path", "version", "status", "method"),
+    [
+        # No version yet: even a wildcard If-None-Match goes to the app
+        (PLAYER, None, 200, "GET"),
+        (PLAYER, "v1", 200, "POST"),
+        ("/system/ready", "v1", 200, "GET"),
+    ],
+)
+async def test_uncacheable_requests_pass_through_untouched(path, version, status, method):
+    start, ran = await call(path, version=version, status=status, method=method, if_none_match="*")
+    assert ran and start["status"] == status
+    assert b"etag" not in dict(start["headers"]) and b"cache-control" not in dict(start["headers"])
+
+
+async def test_error_responses_are_never_cached():
+    start, ran = await call(PLAYER, status=404)
+    assert ran and start["status"] == 404
+    assert b"etag" not in dict(start["headers"]) and b"cache-control" not in dict(start["headers"])
+
+
+# ============================================================
+# 🕸️ SNAPSHOT VERSION
+# ============================================================
+
+
+async def test_store_version_follows_the_loaded_snapshot(graph_repository, graph_store):
+    repo = graph_repository([], [])
+    assert graph_store.version is None
+
+    await graph_store.refresh(repo)
+    assert graph_store.version == "test"
+
+    # A newer stamp seen in Neo4j hides the version until that snapshot is loaded
+    graph_store._db_version = "newer"
+    assert graph_store.version is None
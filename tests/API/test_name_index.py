@@ -0,0 +1,53 @@
+from api.src.engine.name_index import NameIndex, normalize_name
+
+
+PLAYERS = [
+    {"id": "messi", "name": "Lionel Andrés Messi", "appearances": 800},
+    {"id": "mbappe", "name": "Kylian Mbappé", "appearances": 400},
+    {"id": "lionel", "name": "Lionel Scaloni", "appearances": 300},
+    {"id": "mertens", "name": "Dries Mertens", "appearances": 500},
+    {"id": "newcomer", "name": "Mes Mess", "appearances": None},
+]
+
+
+def ids(rows: list) -> list:
+    return [row["id"] for row in rows]
+
+
+def test_normalize_name_strips_accents_case_and_separators():
+    assert normalize_name("Kylian-Mbappé") == "kylian mbappe"
+    assert normalize_name("  N'Golo   KANTÉ ") == "n golo kante"
+    assert normalize_name("---") == ""
+
+
+def test_lookup_matches_a_prefix_of_any_token_ranked_by_appearances():
+    index = NameIndex(PLAYERS)
+    assert ids(index.lookup("lionel")) == ["messi", "lionel"]
+    assert ids(index.lookup("me")) == ["messi", "mertens", "newcomer"]
+    assert ids(index.lookup("andres mes")) == ["messi"]
+
+
+def test_lookup_ignores_accents_and_case():
+    index = NameIndex(PLAYERS)
+    assert ids(index.lookup("MBAPPÉ")) == ids(index.lookup("mbappe")) == ["mbappe"]
+
+
+def test_split_edges_keep_every_player_reachable():
+    # "mes", "mess" and "messi" share prefixes and force edge splits in the trie
+    index = NameIndex(PLAYERS)
+    assert ids(index.lookup("mess")) == ["messi", "newcomer"]
+    assert ids(index.lookup("messi")) == ["messi"]
+    assert ids(index.lookup("mesx")) == []
+
+
+def test_unknown_or_empty_query_returns_nothing():
+    index = NameIndex(PLAYERS)
+    assert index.lookup("zidane") == []
+    assert index.lookup("  ") == []
+
+
+def test_results_are_capped_by_limit_and_k():
+    index = NameIndex(PLAYERS, k=2)
+    assert ids(index.lookup("me")) == ["messi", "mertens"]
+    assert ids(index.lookup("me", limit=1)) == ["messi"]
+    assert index.lookup("mertens")[0] == {"id": "mertens", "name": "Dries Mertens", "appearances": 500}
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from api.src.database.neo4j_connection_manager import COALESCE_DEADLINE_SLACK, QueryDeadlineExceeded, query_deadline
+
+
+async def query(ncm, seconds=None):
+    with query_deadline(seconds):
+        return await ncm.query_all("MATCH (p:Player) RETURN p.id")
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ============================================================
+# 🔀 SINGLE-FLIGHT READS
+# ============================================================
+
+
+async def test_flight_carries_the_request_deadline_as_transaction_timeout(ncm, backend):
+    backend.release.set()
+    assert await query(ncm, 5) == [{"n": 1}]
+    assert backend.queries[0].timeout == pytest.approx(5 + COALESCE_DEADLINE_SLACK, abs=0.1)
+
+
+async def test_read_without_deadline_has_no_timeout(ncm, backend):
+    backend.release.set()
+    await query(ncm)
+    assert backend.queries[0].timeout is None
+
+
+async def test_identical_reads_share_one_execution(ncm, backend):
+    first = asyncio.ensure_future(query(ncm, 5))
+    await settle()
+    second = asyncio.ensure_future(query(ncm, 2))
+    await settle()
+
+    backend.release.set()
+    assert await first == await second == [{"n": 1}]
+    assert len(backend.queries) == 1
+    assert ncm.coalescing_stats()["coalesced"] == 1
+
+
+async def test_later_deadline_starts_its_own_flight_that_later_callers_join(ncm, backend):
+    short = asyncio.ensure_future(query(ncm, 2))
+    await settle()
+    long = asyncio.ensure_future(query(ncm, 8))
+    await settle()
+    joiner = asyncio.ensure_future(query(ncm, 6))
+    await settle()
+
+    backend.release.set()
+    await asyncio.gather(short, long, joiner)
+    assert [q.timeout for q in backend.queries] == pytest.approx([2 + COALESCE_DEADLINE_SLACK, 8 + COALESCE_DEADLINE_SLACK], abs=0.1)
+    assert ncm.coalescing_stats()["executions"] == 2
+
+
+async def test_cancelled_waiter_leaves_the_others_running(ncm, backend):
+    first = asyncio.ensure_future(query(ncm, 5))
+    await settle()
+    second = asyncio.ensure_future(query(ncm, 5))
+    await settle()
+
+    first.cancel()
+    await settle()
+    backend.release.set()
+
+    assert await second == [{"n": 1}]
+    assert first.cancelled()
+    assert backend.cancelled == 0
+
+
+async def test_last_waiter_leaving_cancels_the_execution(ncm, backend):
+    only = asyncio.ensure_future(query(ncm, 5))
+    await settle()
+
+    only.cancel()
+    await settle()
+
+    assert backend.cancelled == 1
+    assert ncm.coalescing_stats()["in_flight"] == 0
+
+
+async def test_waiter_stops_at_its_own_deadline(ncm, backend):
+    patient = asyncio.ensure_future(query(ncm, 5))
+    await settle()
+
+    with pytest.raises(QueryDeadlineExceeded):
+        await query(ncm, 0.05)
+
+    backend.release.set()
+    assert await patient == [{"n": 1}]
+    assert backend.cancelled == 0
+
+
+async def test_expired_deadline_never_starts_a_query(ncm, backend):
+    with pytest.raises(QueryDeadlineExceeded):
+        await query(ncm, -1)
+    assert backend.queries == []
+
+
+async def test_uncoalesced_reads_still_send_the_timeout(ncm, backend):
+    ncm.coalesce_reads = False
+    backend.release.set()
+    await query(ncm, 3)
+    assert backend.queries[0].timeout == pytest.approx(3, abs=0.1)
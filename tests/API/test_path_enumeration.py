@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from api.src.engine.path_enumeration import PathEnumerator
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+def random_graph(seed: int, n: int = 12, m: int = 26) -> TeammateGraph:
+    rng = random.Random(seed)
+    players = [{"id": f"p{i:02d}", "name": f"P{i}", "appearances": 1, "centrality": None} for i in range(n)]
+    edges = []
+    for _ in range(m):
+        a, b = rng.sample(range(n), 2)
+        weight = rng.randint(1, 9)
+        edges.append({"a": f"p{a:02d}", "b": f"p{b:02d}", "club": "X", "start": 2000, "end": 2001, "seasons_overlap": 1, "weight": weight})
+    return TeammateGraph(players, edges)
+
+
+def simple_paths(graph: TeammateGraph, source: int, target: int, max_hops: int) -> list:
+    """Every loopless path as its edge tuple, by brute force."""
+    found = []
+
+    def extend(u, visited, path_edges):
+        if u == target:
+            found.append(tuple(path_edges))
+            return
+        if len(path_edges) == max_hops:
+            return
+        for k in range(graph.offsets[u], graph.offsets[u + 1]):
+            v = graph.neighbors[k]
+            if v not in visited:
+                extend(v, visited | {v}, path_edges + [graph.edges[k]])
+
+    extend(source, {source}, [])
+    return found
+
+
+def assert_valid(graph: TeammateGraph, source: int, target: int, path) -> None:
+    nodes, path_edges = path
+    assert nodes[0] == source and nodes[-1] == target and len(set(nodes)) == len(nodes)
+    assert len(nodes) == len(path_edges) + 1
+    for u, v, e in zip(nodes, nodes[1:], path_edges):
+        assert e in [graph.edges[k] for k in range(graph.offsets[u], graph.offsets[u + 1]) if graph.neighbors[k] == v]
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_all_shortest_matches_brute_force(seed):
+    graph = random_graph(seed)
+    paths = PathEnumerator(graph)
+    for source, target in [(0, 5), (3, 11), (7, 1)]:
+        everything = simple_paths(graph, source, target, 6)
+        found, truncated = paths.all_shortest(source, target, max_paths=1000, max_depth=6)
+        for path in found:
+            assert_valid(graph, source, target, path)
+
+        shortest = min(map(len, everything), default=None)
+        assert {tuple(e) for _, e in found} == {p for p in everything if len(p) == shortest}
+        assert len(found) == len({tuple(e) for _, e in found}) and not truncated
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_k_shortest_matches_brute_force_ranking(seed):
+    graph = random_graph(seed)
+    paths = PathEnumerator(graph)
+    for source, target in [(0, 5), (3, 11), (7, 1)]:
+        rank = lambda path_edges: (len(path_edges), -sum(graph.edge_weight[e] for e in path_edges))
+        expected = sorted(map(rank, simple_paths(graph, source, target, 6)))[:10]
+
+        found, truncated = paths.k_shortest(source, target, k=10, max_depth=6)
+        for path in found:
+            assert_valid(graph, source, target, path)
+        assert len({tuple(e) for _, e in found}) == len(found)
+        assert [rank(e) for _, e in found] == expected and not truncated
+
+
+def test_max_paths_truncates_and_trivial_path_is_kept():
+    # Four parallel two-hop routes from a to z
+    players = [{"id": pid, "name": pid, "appearances": 1, "centrality": None} for pid in ("a", "b", "c", "d", "e", "z")]
+    edges = [
+        {"a": x, "b": y, "club": "X", "start": 2000, "end": 2001, "seasons_overlap": 1, "weight": 1}
+        for middle in "bcde"
+        for x, y in (("a", middle), (middle, "z"))
+    ]
+    paths = PathEnumerator(TeammateGraph(players, edges))
+
+    found, truncated = paths.all_shortest(0, 5, max_paths=3)
+    assert len(found) == 3 and truncated
+    assert paths.all_shortest(0, 0, max_paths=3) == ([([0], [])], False)
+    assert paths.k_shortest(0, 0, k=3) == ([([0], [])], False)
+
+
+def test_budget_and_mask_limit_the_search():
+    graph = random_graph(1)
+    paths = PathEnumerator(graph)
+
+    assert paths.all_shortest(0, 5, max_paths=10, budget=1) == ([], True)
+    assert paths.k_shortest(0, 5, k=10, budget=1) == ([], True)
+
+    no_edges = bytearray(graph.edge_count)
+    assert paths.all_shortest(0, 5, max_paths=10, mask=no_edges) == ([], False)
+    assert paths.k_shortest(0, 5, k=10, mask=no_edges) == ([], False)
@@ -0,0 +1,115 @@
+import os
+
+import pytest
+from dotenv import load_dotenv
+
+from api.src.database.neo4j_connection_manager import Neo4jConnectionManager
+from api.src.database.neo4j_schema_manager import REQUIRED_INDEXES, SCHEMA_MIGRATIONS, Neo4jSchemaManager, find_plan_regressions
+
+
+# ============================================================
+# 🧩 PLAN HELPERS
+# ============================================================
+
+
+def op(operator: str, *children: dict, details: str = "") -> dict:
+    """Hand-built plan node in the shape of neo4j's ResultSummary.plan."""
+    return {"operatorType": f"{operator}@neo4j", "args": {"Details": details}, "children": list(children)}
+
+
+# ============================================================
+# 🔎 find_plan_regressions
+# ============================================================
+
+
+def test_index_seek_plan_has_no_regressions():
+    plan = op("ProduceResults", op("Projection", op("NodeUniqueIndexSeek", details="UNIQUE p:Player(id)")))
+    assert find_plan_regressions(plan) == []
+
+
+def test_label_scan_is_reported_with_details():
+    plan = op("ProduceResults", op("Filter", op("NodeByLabelScan", details="p:Player")))
+    assert find_plan_regressions(plan) == ["NodeByLabelScan (p:Player)"]
+
+
+def test_allowed_scan_is_not_reported():
+    plan = op("ProduceResults", op("NodeByLabelScan", details="p:Player"))
+    assert find_plan_regressions(plan, {"NodeByLabelScan"}) == []
+
+
+def test_only_the_allowed_scan_operators_are_skipped():
+    plan = op("ProduceResults", op("Expand(All)", op("AllNodesScan", details="n")), op("NodeByLabelScan", details="p:Player"))
+    assert find_plan_regressions(plan, {"NodeByLabelScan"}) == ["AllNodesScan (n)"]
+
+
+def test_relationship_type_scan_is_reported():
+    plan = op("ProduceResults", op("UndirectedRelationshipTypeScan", details="(a)-[r:PLAYED_WITH]-(b)"))
+    assert find_plan_regressions(plan) == ["UndirectedRelationshipTypeScan ((a)-[r:PLAYED_WITH]-(b))"]
+
+
+def test_cartesian_product_of_seeks_is_fine():
+    plan = op("ProduceResults", op("CartesianProduct", op("NodeUniqueIndexSeek"), op("NodeIndexSeek")))
+    assert find_plan_regressions(plan) == []
+
+
+def test_cartesian_product_over_non_seek_input_is_reported():
+    plan = op("ProduceResults", op("CartesianProduct", op("NodeUniqueIndexSeek"), op("Filter", op("NodeByLabelScan", details="c:Club"))))
+    assert find_plan_regressions(plan, {"NodeByLabelScan"}) == ["CartesianProduct over non-seek inputs"]
+
+
+def test_missing_children_and_operator_suffix_are_tolerated():
+    assert find_plan_regressions({"operatorType": "NodeByLabelScan", "args": {"Details": "p:Player"}}) == ["NodeByLabelScan (p:Player)"]
+    assert find_plan_regressions({}) == []
+
+
+# ============================================================
+# 📐 MIGRATIONS
+# ============================================================
+
+
+def test_migration_versions_increase():
+    versions = [version for version, _, _ in SCHEMA_MIGRATIONS]
+    assert versions == sorted(set(versions))
+
+
+def test_every_required_index_is_created_and_not_dropped_by_the_migrations():
+    created, dropped = set(), set()
+    for _, _, statements in SCHEMA_MIGRATIONS:
+        for statement in statements:
+            words = statement.split()
+            if words[:1] == ["CREATE"] and "IF" in words:
+                created.add(words[words.index("IF") - 1])
+                dropped.discard(words[words.index("IF") - 1])
+            elif words[:2] == ["DROP", "INDEX"]:
+                dropped.add(words[2])
+    assert REQUIRED_INDEXES <= created - dropped
+
+
+# ============================================================
+# 🧪 REPOSITORY QUERY PLANS (needs a reachable Neo4j)
+# ============================================================
+
+
+async def _check_repository_plans():
+    load_dotenv()
+    if not all(os.environ.get(name) for name in ("NEO4J_URI", "NEO4J_USER", "NEO4J_PASSWORD")):
+        pytest.skip("Neo4j is not configured (NEO4J_URI / NEO4J_USER / NEO4J_PASSWORD)")
+
+    ncm = Neo4jConnectionManager(uri=os.environ["NEO4J_URI"], user=os.environ["NEO4J_USER"], password=os.environ["NEO4J_PASSWORD"])
+    try:
+        try:
+            await ncm.verify_connection()
+        except ConnectionError as e:
+            pytest.skip(str(e))
+
+        # EXPLAIN only: the check never writes, so the schema must already be migrated
+        manager = Neo4jSchemaManager(ncm)
+        await manager.verify()
+        return await manager.check_query_plans()
+    finally:
+        await ncm.close_all()
+
+
+async def test_repository_query_plans_do_not_regress():
+    regressions = await _check_repository_plans()
+    assert regressions == {}, "\n".join(f"{name}: {problem}" for name, problems in regressions.items() for problem in problems)
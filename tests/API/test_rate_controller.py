@@ -0,0 +1,82 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from script import rate_controller
+from script.rate_controller import HostRateController, ThrottledError, looks_blocked
+
+
+URL = "https://fbref.com/en/players/abc"
+
+
+@pytest.fixture
+def controller(tmp_path):
+    return HostRateController(state_file=str(tmp_path / "rate_state.json"), initial_rate=1.0, additive_step=0.5, max_rate=2.0, save_every=1000)
+
+
+def test_success_increases_the_rate_additively_up_to_the_cap(controller):
+    controller.success(URL)
+    assert controller.rate(URL) == pytest.approx(1.5)
+    controller.success(URL)
+    controller.success(URL)
+    assert controller.rate(URL) == pytest.approx(2.0)
+
+
+def test_throttle_halves_the_rate_and_backs_off_exponentially(controller):
+    assert controller.throttled(URL) == 5.0
+    assert controller.throttled(URL) == 10.0
+    assert controller.rate(URL) == pytest.approx(0.25)
+    # Retry-After wins over the exponential schedule
+    assert controller.throttled(URL, retry_after=42) == 42
+    assert controller.rate(URL) == pytest.approx(0.125)
+
+
+def test_rates_are_tracked_per_host(controller):
+    controller.throttled(URL)
+    assert controller.rate("https://www.pro-football-reference.com/players/") == 1.0
+
+
+def test_record_raises_on_throttle_and_only_counts_non_errors_as_success(controller):
+    controller.record(URL, 404)
+    controller.record(URL, 500)
+    assert controller.rate(URL) == 1.0
+
+    controller.record(URL, 200)
+    assert controller.rate(URL) == pytest.approx(1.5)
+
+    with pytest.raises(ThrottledError):
+        controller.record(URL, 429, retry_after=1)
+    assert controller.rate(URL) == pytest.approx(0.75)
+
+
+def test_learned_rates_survive_a_restart(controller):
+    controller.throttled(URL)
+    saved = json.loads(open(controller.state_file, encoding="utf-8").read())
+    assert saved == {"fbref.com": {"rate": 0.5}}
+
+    restarted = HostRateController(state_file=controller.state_file)
+    assert restarted.rate(URL) == 0.5
+
+
+def test_unreadable_state_is_ignored(tmp_path):
+    path = tmp_path / "rate_state.json"
+    path.write_text("{not json")
+    assert HostRateController(state_file=str(path)).rate(URL) == 1.0
+
+
+def test_wait_spaces_requests_by_the_rate(controller, monkeypatch):
+    now, slept = 100.0, []
+    monkeypatch.setattr(rate_controller, "time", SimpleNamespace(monotonic=lambda: now, sleep=slept.append))
+    monkeypatch.setattr(rate_controller.random, "uniform", lambda lo, hi: 1.0)
+
+    controller.wait(URL)
+    controller.wait(URL)
+    assert slept == [pytest.approx(1.0)]
+
+
+def test_block_pages_are_recognised():
+    assert looks_blocked("Just a moment...")
+    assert looks_blocked("<title>429 Error</title>")
+    assert not looks_blocked("Lionel Messi Stats")
+    assert not looks_blocked(None)
@@ -0,0 +1,15 @@
+import json
+
+from api.src.router.responses import FastJSONResponse, ndjson_line
+
+
+def test_fast_json_response_renders_non_string_keys():
+    response = FastJSONResponse({"players": [{"id": "a", "apps": 3}], 7: None})
+    assert json.loads(response.body) == {"players": [{"id": "a", "apps": 3}], "7": None}
+    assert response.media_type == "application/json"
+
+
+def test_ndjson_line_is_one_newline_terminated_record():
+    line = ndjson_line({"name": "Mbappé", "path": [1, 2]})
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line) == {"name": "Mbappé", "path": [1, 2]}
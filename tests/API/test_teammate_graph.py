@@ -0,0 +1,73 @@
+from api.src.engine.teammate_graph import TeammateGraph
+
+
+def players(*ids: str) -> list:
+    return [{"id": pid, "name": pid.upper(), "appearances": 1, "centrality": None} for pid in ids]
+
+
+def edge(a: str, b: str, club: str = "X", start: int = 2000, end: int = 2001, weight: int = 1) -> dict:
+    return {"a": a, "b": b, "club": club, "start": start, "end": end, "seasons_overlap": end - start, "weight": weight}
+
+
+# a - b - c - d, plus a shortcut a - e - d; f is isolated
+GRAPH = TeammateGraph(
+    players("a", "b", "c", "d", "e", "f"),
+    [edge("a", "b", "X"), edge("b", "c", "Y"), edge("c", "d", "Z"), edge("a", "e", "V"), edge("e", "d", "W")],
+)
+
+
+def node(pid: str) -> int:
+    return GRAPH.index[pid]
+
+
+def ids(nodes: list) -> list:
+    return [GRAPH.ids[n] for n in nodes]
+
+
+# ============================================================
+# 🧱 CSR ADJACENCY
+# ============================================================
+
+
+def test_edges_are_stored_in_both_directions():
+    assert GRAPH.node_count == 6 and GRAPH.edge_count == 5
+    assert GRAPH.degree(node("a")) == 2 and GRAPH.degree(node("f")) == 0
+    assert GRAPH.are_teammates(node("a"), node("b")) and GRAPH.are_teammates(node("b"), node("a"))
+    assert not GRAPH.are_teammates(node("a"), node("c"))
+
+
+def test_self_loops_and_unknown_players_are_dropped():
+    graph = TeammateGraph(players("a", "b"), [edge("a", "a"), edge("a", "zz"), edge("a", "b")])
+    assert graph.edge_count == 1
+    assert graph.degree(graph.index["a"]) == 1
+
+
+# ============================================================
+# 🔍 MULTI-TARGET BFS
+# ============================================================
+
+
+def test_one_bfs_answers_every_target():
+    found = GRAPH.shortest_paths_from(node("a"), [node("c"), node("d"), node("a")])
+
+    assert ids(found[node("a")][0]) == ["a"] and found[node("a")][1] == []
+    assert ids(found[node("c")][0]) == ["a", "b", "c"]
+    # Two hops through e, not three through b and c
+    assert ids(found[node("d")][0]) == ["a", "e", "d"]
+    assert [GRAPH.edge_club[e] for e in found[node("d")][1]] == ["V", "W"]
+
+
+def test_unreachable_and_too_deep_targets_are_missing():
+    assert GRAPH.shortest_paths_from(node("a"), [node("f")]) == {}
+    assert node("c") not in GRAPH.shortest_paths_from(node("a"), [node("c")], max_depth=1)
+
+
+def test_describe_path_matches_the_cypher_shape():
+    nodes, path_edges = GRAPH.shortest_paths_from(node("a"), [node("c")])[node("c")]
+
+    assert GRAPH.describe_path(nodes, path_edges) == {
+        "players": [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}, {"id": "c", "name": "C"}],
+        "clubs": ["X", "Y"],
+        "length": 2,
+    }
+    assert GRAPH.describe_path(nodes, path_edges, include_seasons=True)["seasons"] == [[2000, 2001], [2000, 2001]]
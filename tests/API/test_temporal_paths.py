@@ -0,0 +1,62 @@
+from api.src.engine.teammate_graph import TeammateGraph
+from api.src.engine.temporal_paths import TemporalEdgeIndex
+
+
+def players(*ids: str) -> list:
+    return [{"id": pid, "name": pid.upper(), "appearances": 1, "centrality": None} for pid in ids]
+
+
+def edge(a: str, b: str, club: str, start, end) -> dict:
+    return {"a": a, "b": b, "club": club, "start": start, "end": end, "seasons_overlap": 1, "weight": 1}
+
+
+# a -> c either through b (forward in time) or through d (back in time); e has undated edges only
+GRAPH = TeammateGraph(
+    players("a", "b", "c", "d", "e"),
+    [
+        edge("a", "b", "X", 2000, 2002),
+        edge("b", "c", "Y", 2010, 2012),
+        edge("a", "d", "Z", 2011, 2012),
+        edge("d", "c", "W", 2005, 2006),
+        edge("a", "e", "V", None, None),
+    ],
+)
+INDEX = TemporalEdgeIndex(GRAPH)
+
+
+def path(source: str, target: str, **kwargs) -> list:
+    found = INDEX.shortest_path(GRAPH.index[source], GRAPH.index[target], **kwargs)
+    return None if found is None else [GRAPH.ids[n] for n in found[0]]
+
+
+def clubs(mask: bytearray) -> set:
+    return {GRAPH.edge_club[eid] for eid, active in enumerate(mask) if active}
+
+
+def test_active_edges_overlap_the_window():
+    assert INDEX.first_season == 2000 and INDEX.last_season == 2012
+    assert clubs(INDEX.active_edges(2002, 2005)) == {"X", "W"}
+    assert clubs(INDEX.active_edges(None, 2001)) == {"X"}
+    assert clubs(INDEX.active_edges(2012, None)) == {"Y", "Z"}
+    assert clubs(INDEX.active_edges(1990, 1995)) == set()
+
+
+def test_windowed_path_only_uses_edges_from_the_window():
+    assert len(path("a", "c")) == 3
+    assert path("a", "c", season_from=2005, season_to=2012) == ["a", "d", "c"]
+    assert path("a", "c", season_from=2000, season_to=2006) is None
+
+
+def test_chronological_path_never_goes_back_in_time():
+    assert path("a", "c", chronological=True) == ["a", "b", "c"]
+    assert path("a", "c", season_from=2005, season_to=2012, chronological=True) is None
+    assert path("c", "a", chronological=True) == ["c", "d", "a"]
+
+
+def test_undated_edges_are_never_used_and_trivial_paths_are_kept():
+    assert path("a", "e") is None
+    assert path("a", "a", season_from=1990, season_to=1991) == ["a"]
+
+
+def test_max_depth_bounds_the_search():
+    assert path("a", "c", max_depth=1) is None
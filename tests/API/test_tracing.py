@@ -0,0 +1,128 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from api.src.tracing import FileSpanExporter, Tracer, TracingMiddleware, current_span, span, to_otlp, traced
+
+
+class ListExporter:
+    def __init__(self) -> None:
+        self.payloads = []
+        self.exported = threading.Event()
+
+    def export(self, payload):
+        self.payloads.append(payload)
+        self.exported.set()
+
+
+# ============================================================
+# 🌳 SPANS
+# ============================================================
+
+
+def test_span_outside_a_trace_is_a_no_op():
+    with span("orphan", rows=3) as s:
+        s.set("ignored", True)
+    current_span().set("ignored", True)
+
+
+async def test_spans_nest_under_the_request_root():
+    @traced("service.lookup")
+    async def lookup():
+        with span("repo.query", rows=2):
+            current_span().set("cached", False)
+        return "ok"
+
+    with Tracer(slow_ms=10**9).trace("GET /x") as root:
+        assert await lookup() == "ok"
+
+    assert [s.name for s in root.walk()] == ["GET /x", "service.lookup", "repo.query"]
+    query = root.children[0].children[0]
+    assert query.attributes == {"rows": 2, "cached": False}
+    assert query.trace_id == root.trace_id and query.parent is root.children[0]
+    assert root.end_ns is not None and query.end_ns is not None
+
+
+def test_errors_are_recorded_on_the_span_that_raised():
+    with pytest.raises(ValueError):
+        with Tracer(slow_ms=10**9).trace("GET /x") as root:
+            with span("repo.query"):
+                raise ValueError("boom")
+
+    assert root.children[0].error == "ValueError" and root.error == "ValueError"
+    assert "error=ValueError" in root.format_tree()
+
+
+def test_slow_requests_log_their_span_tree(caplog):
+    with caplog.at_level(logging.WARNING, logger="api.src.tracing.slow"):
+        with Tracer(slow_ms=0).trace("GET /slow"):
+            with span("repo.query", rows=5):
+                pass
+
+    assert "GET /slow" in caplog.text and "\n  " in caplog.text and "rows=5" in caplog.text
+
+
+# ============================================================
+# 📤 EXPORT
+# ============================================================
+
+
+def test_otlp_encoding_links_parents_and_types_attributes():
+    with Tracer(slow_ms=10**9).trace("GET /x", flag=True, count=3) as root:
+        with span("child", ratio=0.5, label="a"):
+            pass
+
+    encoded = to_otlp(root, "svc")["resourceSpans"][0]
+    assert encoded["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "svc"}}]
+    server, child = encoded["scopeSpans"][0]["spans"]
+    assert server["kind"] == 2 and "parentSpanId" not in server
+    assert child["kind"] == 1 and child["parentSpanId"] == server["spanId"]
+    assert server["attributes"] == [{"key": "flag", "value": {"boolValue": True}}, {"key": "count", "value": {"intValue": "3"}}]
+    assert child["attributes"] == [{"key": "ratio", "value": {"doubleValue": 0.5}}, {"key": "label", "value": {"stringValue": "a"}}]
+
+
+def test_finished_traces_are_exported_off_the_request_path():
+    exporter = ListExporter()
+    with Tracer(exporter=exporter, slow_ms=10**9).trace("GET /x"):
+        pass
+
+    assert exporter.exported.wait(2)
+    assert exporter.payloads[0]["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"] == "GET /x"
+
+
+def test_file_exporter_appends_one_document_per_trace(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = FileSpanExporter(str(path))
+    exporter.export({"n": 1})
+    exporter.export({"n": 2})
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [{"n": 1}, {"n": 2}]
+
+
+# ============================================================
+# 🛰️ MIDDLEWARE
+# ============================================================
+
+
+async def test_middleware_traces_the_whole_response():
+    exporter = ListExporter()
+    tracer = Tracer(exporter=exporter, slow_ms=10**9)
+
+    async def app(scope, receive, send):
+        with span("handler"):
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await TracingMiddleware(app, lambda: tracer)({"type": "http", "method": "GET", "path": "/missing"}, None, send)
+
+    assert exporter.exported.wait(2)
+    root = exporter.payloads[0]["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert root["name"] == "GET /missing"
+    assert {"key": "http.status_code", "value": {"intValue": "404"}} in root["attributes"]
+    assert [message["type"] for message in sent] == ["http.response.start", "http.response.body"]
@@ -0,0 +1,75 @@
+import asyncio
+
+from api.src.database.neo4j_schema_manager import REQUIRED_INDEXES
+from api.src.warmup import WarmupState, warm_up_until_ready
+
+
+class FakeConnectionManager:
+    """Answers the warm-up's reads; fails verify_connection `failures` times first."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.writes = []
+
+    async def verify_connection(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Neo4j not reachable")
+
+    async def warm_pool(self):
+        return 3
+
+    async def query_all(self, cypher, params=None):
+        if cypher.startswith("SHOW INDEXES"):
+            return [{"name": name, "state": "ONLINE"} for name in REQUIRED_INDEXES]
+        return []
+
+    async def query_one(self, cypher, params=None):
+        return None
+
+    async def query_values(self, cypher, params=None):
+        return []
+
+    async def query_none(self, cypher, params=None):
+        self.writes.append(cypher)
+
+
+class FakeGraphStore:
+    def __init__(self) -> None:
+        self.refreshed = 0
+
+    async def refresh(self, repo):
+        self.refreshed += 1
+
+
+async def test_warm_up_runs_every_phase_without_writing():
+    ncm, store, state = FakeConnectionManager(), FakeGraphStore(), WarmupState()
+    await warm_up_until_ready(ncm, store, state, retry_delay=0)
+
+    assert state.ready and state.phase == "done" and state.attempts == 1
+    assert set(state.timings) == {"connect", "schema", "pool", "plans", "snapshot", "total"}
+    assert store.refreshed == 1
+    assert ncm.writes == []
+
+
+async def test_failed_warm_up_is_retried_until_ready():
+    ncm, store, state = FakeConnectionManager(failures=2), FakeGraphStore(), WarmupState()
+    await warm_up_until_ready(ncm, store, state, retry_delay=0)
+
+    assert state.ready and state.attempts == 3
+    assert "connect" in state.timings
+
+
+async def test_missing_index_keeps_the_worker_unready_and_retrying():
+    class Unmigrated(FakeConnectionManager):
+        async def query_all(self, cypher, params=None):
+            return [] if cypher.startswith("SHOW INDEXES") else await super().query_all(cypher, params)
+
+    state = WarmupState()
+    task = asyncio.ensure_future(warm_up_until_ready(Unmigrated(), FakeGraphStore(), state, retry_delay=0.001, max_retry_delay=0.001))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert not state.ready
+    assert state.phase == "failed" and state.error.startswith("schema:")
+    assert state.attempts > 1